@@ -0,0 +1,126 @@
+import argparse
+import gc
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from agentcohort.task.graph import CompactTaskGraph
+from agentcohort.task.models import Task, TaskStatus, TaskType
+from agentcohort.task.utils import GraphValidator, TreeVisualizer
+
+_STATUS_WEIGHTS = {TaskStatus.OPEN: 4, TaskStatus.IN_PROGRESS: 1, TaskStatus.CLOSED: 5}
+
+
+def synthetic_tasks(count: int, seed: int) -> Iterator[Task]:
+    """Yield tasks with 0-4 deps on earlier tasks, like what DirectoryTaskRepository.list_all() returns."""
+    rng = random.Random(seed)
+    statuses = rng.choices(list(_STATUS_WEIGHTS), weights=list(_STATUS_WEIGHTS.values()), k=count)
+    for i in range(count):
+        deps = [f"bench-{rng.randrange(i)}" for _ in range(rng.randint(0, min(i, 4)))]
+        yield Task(
+            id=f"bench-{i}",
+            title=f"Synthetic task number {i} for the graph benchmark",
+            status=statuses[i],
+            type=rng.choice(list(TaskType)),
+            created="2025-01-01T00:00:00+00:00",
+            priority=rng.randint(0, 4),
+            deps=list(dict.fromkeys(deps)),
+            links=[f"bench-{rng.randrange(count)}"] if rng.random() < 0.1 else [],
+            description="",
+            design="",
+            acceptance="",
+        )
+
+
+def resident_mib() -> int | None:
+    """Current RSS in MiB, where /proc is available."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 2**20
+    except OSError:
+        return None
+
+
+def report_load(started: float, before: int | None, detail: str = "") -> None:
+    gc.collect()
+    after = resident_mib()
+    held = f", holds {after - before} MiB" if after is not None and before is not None else ""
+    print(f"  {'load':<8} {(time.perf_counter() - started) * 1000:9.1f} ms  ({detail}{held})")
+
+
+def timed(label: str, func: Callable[[], object]) -> None:
+    started = time.perf_counter()
+    result = func()
+    size = len(result) if isinstance(result, list | str) else result
+    print(f"  {label:<8} {(time.perf_counter() - started) * 1000:9.1f} ms  ({size})")
+
+
+def run_objects(count: int, seed: int) -> None:
+    before, started = resident_mib(), time.perf_counter()
+    all_tasks = {task.id: task for task in synthetic_tasks(count, seed)}
+    report_load(started, before, f"{len(all_tasks)} Task objects")
+
+    def ready() -> list[str]:
+        return [
+            task.id
+            for task in all_tasks.values()
+            if task.status != TaskStatus.CLOSED
+            and all(dep in all_tasks and all_tasks[dep].status == TaskStatus.CLOSED for dep in task.deps)
+        ]
+
+    def blocked() -> list[str]:
+        return [
+            task.id
+            for task in all_tasks.values()
+            if task.status != TaskStatus.CLOSED
+            and any(dep not in all_tasks or all_tasks[dep].status != TaskStatus.CLOSED for dep in task.deps)
+        ]
+
+    root = f"bench-{count - 1}"
+    timed("ready", ready)
+    timed("blocked", blocked)
+    timed("cycles", GraphValidator(all_tasks).find_cycles)
+    timed("tree", lambda: TreeVisualizer(all_tasks).visualize_tree(root).count("\n"))
+
+
+def run_compact(count: int, seed: int) -> None:
+    before, started = resident_mib(), time.perf_counter()
+    graph = CompactTaskGraph.build(synthetic_tasks(count, seed))
+    report_load(started, before, f"arrays {graph.nbytes() // 1024} KiB")
+    root = f"bench-{count - 1}"
+    timed("ready", graph.ready)
+    timed("blocked", graph.blocked)
+    timed("cycles", graph.find_cycles)
+    timed("tree", lambda: graph.visualize_tree(root).count("\n"))
+
+
+def main() -> None:
+    """Compare peak RSS and query time of the task object graph and CompactTaskGraph."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["objects", "compact"], help="run one mode in this process")
+    args = parser.parse_args()
+
+    if args.mode is None:
+        # each mode runs in a fresh interpreter so its peak RSS is not hidden by the other one
+        for mode in ("objects", "compact"):
+            argv = [sys.executable, __file__, "--tasks", str(args.tasks), "--seed", str(args.seed), "--mode", mode]
+            subprocess.run(argv, check=True)
+        return
+
+    next(synthetic_tasks(1, args.seed))  # warm up pydantic so its setup is not counted as load
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{args.mode} ({args.tasks} tasks):")
+    (run_objects if args.mode == "objects" else run_compact)(args.tasks, args.seed)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"  peak RSS {peak // 1024} MiB (+{(peak - baseline) // 1024} MiB over the interpreter)")
+
+
+if __name__ == "__main__":
+    main()
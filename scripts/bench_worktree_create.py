@@ -0,0 +1,81 @@
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from agentcohort.config import Config
+from agentcohort.worktree.git import GitClient
+from agentcohort.worktree.services import WorktreeService
+
+_GIT_ENV = {"GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.com"}
+_GIT_ENV |= {"GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.com"}
+
+
+class SpawnCounter:
+    """Wrap subprocess.run and count the git processes it starts."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._original = subprocess.run
+
+    def __enter__(self) -> "SpawnCounter":
+        def counting_run(args: Any, *rest: Any, **kwargs: Any) -> Any:
+            if isinstance(args, list) and args and args[0] == "git":
+                self.count += 1
+            return self._original(args, *rest, **kwargs)
+
+        subprocess.run = counting_run
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        subprocess.run = self._original
+
+
+def make_repo(root: Path) -> Path:
+    repo = root / "bench-repo"
+    repo.mkdir()
+    env = {**os.environ, **_GIT_ENV}
+    subprocess.run(["git", "init", "-q", "-b", "main", str(repo)], check=True, env=env)
+    (repo / "README.md").write_text("bench\n")
+    subprocess.run(["git", "-C", str(repo), "add", "."], check=True, env=env)
+    subprocess.run(["git", "-C", str(repo), "commit", "-q", "-m", "init"], check=True, env=env)
+    return repo
+
+
+def main() -> None:
+    """Create and remove worktrees with a fresh GitClient each time, as one CLI invocation would."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = make_repo(Path(tmp))
+        create_spawns: list[int] = []
+        remove_spawns: list[int] = []
+        create_times: list[float] = []
+        for i in range(args.iterations):
+            service = WorktreeService(GitClient(repo), Config())
+            with SpawnCounter() as counter:
+                started = time.perf_counter()
+                service.create_worktree(name=f"bench-{i}")
+                create_times.append(time.perf_counter() - started)
+            create_spawns.append(counter.count)
+
+            service = WorktreeService(GitClient(repo), Config())
+            with SpawnCounter() as counter:
+                service.remove_worktree(f"bench-{i}", force=True)
+            remove_spawns.append(counter.count)
+
+    print(
+        f"worktree create: {statistics.mean(create_spawns):.1f} git spawns, "
+        f"{statistics.mean(create_times) * 1000:.1f} ms mean"
+    )
+    print(f"worktree remove: {statistics.mean(remove_spawns):.1f} git spawns")
+
+
+if __name__ == "__main__":
+    main()
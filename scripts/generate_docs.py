@@ -36,13 +36,25 @@ def main() -> None:
         ["task", "close"],
         ["task", "reopen"],
         ["task", "status"],
+        ["task", "claim"],
+        ["task", "declare"],
+        ["task", "undeclare"],
         ["task", "ls"],
+        ["task", "reindex"],
         ["task", "ready"],
         ["task", "blocked"],
         ["task", "closed"],
         ["task", "show"],
+        ["task", "rollup"],
+        ["task", "stats"],
         ["task", "add-note"],
+        ["task", "notes"],
+        ["task", "events"],
         ["task", "query"],
+        ["task", "export"],
+        ["task", "import"],
+        ["task", "doctor"],
+        ["task", "merge"],
         ["task", "dep-add"],
         ["task", "dep-remove"],
         ["task", "dep-tree"],
@@ -51,8 +63,17 @@ def main() -> None:
         ["task", "unlink"],
         ["worktree"],
         ["worktree", "create"],
+        ["worktree", "create-many"],
         ["worktree", "ls"],
+        ["worktree", "status"],
         ["worktree", "remove"],
+        ["worktree", "prune"],
+        ["worktree", "lease"],
+        ["worktree", "release"],
+        ["worktree", "pool"],
+        ["worktree", "pool", "fill"],
+        ["worktree", "pool", "ls"],
+        ["worktree", "pool", "drain"],
     ]
 
     for cmd_args in commands:
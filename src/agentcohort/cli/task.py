@@ -1,30 +1,48 @@
 import json
+import sys
+import time
+from datetime import datetime, timedelta
+from enum import StrEnum
+from pathlib import Path
 
 import typer
 
 from agentcohort.config import Config
+from agentcohort.context import get_context
+from agentcohort.task.exceptions import TaskError
 from agentcohort.task.id_generator import TaskIdGenerator
 from agentcohort.task.models import TaskStatus, TaskType
 from agentcohort.task.repository import DirectoryTaskRepository
-from agentcohort.task.services import DependencyService, LinkService, QueryService, TaskService
-from agentcohort.worktree.git import GitClient
+from agentcohort.task.services import (
+    ArchiveService,
+    DependencyService,
+    DoctorService,
+    LinkService,
+    QueryService,
+    TaskService,
+)
+from agentcohort.worktree.exceptions import WorktreeError
+from agentcohort.worktree.services import WorktreeService
+from agentcohort.worktree.tasks import TaskWorktreeService
 
 task_app = typer.Typer(no_args_is_help=True)
 
 
-def get_services():
+def get_services() -> tuple[TaskService, DependencyService, LinkService, QueryService, Config]:
     """Initialize and return all required services."""
-    config = Config.from_env()
-    git_client = GitClient()
-    base_path = git_client.repo_root
-    resolved_tasks_dir = git_client.resolve_path(config.tasks_dir)
-    repo = DirectoryTaskRepository(resolved_tasks_dir)
-    id_gen = TaskIdGenerator(base_path)
-    task_service = TaskService(repo, id_gen)
-    dep_service = DependencyService(repo)
+    context = get_context()
+    # ids take their prefix from the repository holding the store, so they match in every worktree
+    base_path = context.main_worktree_root if context.config.shared_store else context.repo_root
+    resolved_tasks_dir = context.store_path(context.config.tasks_dir)
+    config = context.config.model_copy(update={"tasks_dir": resolved_tasks_dir})
+    repo = DirectoryTaskRepository(
+        resolved_tasks_dir, compact_graph=config.compact_graph, store_format=config.store_format
+    )
+    id_gen = TaskIdGenerator(base_path, sortable=config.id_scheme == "sortable")
+    task_service = TaskService(repo, id_gen, aging_hours=config.ready_aging_hours, fair_share=config.ready_fair_share)
+    dep_service = DependencyService(repo, compact_graph=config.compact_graph)
     link_service = LinkService(repo)
     query_service = QueryService(repo)
-    config.tasks_dir = resolved_tasks_dir
     return task_service, dep_service, link_service, query_service, config
 
 
@@ -59,11 +77,37 @@ def create(
 
 
 @task_app.command()
-def start(task_id: str) -> None:
-    """Mark a task as in_progress."""
+def start(
+    task_id: str,
+    worktree: bool = typer.Option(False, "--worktree", help="Work on the task in a worktree named after its id."),
+    pool: bool = typer.Option(False, "--pool", help="Lease the worktree from the worktree pool."),
+    base: str = typer.Option(None, "--base", help="Base branch for the worktree (defaults to upstream default)."),
+    post_setup: str = typer.Option(None, "--post-setup", help="Command to run in a newly created worktree."),
+) -> None:
+    """Mark a task as in_progress, optionally in its own worktree."""
+    if pool and post_setup:
+        typer.echo("Error: --post-setup cannot be used with --pool (pooled worktrees are already set up)", err=True)
+        raise typer.Exit(1)
     task_service, _, _, _, _ = get_services()
-    task = task_service.start_task(task_id)
+    if not (worktree or pool):
+        task = task_service.start_task(task_id)
+        typer.echo(f"Updated {task.id} -> in_progress")
+        return
+
+    context = get_context()
+    worktree_service = WorktreeService(context.git, context.config, on_unbind=task_service.clear_worktrees)
+    try:
+        task, result = TaskWorktreeService(task_service, worktree_service).start(
+            task_id, base=base, use_pool=pool, post_setup=post_setup
+        )
+    except WorktreeError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
     typer.echo(f"Updated {task.id} -> in_progress")
+    typer.echo(f"Worktree: {result.worktree_path}")
+    if result.post_setup_output:
+        typer.echo("\nPost-setup command output:")
+        typer.echo(result.post_setup_output)
 
 
 @task_app.command()
@@ -91,30 +135,94 @@ def status(task_id: str, new_status: TaskStatus) -> None:
 
 
 @task_app.command()
-def ls(status_filter: TaskStatus = typer.Option(None, "--status", help="Filter by status.")) -> None:
-    """List all tasks, optionally filtering by status."""
+def claim(
+    task_id: str = typer.Argument(None, help="Task to claim (defaults to the highest-priority claimable task)."),
+    assignee: str = typer.Option(None, "-a", "--assignee", help="Assign the task while claiming it."),
+) -> None:
+    """Mark a ready task as in_progress unless its paths overlap an in-progress task."""
+    task_service, _, _, _, _ = get_services()
+    try:
+        task = task_service.claim_task(task_id, assignee=assignee)
+    except TaskError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"Claimed {task.id} -> in_progress")
+
+
+@task_app.command()
+def declare(
+    task_id: str,
+    patterns: list[str] = typer.Argument(..., help="Path globs relative to the repository root (e.g. 'src/api/**')."),
+) -> None:
+    """Declare the paths a task is going to touch."""
     task_service, _, _, _, _ = get_services()
-    tasks = task_service.list_tasks(status_filter)
+    try:
+        task = task_service.declare_paths(task_id, patterns)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"Updated {task.id} paths: {task.paths}")
+
+
+@task_app.command()
+def undeclare(
+    task_id: str,
+    patterns: list[str] = typer.Argument(None, help="Path globs to remove (all if omitted)."),
+) -> None:
+    """Remove declared paths from a task."""
+    task_service, _, _, _, _ = get_services()
+    task = task_service.undeclare_paths(task_id, patterns or None)
+    typer.echo(f"Updated {task.id} paths: {task.paths}")
+
+
+@task_app.command()
+def ls(
+    status_filter: TaskStatus = typer.Option(None, "--status", help="Filter by status."),
+    assignee: str = typer.Option(None, "-a", "--assignee", help="Filter by assignee."),
+    type_filter: TaskType = typer.Option(None, "-t", "--type", help="Filter by type."),
+    updated_since: datetime = typer.Option(
+        None, "--updated-since", help="Only tasks changed since this time, most recent first."
+    ),
+) -> None:
+    """List all tasks, optionally filtering by status, assignee, type and last change."""
+    task_service, _, _, _, _ = get_services()
+    tasks = task_service.list_tasks(
+        status_filter, assignee=assignee, type_filter=type_filter, updated_since=updated_since
+    )
     for task in tasks:
         deps_string = f"[{', '.join(task.deps)}]" if task.deps else "[]"
         typer.echo(f"{task.id:8s} [{task.status.value}] - {task.title} <- {deps_string}")
 
 
+@task_app.command()
+def reindex() -> None:
+    """Rebuild the status, assignee, type, parent and priority indexes from the task files."""
+    task_service, _, _, _, _ = get_services()
+    count = task_service.reindex()
+    typer.echo(f"Indexed {count} task(s)")
+
+
 @task_app.command()
 def ready() -> None:
     """List tasks that are ready to be started (no blocking dependencies)."""
     task_service, _, _, _, _ = get_services()
-    tasks = task_service.get_ready_tasks()
+    with task_service.read_transaction():
+        tasks = task_service.get_ready_tasks(include_conflicting=True)
+        conflicts = task_service.find_path_conflicts(tasks)
     for task in tasks:
-        typer.echo(f"{task.id:8s} [P{task.priority}][{task.status.value}] - {task.title}")
+        if task.id not in conflicts:
+            typer.echo(f"{task.id:8s} [P{task.priority}][{task.status.value}] - {task.title}")
+    for task_id, holders in conflicts.items():
+        typer.echo(f"{task_id} held back: paths overlap {', '.join(sorted(holders))}", err=True)
 
 
 @task_app.command()
 def blocked() -> None:
     """List tasks that are blocked by unclosed dependencies."""
     task_service, _, _, _, _ = get_services()
-    tasks = task_service.get_blocked_tasks()
-    all_tasks = {t.id: t for t in task_service.list_tasks()}
+    with task_service.read_transaction():
+        tasks = task_service.get_blocked_tasks()
+        all_tasks = {t.id: t for t in task_service.list_tasks()}
     for task in tasks:
         blockers = [
             dep_id for dep_id in task.deps if dep_id in all_tasks and all_tasks[dep_id].status != TaskStatus.CLOSED
@@ -136,8 +244,9 @@ def closed(limit: int = typer.Option(20, "--limit", help="Number of tasks to sho
 def show(task_id: str) -> None:
     """Display detailed information about a task including related tasks."""
     task_service, _, _, _, _ = get_services()
-    task = task_service.get_task(task_id)
-    all_tasks = {t.id: t for t in task_service.list_tasks()}
+    with task_service.read_transaction():
+        task = task_service.get_task(task_id)
+        all_tasks = {t.id: t for t in task_service.list_tasks()}
 
     typer.echo("---")
     typer.echo(f"id: {task.id}")
@@ -145,6 +254,12 @@ def show(task_id: str) -> None:
     typer.echo(f"deps: {task.deps}")
     typer.echo(f"links: {task.links}")
     typer.echo(f"created: {task.created}")
+    if task.updated_at:
+        typer.echo(f"updated: {task.updated_at}")
+    if task.started_at:
+        typer.echo(f"started: {task.started_at}")
+    if task.closed_at:
+        typer.echo(f"closed: {task.closed_at}")
     typer.echo(f"type: {task.type.value}")
     typer.echo(f"priority: {task.priority}")
     if task.assignee:
@@ -153,6 +268,10 @@ def show(task_id: str) -> None:
         typer.echo(f"external-ref: {task.external_ref}")
     if task.parent:
         typer.echo(f"parent: {task.parent}")
+    if task.worktree:
+        typer.echo(f"worktree: {task.worktree}")
+    if task.paths:
+        typer.echo(f"paths: {task.paths}")
     typer.echo("---")
     typer.echo(f"# {task.title}")
     typer.echo("")
@@ -216,12 +335,145 @@ def show(task_id: str) -> None:
 
 
 @task_app.command()
-def add_note(task_id: str) -> None:
-    """Add a note to a task."""
-    task_service, _, _, _, config = get_services()
-    task, note_filename = task_service.add_note(task_id, "")
-    note_path = (config.tasks_dir / task.id / note_filename).resolve()
-    typer.echo(f"Note created: {note_path}")
+def rollup(task_id: str) -> None:
+    """Show progress over all descendants of a task (children, their children and so on)."""
+    task_service, _, _, _, _ = get_services()
+    task = task_service.get_task(task_id)
+    result = task_service.get_rollup(task.id)
+    typer.echo(f"{task.id} [{task.type.value}] - {task.title}")
+    typer.echo(
+        f"  descendants: {result.total} (open {result.open}, in_progress {result.in_progress}, closed {result.closed})"
+    )
+    typer.echo(f"  done: {result.percent_done:.1f}%")
+    if result.highest_blocking_priority is not None:
+        typer.echo(f"  highest unclosed priority: P{result.highest_blocking_priority}")
+
+
+class StatsInterval(StrEnum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+
+@task_app.command()
+def stats(
+    since: datetime = typer.Option(None, "--since", help="Start of the period (default: 30 days ago)."),
+    until: datetime = typer.Option(None, "--until", help="End of the period (default: now)."),
+    interval: StatsInterval = typer.Option(StatsInterval.DAY, "--interval", help="Bucket width for counts."),
+    as_json: bool = typer.Option(False, "--json", help="Print the statistics as JSON."),
+) -> None:
+    """Show throughput, lead and cycle times, WIP per assignee and time spent blocked."""
+    task_service, _, _, _, _ = get_services()
+    width = {StatsInterval.HOUR: timedelta(hours=1), StatsInterval.DAY: timedelta(days=1)}.get(
+        interval, timedelta(weeks=1)
+    )
+    result = task_service.get_stats(since, until, width)
+    if as_json:
+        typer.echo(result.model_dump_json(indent=2))
+        return
+
+    typer.echo(f"{'period':<17} {'opened':>7} {'started':>8} {'closed':>7}")
+    for bucket in result.intervals:
+        if bucket.opened or bucket.started or bucket.closed:
+            typer.echo(
+                f"{bucket.start.astimezone():%Y-%m-%d %H:%M} {bucket.opened:>7} {bucket.started:>8} {bucket.closed:>7}"
+            )
+    total_closed = sum(bucket.closed for bucket in result.intervals)
+    typer.echo(
+        f"{'total':<17} {sum(b.opened for b in result.intervals):>7} "
+        f"{sum(b.started for b in result.intervals):>8} {total_closed:>7}"
+    )
+    typer.echo("")
+    for label, durations in (
+        ("lead time", result.lead_time),
+        ("cycle time", result.cycle_time),
+        ("blocked time", result.blocked_time),
+    ):
+        if durations is None:
+            typer.echo(f"{label}: no data")
+            continue
+        typer.echo(
+            f"{label}: p50 {_format_duration(durations.p50)}, p85 {_format_duration(durations.p85)}, "
+            f"p95 {_format_duration(durations.p95)}, max {_format_duration(durations.max)} (n={durations.count})"
+        )
+    typer.echo(f"blocked now: {result.blocked_now}")
+    if result.wip:
+        typer.echo("")
+        typer.echo("in progress:")
+        for assignee, count in result.wip.items():
+            typer.echo(f"  {assignee}: {count}")
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+@task_app.command()
+def add_note(
+    task_id: str,
+    content: str | None = typer.Argument(None, help="Note text (read from stdin if omitted)."),
+) -> None:
+    """Append a note to a task."""
+    task_service, _, _, _, _ = get_services()
+    if content is None and not sys.stdin.isatty():
+        content = sys.stdin.read()
+    if not content or not content.strip():
+        typer.echo("Error: note content is empty", err=True)
+        raise typer.Exit(1)
+    resolved_id, index = task_service.add_note(task_id, content.strip("\n"))
+    typer.echo(f"Added note {index} to {resolved_id}")
+
+
+@task_app.command()
+def notes(
+    task_id: str,
+    tail: int = typer.Option(None, "--tail", help="Show only the last N notes."),
+    start: int = typer.Option(0, "--from", help="Index of the first note to show (negative counts from the end)."),
+    stop: int = typer.Option(None, "--to", help="Index to stop before (negative counts from the end)."),
+) -> None:
+    """Show a task's notes, optionally only a tail or index range."""
+    task_service, _, _, _, _ = get_services()
+    _, first, task_notes = task_service.get_notes(task_id, start, stop, tail)
+    for index, note in enumerate(task_notes, start=first):
+        typer.echo(f"[{index}] **{note.timestamp}**")
+        typer.echo("")
+        typer.echo(note.content)
+        typer.echo("")
+
+
+@task_app.command()
+def events(
+    since: int = typer.Option(0, "--since", help="Cursor: show events after this offset."),
+    limit: int | None = typer.Option(None, "--limit", help="Maximum number of events to show."),
+    follow: bool = typer.Option(False, "-f", "--follow", help="Keep polling for new events."),
+    compact_before: int | None = typer.Option(
+        None, "--compact-before", help="Delete logged events below this offset instead of showing events."
+    ),
+) -> None:
+    """Stream the task change log as JSON lines; pass the last offset seen as --since to resume."""
+    task_service, _, _, _, _ = get_services()
+    if compact_before is not None:
+        removed = task_service.compact_events(compact_before)
+        typer.echo(f"Compacted {removed} event(s)")
+        return
+
+    first, batch = task_service.get_events(since, limit)
+    if first > since + 1:
+        typer.echo(f"Warning: events {since + 1}..{first - 1} were compacted; rebuild from 'task query'", err=True)
+    while True:
+        for event in batch:
+            typer.echo(event.model_dump_json())
+            since = event.offset
+        if limit is not None:
+            limit -= len(batch)
+        if not follow or limit == 0:
+            return
+        time.sleep(1)
+        _, batch = task_service.get_events(since, limit)
 
 
 @task_app.command()
@@ -232,6 +484,80 @@ def query(jq_filter: str = typer.Argument(None)) -> None:
     typer.echo(json.dumps([task.model_dump(mode="json") for task in tasks], indent=2))
 
 
+@task_app.command()
+def export(output: str = typer.Option("-", "-o", "--output", help="Archive file to write ('-' for stdout).")) -> None:
+    """Export the whole task store as a JSONL archive."""
+    task_service, _, _, _, _ = get_services()
+    archive_service = ArchiveService(task_service.repository)
+    if output == "-":
+        count = archive_service.export_tasks(sys.stdout)
+    else:
+        with Path(output).open("w") as stream:
+            count = archive_service.export_tasks(stream)
+    typer.echo(f"Exported {count} task(s)", err=True)
+
+
+@task_app.command(name="import")
+def import_(
+    archive: str = typer.Argument("-", help="Archive file to read ('-' for stdin)."),
+    batch_size: int = typer.Option(500, "--batch-size", help="Tasks written per batch."),
+) -> None:
+    """Import tasks from a JSONL archive, skipping ids that already exist."""
+    task_service, _, _, _, _ = get_services()
+    archive_service = ArchiveService(task_service.repository)
+    if archive == "-":
+        result = archive_service.import_tasks(sys.stdin, batch_size)
+    else:
+        with Path(archive).open() as stream:
+            result = archive_service.import_tasks(stream, batch_size)
+    typer.echo(f"Imported {result.imported} task(s)")
+    if result.skipped:
+        typer.echo(f"Skipped {len(result.skipped)} existing task(s): {', '.join(result.skipped[:5])}")
+    for issue in result.issues:
+        typer.echo(f"Warning: {issue.describe()}", err=True)
+    if result.issues:
+        raise typer.Exit(1)
+
+
+@task_app.command()
+def merge() -> None:
+    """Rebuild task state after git merged or checked out task files, and convert tasks to the oplog format."""
+    task_service, _, _, _, _ = get_services()
+    result = task_service.merge()
+    for label, ids in (("created", result.created), ("updated", result.updated), ("deleted", result.deleted)):
+        if ids:
+            typer.echo(f"{label}: {', '.join(ids)}")
+    if result.converted:
+        typer.echo(f"Converted {result.converted} task(s) to operation logs")
+    typer.echo(
+        f"Merged {result.materialized} changed task log(s): "
+        f"{len(result.created)} created, {len(result.updated)} updated, {len(result.deleted)} deleted"
+    )
+
+
+@task_app.command()
+def doctor(
+    fix: bool = typer.Option(False, "--fix", help="Repair the issues found, writing each affected task once."),
+) -> None:
+    """Check the dependency graph for cycles, missing references and one-sided links."""
+    task_service, _, _, _, _ = get_services()
+    doctor_service = DoctorService(task_service.repository)
+    if not fix:
+        issues = doctor_service.check()
+        for issue in issues:
+            typer.echo(issue.describe())
+        if issues:
+            typer.echo(f"Found {len(issues)} issue(s); run 'agentcohort task doctor --fix' to repair them", err=True)
+            raise typer.Exit(1)
+        typer.echo("No issues found")
+        return
+
+    report = doctor_service.fix()
+    for repair in report.repairs:
+        typer.echo(repair)
+    typer.echo(f"Fixed {len(report.issues)} issue(s) in {len(report.updated)} task(s)")
+
+
 @task_app.command(name="dep-add")
 def dep_add(task_id: str, dep_id: str) -> None:
     """Add a dependency from task_id to dep_id."""
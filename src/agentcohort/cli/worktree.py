@@ -1,20 +1,57 @@
+import json
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import typer
 
-from agentcohort.config import Config
+from agentcohort.cli.task import get_services
+from agentcohort.context import get_context
+from agentcohort.task.exceptions import TaskError
+from agentcohort.task.models import TaskStatus
 from agentcohort.worktree.exceptions import WorktreeError
-from agentcohort.worktree.git import GitClient
-from agentcohort.worktree.services import WorktreeService
+from agentcohort.worktree.models import GitStatus, WorktreeCreateResult, WorktreeSpec
+from agentcohort.worktree.pool import WorktreePool
+from agentcohort.worktree.prune import WorktreePruner
+from agentcohort.worktree.services import WorktreeService, format_seed_result
 
 worktree_app = typer.Typer(no_args_is_help=True)
+pool_app = typer.Typer(no_args_is_help=True)
+worktree_app.add_typer(pool_app, name="pool", help="Pre-created worktrees for fast leasing.")
 
 
 def get_service() -> WorktreeService:
-    """Initialize and return WorktreeService with GitClient and Config."""
-    git_client = GitClient()
-    config = Config.from_env()
-    return WorktreeService(git_client, config)
+    """Initialize and return WorktreeService with the process-wide GitClient and Config."""
+    context = get_context()
+    return WorktreeService(context.git, context.config, on_unbind=_clear_task_worktrees)
+
+
+def _clear_task_worktrees(bindings: dict[Path, str]) -> None:
+    """Forget the removed worktrees in the tasks that were started in them."""
+    try:
+        task_service, _, _, _, _ = get_services()
+        task_service.clear_worktrees(bindings)
+    except TaskError as e:
+        typer.echo(f"Warning: could not update tasks of removed worktrees: {e}", err=True)
+
+
+def _task_paths(task_id: str) -> list[str]:
+    """Read the directories a task declared for a sparse checkout."""
+    try:
+        task_service, _, _, _, _ = get_services()
+        resolved_id, paths = task_service.get_task_paths(task_id)
+    except (TaskError, WorktreeError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    if not paths:
+        typer.echo(f"Error: task {resolved_id} lists no repository paths to check out", err=True)
+        raise typer.Exit(1)
+    return paths
+
+
+def _format_materialized(result: WorktreeCreateResult) -> str:
+    files = result.materialized_files or 0
+    size = (result.materialized_bytes or 0) / 1_000_000
+    return f"materialized {files} files, {size:.1f} MB"
 
 
 @worktree_app.command()
@@ -25,8 +62,15 @@ def create(
     existing: bool = typer.Option(False, "--existing", help="Use existing branch instead of creating new one."),
     path: str = typer.Option(None, "--path", help="Custom worktree path (defaults to ../<repo-name>-<name>)."),
     post_setup: str = typer.Option(None, "--post-setup", help='Command to run after creation (e.g., "uv sync").'),
+    seed: list[str] = typer.Option(None, "--seed", help="Directory to clone from the main worktree (repeatable)."),
+    no_seed: bool = typer.Option(False, "--no-seed", help="Do not seed directories configured in seed_dirs."),
+    sparse: list[str] = typer.Option(None, "--sparse", help="Only check out this directory (repeatable)."),
+    task: str = typer.Option(None, "--task", help="Only check out the directories this task declared."),
 ) -> None:
     """Create a new worktree."""
+    sparse_paths = list(sparse or [])
+    if task:
+        sparse_paths.extend(_task_paths(task))
     try:
         service = get_service()
         result = service.create_worktree(
@@ -36,6 +80,8 @@ def create(
             existing=existing,
             path=Path(path) if path else None,
             post_setup=post_setup,
+            seed=[] if no_seed else seed or None,
+            sparse=sparse_paths or None,
         )
 
         typer.echo(f"Created worktree at: {result.worktree_path}")
@@ -44,6 +90,11 @@ def create(
             typer.echo("  (new branch created)")
         else:
             typer.echo("  (using existing branch)")
+        if result.sparse_paths:
+            typer.echo(f"Sparse checkout: {', '.join(result.sparse_paths)}")
+            typer.echo(f"  {_format_materialized(result)}")
+        for seeded in result.seeded:
+            typer.echo(f"  {format_seed_result(seeded)}")
 
         if result.post_setup_output:
             typer.echo("\nPost-setup command output:")
@@ -54,6 +105,50 @@ def create(
         raise typer.Exit(1)
 
 
+@worktree_app.command(name="create-many")
+def create_many(
+    names: list[str] = typer.Argument(None, help="Worktree names (or use --count with --prefix)."),
+    count: int = typer.Option(0, "-n", "--count", help="Create N worktrees named <prefix><i>."),
+    prefix: str = typer.Option("agent-", "--prefix", help="Name prefix used with --count."),
+    base: str = typer.Option(None, "--base", help="Base branch to create from (defaults to upstream default branch)."),
+    post_setup: str = typer.Option(None, "--post-setup", help='Command to run in every worktree (e.g., "uv sync").'),
+    seed: list[str] = typer.Option(None, "--seed", help="Directory to clone from the main worktree (repeatable)."),
+    no_seed: bool = typer.Option(False, "--no-seed", help="Do not seed directories configured in seed_dirs."),
+    sparse: list[str] = typer.Option(None, "--sparse", help="Only check out this directory (repeatable)."),
+    jobs: int = typer.Option(4, "-j", "--jobs", help="Maximum post-setup commands running at once."),
+) -> None:
+    """Create many worktrees, running post-setup commands in parallel."""
+    worktree_names = list(names or []) + [f"{prefix}{i}" for i in range(1, count + 1)]
+    if not worktree_names:
+        typer.echo("Error: give worktree names or --count", err=True)
+        raise typer.Exit(1)
+    try:
+        service = get_service()
+        result = service.create_worktrees(
+            [WorktreeSpec(name=name, sparse=sparse or None) for name in worktree_names],
+            base=base,
+            post_setup=post_setup,
+            seed=[] if no_seed else seed or None,
+            jobs=jobs,
+            on_progress=lambda name, message: typer.echo(f"[{name}] {message}"),
+        )
+    except (WorktreeError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    materialized = [item.result for item in result.items if item.result and item.result.sparse_paths]
+    if materialized:
+        total_files = sum(r.materialized_files or 0 for r in materialized)
+        total_bytes = sum(r.materialized_bytes or 0 for r in materialized)
+        typer.echo(f"\nSparse checkout materialized {total_files} files, {total_bytes / 1_000_000:.1f} MB in total")
+    typer.echo(f"\n{len(result.succeeded)} of {len(result.items)} worktree(s) ready")
+    for item in result.failed:
+        reason = item.error or f"post-setup exited with code {item.post_setup_exit_code}"
+        typer.echo(f"  failed: {item.name}: {reason}", err=True)
+    if result.failed:
+        raise typer.Exit(1)
+
+
 @worktree_app.command()
 def ls() -> None:
     """List all worktrees."""
@@ -65,18 +160,79 @@ def ls() -> None:
             typer.echo("No worktrees found.")
             return
 
+        bindings = service.bindings.all()
         for wt in worktrees:
             main_marker = " (main)" if wt.is_main else ""
             typer.echo(f"{wt.path}{main_marker}")
             branch_display = wt.branch if wt.branch else "(detached)"
             typer.echo(f"  Branch: {branch_display}")
             typer.echo(f"  HEAD: {wt.head[:8]}")
+            if wt.path in bindings:
+                typer.echo(f"  Task: {bindings[wt.path]}")
 
     except WorktreeError as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
 
+@worktree_app.command()
+def status(
+    untracked: bool = typer.Option(True, "--untracked/--no-untracked", help="Count untracked files (slower)."),
+    as_json: bool = typer.Option(False, "--json", help="Print the status as JSON."),
+    jobs: int = typer.Option(8, "-j", "--jobs", help="Maximum git processes running at once."),
+) -> None:
+    """Show dirty, ahead/behind and last-commit state of all worktrees."""
+    try:
+        statuses = get_service().worktree_statuses(untracked=untracked, jobs=jobs)
+    except (WorktreeError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    if as_json:
+        typer.echo(json.dumps([entry.model_dump(mode="json") for entry in statuses], indent=2))
+        return
+
+    now = datetime.now(UTC)
+    rows = [("WORKTREE", "BRANCH", "STATE", "AHEAD/BEHIND", "LAST COMMIT")]
+    for entry in statuses:
+        name = f"{entry.path.name} (main)" if entry.is_main else entry.path.name
+        last_commit = _format_age(now - entry.last_commit) if entry.last_commit else "-"
+        if entry.status is None:
+            rows.append((name, "-", f"error: {entry.error}", "-", last_commit))
+            continue
+        git_status = entry.status
+        ahead_behind = f"+{git_status.ahead}/-{git_status.behind}" if git_status.ahead is not None else "-"
+        rows.append((name, git_status.branch or "(detached)", _format_state(git_status), ahead_behind, last_commit))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+    for row in rows:
+        typer.echo("  ".join([*(cell.ljust(width) for cell, width in zip(row, widths, strict=False)), row[-1]]))
+
+
+def _format_state(git_status: GitStatus) -> str:
+    if not git_status.dirty:
+        return "clean"
+    parts = [
+        f"{count} {label}"
+        for count, label in (
+            (git_status.conflicts, "conflicted"),
+            (git_status.staged, "staged"),
+            (git_status.unstaged, "modified"),
+            (git_status.untracked or 0, "untracked"),
+        )
+        if count
+    ]
+    return ", ".join(parts)
+
+
+def _format_age(age: timedelta) -> str:
+    seconds = int(age.total_seconds())
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit} ago"
+    return "just now"
+
+
 @worktree_app.command()
 def remove(
     name: str,
@@ -91,3 +247,146 @@ def remove(
     except WorktreeError as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
+
+
+@worktree_app.command()
+def lease(
+    branch: str,
+    base: str = typer.Option(None, "--base", help="Start point of the branch (defaults to upstream default branch)."),
+) -> None:
+    """Lease a pooled worktree as a new branch and print its path."""
+    try:
+        slot = WorktreePool(get_service()).lease(branch, base=base)
+    except WorktreeError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(slot.path)
+
+
+@worktree_app.command()
+def release(
+    key: str = typer.Argument(..., help="Leased branch, pool worktree name or path."),
+    force: bool = typer.Option(False, "--force", help="Release even with uncommitted changes (they will be lost)."),
+) -> None:
+    """Return a leased worktree to the pool, keeping its branch."""
+    try:
+        slot = WorktreePool(get_service()).release(key, force=force)
+    except WorktreeError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"Released worktree: {slot.path}")
+
+
+@worktree_app.command()
+def prune(
+    merged: bool = typer.Option(False, "--merged", help="Select worktrees whose branch is merged into --base."),
+    base: str = typer.Option(None, "--base", help="Branch for --merged (defaults to upstream default branch)."),
+    closed_task: bool = typer.Option(False, "--closed-task", help="Select worktrees named after a closed task."),
+    idle_hours: float = typer.Option(None, "--idle-hours", help="Select worktrees with no commit for N hours."),
+    force: bool = typer.Option(False, "--force", help="Also prune worktrees with uncommitted changes."),
+    keep_branches: bool = typer.Option(False, "--keep-branches", help="Do not delete the worktrees' branches."),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show what would be pruned and the space freed."),
+    wait: bool = typer.Option(False, "--wait", help="Delete directories before exiting instead of in the background."),
+) -> None:
+    """Remove finished worktrees matching all given criteria in one batch."""
+    closed_tasks: set[str] | None = None
+    if closed_task:
+        try:
+            task_service, _, _, _, _ = get_services()
+            closed_tasks = {task.id for task in task_service.list_tasks(TaskStatus.CLOSED)}
+        except TaskError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
+    try:
+        service = get_service()
+        result = WorktreePruner(service).prune(
+            merged_into=(base or service.git.default_branch) if merged else None,
+            closed_tasks=closed_tasks,
+            idle_hours=idle_hours,
+            include_dirty=force,
+            delete_branches=not keep_branches,
+            dry_run=dry_run,
+            wait=wait,
+        )
+    except (WorktreeError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    verb = "Would remove" if dry_run else "Removed"
+    for candidate in result.removed:
+        size = f" ({candidate.bytes / 1_000_000:.1f} MB)" if candidate.bytes is not None else ""
+        typer.echo(f"{verb} {candidate.path}{size}: {'; '.join(candidate.reasons)}")
+    for path, reason in result.skipped.items():
+        typer.echo(f"Skipped {path}: {reason}", err=True)
+    if dry_run:
+        total = sum(candidate.bytes or 0 for candidate in result.removed)
+        typer.echo(f"{len(result.removed)} worktree(s), {total / 1_000_000:.1f} MB would be freed")
+    elif result.removed:
+        typer.echo(f"Deleted {len(result.deleted_branches)} branch(es)")
+        if not wait:
+            typer.echo("Disk space is being reclaimed in the background")
+    else:
+        typer.echo("Nothing to prune")
+
+
+@pool_app.command()
+def fill(
+    size: int = typer.Option(4, "-n", "--size", help="Number of idle worktrees to keep."),
+    base: str = typer.Option(None, "--base", help="Commit to check out (defaults to upstream default branch)."),
+    post_setup: str = typer.Option(None, "--post-setup", help='Command to run in every worktree (e.g., "uv sync").'),
+    seed: list[str] = typer.Option(None, "--seed", help="Directory to clone from the main worktree (repeatable)."),
+    no_seed: bool = typer.Option(False, "--no-seed", help="Do not seed directories configured in seed_dirs."),
+    jobs: int = typer.Option(4, "-j", "--jobs", help="Maximum post-setup commands running at once."),
+) -> None:
+    """Create worktrees until the pool has SIZE idle ones."""
+    try:
+        result = WorktreePool(get_service()).fill(
+            size,
+            base=base,
+            post_setup=post_setup,
+            seed=[] if no_seed else seed or None,
+            jobs=jobs,
+            on_progress=lambda name, message: typer.echo(f"[{name}] {message}"),
+        )
+    except (WorktreeError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    typer.echo(f"Added {len(result.succeeded)} worktree(s) to the pool")
+    for item in result.failed:
+        reason = item.error or f"post-setup exited with code {item.post_setup_exit_code}"
+        typer.echo(f"  failed: {item.name}: {reason}", err=True)
+    if result.failed:
+        raise typer.Exit(1)
+
+
+@pool_app.command(name="ls")
+def pool_ls() -> None:
+    """List pooled worktrees."""
+    try:
+        slots = WorktreePool(get_service()).slots()
+    except WorktreeError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+    if not slots:
+        typer.echo("The worktree pool is empty.")
+        return
+    for slot in slots:
+        status = f"leased as {slot.lease}" if slot.lease else "idle"
+        typer.echo(f"{slot.path}  {status}")
+
+
+@pool_app.command()
+def drain(
+    all_slots: bool = typer.Option(False, "--all", help="Also remove leased worktrees (their branches are kept)."),
+) -> None:
+    """Remove idle pooled worktrees."""
+    try:
+        removed = WorktreePool(get_service()).drain(include_leased=all_slots)
+    except WorktreeError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    for path in removed:
+        typer.echo(f"Removed worktree: {path}")
@@ -1,5 +1,7 @@
 import json
+import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -9,11 +11,25 @@ from agentcohort.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _default_cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "agentcohort"
+
+
 class Config(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="AGENTCOHORT_")
 
     agentcohort_store: Path = Field(default=Path(".agentcohort"))  # this should be a relative path at repo root
     tasks_dir: Path = Field(default=Path(".agentcohort/tasks"))
+    shared_store: bool = True  # linked worktrees use the main worktree's store instead of their own
+    id_scheme: Literal["random", "sortable"] = "random"  # "sortable" ids start with a timestamp
+    cache_dir: Path = Field(default_factory=_default_cache_dir)
+    context_cache: bool = True  # persist resolved repository facts between invocations
+    seed_dirs: list[str] = Field(default_factory=list)  # e.g. [".venv", "node_modules"], relative to repo root
+    seed_mode: Literal["auto", "reflink", "hardlink", "copy"] = "auto"
+    ready_aging_hours: float | None = Field(default=None, gt=0)  # hours of readiness worth one priority level
+    ready_fair_share: Literal["assignee", "type"] | None = None  # balance picks across assignees or task types
+    store_format: Literal["json", "oplog"] = "json"  # "oplog" keeps merge-friendly per-task operation logs
+    compact_graph: bool = False  # answer ready/blocked/cycle/tree queries from a columnar copy of the dep graph
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -0,0 +1,163 @@
+import contextlib
+import functools
+import json
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import Any, cast
+
+from agentcohort.config import Config
+from agentcohort.logger import get_logger
+from agentcohort.worktree.git import GitClient, find_git_dir
+
+logger = get_logger(__name__)
+
+
+class AppContext:
+    """Process-wide configuration and repository facts, computed at most once.
+
+    Store paths resolve against the main worktree (found through the git common dir, read from the ``.git``
+    files without spawning git) so every linked worktree shares one task store, however it was created.
+
+    The repository root and default branch are also persisted to ``<cache_dir>/context.json``, keyed by
+    the repository path and validated against the mtime of the repository's ``HEAD`` file, so later
+    invocations can skip the git subprocesses entirely.
+    """
+
+    CACHE_FILENAME = "context.json"
+    CACHE_VERSION = 1
+    MAX_CACHED_REPOS = 64
+
+    def __init__(self, cwd: Path | None = None, config: Config | None = None) -> None:
+        self.cwd = (cwd or Path.cwd()).absolute()
+        self._config = config
+
+    @cached_property
+    def config(self) -> Config:
+        return self._config or Config.from_env()
+
+    @cached_property
+    def git(self) -> GitClient:
+        client = GitClient(self.cwd)
+        cached = self._load_cached_facts()
+        if cached is not None:
+            client.prime_cache(repo_root=Path(cached["repo_root"]), default_branch=cached["default_branch"])
+            return client
+        head_path = self._find_head_path()
+        if head_path is not None:
+            self._store_cached_facts(head_path, client.repo_root, client.default_branch)
+        return client
+
+    @property
+    def repo_root(self) -> Path:
+        return self.git.repo_root
+
+    @property
+    def repo_name(self) -> str:
+        return self.git.repo_name
+
+    @property
+    def default_branch(self) -> str:
+        return self.git.default_branch
+
+    @cached_property
+    def main_worktree_root(self) -> Path:
+        """Root of the repository's main worktree, which holds the shared store."""
+        found = self._find_git_dir()
+        if found is not None:
+            worktree_root, git_dir = found
+            commondir_file = git_dir / "commondir"
+            if not commondir_file.is_file():
+                return worktree_root  # the main worktree itself, or a submodule
+            common_dir = Path(os.path.normpath(git_dir / commondir_file.read_text().strip()))
+            if common_dir.name == ".git":
+                return common_dir.parent
+        # bare repositories have no main worktree; fall back to asking git
+        common_dir = self.git.common_dir
+        return common_dir.parent if common_dir.name == ".git" else self.repo_root
+
+    def store_path(self, relative_path: Path) -> Path:
+        """Resolve a store path (such as ``tasks_dir``) for the current worktree.
+
+        With ``shared_store`` enabled it points into the main worktree, so a linked worktree neither needs the
+        store symlink nor grows a divergent store of its own.
+        """
+        if relative_path.is_absolute():
+            return relative_path
+        if not self.config.shared_store:
+            return self.git.resolve_path(relative_path)
+        main_root = self.main_worktree_root
+        found = self._find_git_dir()
+        if found is not None and found[0] != main_root:
+            local_store = found[0] / self.config.agentcohort_store
+            if local_store.is_dir() and not local_store.is_symlink():
+                logger.warning(f"ignoring worktree-local store {local_store}; using the one in {main_root}")
+        return main_root / relative_path
+
+    @property
+    def _cache_path(self) -> Path:
+        return self.config.cache_dir / self.CACHE_FILENAME
+
+    def _find_git_dir(self) -> tuple[Path, Path] | None:
+        """Locate the enclosing worktree root and its git dir without spawning git."""
+        return find_git_dir(self.cwd)
+
+    def _find_head_path(self) -> Path | None:
+        """Locate the HEAD file of the enclosing repository without spawning git."""
+        found = self._find_git_dir()
+        return found[1] / "HEAD" if found is not None else None
+
+    def _read_cache(self) -> dict[str, Any]:
+        try:
+            data: object = json.loads(self._cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        cache = cast("dict[str, Any]", data)
+        return cache if cache.get("version") == self.CACHE_VERSION else {}
+
+    def _load_cached_facts(self) -> dict[str, Any] | None:
+        if not self.config.context_cache:
+            return None
+        head_path = self._find_head_path()
+        if head_path is None:
+            return None
+        entry = self._read_cache().get("repos", {}).get(str(head_path))
+        try:
+            if entry is None or entry["head_mtime_ns"] != head_path.stat().st_mtime_ns:
+                return None
+        except OSError:
+            return None
+        if not self.cwd.is_relative_to(entry["repo_root"]):
+            return None
+        return entry
+
+    def _store_cached_facts(self, head_path: Path, repo_root: Path, default_branch: str) -> None:
+        if not self.config.context_cache:
+            return
+        cache = self._read_cache()
+        repos: dict[str, Any] = cache.get("repos", {})
+        repos.pop(str(head_path), None)
+        with contextlib.suppress(OSError):
+            repos[str(head_path)] = {
+                "repo_root": str(repo_root),
+                "default_branch": default_branch,
+                "head_mtime_ns": head_path.stat().st_mtime_ns,
+            }
+        # dicts keep insertion order, so the first entries are the least recently refreshed ones
+        while len(repos) > self.MAX_CACHED_REPOS:
+            repos.pop(next(iter(repos)))
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"version": self.CACHE_VERSION, "repos": repos}))
+            tmp_path.replace(self._cache_path)
+        except OSError as e:
+            logger.debug(f"could not write context cache: {e}")
+
+
+@functools.cache
+def get_context() -> AppContext:
+    """Return the context shared by every command in this process."""
+    return AppContext()
@@ -0,0 +1,43 @@
+import fcntl
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+_registry_guard = threading.Lock()
+_registry: dict[Path, "_HeldLock"] = {}
+
+
+class _HeldLock:
+    def __init__(self) -> None:
+        self.mutex = threading.RLock()
+        self.depth = 0
+        self.handle: IO[str] | None = None
+
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False) -> Generator[None]:
+    """Hold an advisory flock on path for the duration of the block.
+
+    The lock is reentrant within a process: nested acquisitions of the same path reuse the
+    outermost flock (keeping its mode) instead of deadlocking on a second file descriptor.
+    """
+    key = path.absolute()
+    with _registry_guard:
+        held = _registry.setdefault(key, _HeldLock())
+
+    with held.mutex:
+        if held.depth == 0:
+            key.parent.mkdir(parents=True, exist_ok=True)
+            held.handle = key.open("a")
+            fcntl.flock(held.handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held.depth += 1
+        try:
+            yield
+        finally:
+            held.depth -= 1
+            if held.depth == 0 and held.handle is not None:
+                fcntl.flock(held.handle.fileno(), fcntl.LOCK_UN)
+                held.handle.close()
+                held.handle = None
@@ -1,19 +1,38 @@
+from agentcohort.task.events import EventLog
+from agentcohort.task.graph import CompactTaskGraph
 from agentcohort.task.id_generator import TaskIdGenerator
-from agentcohort.task.models import Note, Task, TaskMetadata, TaskStatus, TaskType
+from agentcohort.task.models import Note, Task, TaskEvent, TaskEventType, TaskMetadata, TaskStatus, TaskType
+from agentcohort.task.notes import NoteLog
+from agentcohort.task.oplog import TaskOpLog
 from agentcohort.task.repository import DirectoryTaskRepository, TaskRepository
-from agentcohort.task.services import DependencyService, LinkService, QueryService, TaskService
+from agentcohort.task.services import (
+    ArchiveService,
+    DependencyService,
+    DoctorService,
+    LinkService,
+    QueryService,
+    TaskService,
+)
 
 __all__ = [
+    "ArchiveService",
     "Task",
     "TaskMetadata",
     "TaskStatus",
     "TaskType",
     "Note",
+    "NoteLog",
+    "TaskOpLog",
+    "EventLog",
+    "TaskEvent",
+    "TaskEventType",
     "TaskRepository",
     "DirectoryTaskRepository",
     "TaskService",
     "DependencyService",
+    "DoctorService",
     "LinkService",
     "QueryService",
     "TaskIdGenerator",
+    "CompactTaskGraph",
 ]
@@ -0,0 +1,235 @@
+import bisect
+import itertools
+import json
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+from agentcohort.locking import file_lock
+from agentcohort.task.models import TaskEvent, TaskEventType, TaskMetadata
+
+
+class EventLog:
+    """Segmented, append-only log of every mutation of a task store.
+
+    Events get consecutive offsets starting at 1 and are stored as JSON lines in segment files named after
+    their first offset (``.events/00000000000000000001.jsonl``). A segment is sealed once it holds
+    ``SEGMENT_EVENTS`` events; compaction deletes sealed segments that consumers no longer need, so offsets stay
+    stable and a consumer only has to remember the last offset it processed.
+
+    Events are appended after the mutation is on disk, under a file lock. A crash in between loses the event,
+    so consumers that must not miss anything should rebuild their view from the store after a gap.
+    """
+
+    DIRNAME = ".events"
+    SEGMENT_EVENTS = 10_000
+    SEGMENT_SUFFIX = ".jsonl"
+
+    def __init__(self, tasks_dir: Path) -> None:
+        self.events_dir = tasks_dir / self.DIRNAME
+        self.lock_path = self.events_dir / ".lock"
+
+    def append(self, type: TaskEventType, task_id: str, changes: dict[str, Any] | None = None) -> TaskEvent:
+        """Append an event and return it with its offset."""
+        return self.extend([(type, task_id, changes)])[0]
+
+    def extend(self, entries: Iterable[tuple[TaskEventType, str, dict[str, Any] | None]]) -> list[TaskEvent]:
+        """Append (type, task id, changes) events with one lock and one write per segment and return them."""
+        with file_lock(self.lock_path):
+            segments = self._segments()
+            last = self._last_offset(segments, repair=True)
+            # first offset of the segment being appended to; a full last segment is sealed by starting a new one
+            segment_first = segments[-1][0] if segments else last + 1
+            timestamp = datetime.now(UTC)
+            events: list[TaskEvent] = []
+            lines: list[bytes] = []
+            for type, task_id, changes in entries:
+                if last + 1 - segment_first >= self.SEGMENT_EVENTS:
+                    self._write_lines(segment_first, lines)
+                    segment_first, lines = last + 1, []
+                last += 1
+                event = TaskEvent(offset=last, timestamp=timestamp, type=type, task_id=task_id, changes=changes or {})
+                events.append(event)
+                lines.append(event.model_dump_json().encode() + b"\n")
+            self._write_lines(segment_first, lines)
+            return events
+
+    def _write_lines(self, segment_first: int, lines: list[bytes]) -> None:
+        if lines:
+            with self._segment_path(segment_first).open("ab") as handle:
+                handle.write(b"".join(lines))
+
+    def read(self, since: int = 0) -> Iterator[TaskEvent]:
+        """Yield the events with an offset greater than since, oldest first."""
+        segments = self._segments()
+        start = max(bisect.bisect_right([first for first, _ in segments], since + 1) - 1, 0)
+        for _, path in segments[start:]:
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue  # compacted while we were reading
+            for line in data.split(b"\n")[:-1]:  # a line without newline is still being written
+                event = TaskEvent.model_validate_json(line)
+                if event.offset > since:
+                    yield event
+
+    def first_offset(self) -> int:
+        """Offset of the oldest event still in the log (one past the last offset when the log is empty)."""
+        segments = self._segments()
+        return segments[0][0] if segments else 1
+
+    def last_offset(self) -> int:
+        """Offset of the newest event, 0 when nothing was logged yet."""
+        return self._last_offset(self._segments())
+
+    def compact(self, before: int) -> int:
+        """Delete sealed segments whose events all have an offset below before.
+
+        Returns:
+            Number of events removed
+        """
+        removed = 0
+        with file_lock(self.lock_path):
+            segments = self._segments()
+            for (first, path), (next_first, _) in itertools.pairwise(segments):
+                if next_first > before:
+                    break
+                path.unlink()
+                removed += next_first - first
+        return removed
+
+    def _segments(self) -> list[tuple[int, Path]]:
+        if not self.events_dir.exists():
+            return []
+        segments: list[tuple[int, Path]] = []
+        for entry in os.scandir(self.events_dir):
+            stem = entry.name.removesuffix(self.SEGMENT_SUFFIX)
+            if entry.name.endswith(self.SEGMENT_SUFFIX) and stem.isdigit():
+                segments.append((int(stem), Path(entry.path)))
+        return sorted(segments)
+
+    def _segment_path(self, first: int) -> Path:
+        self.events_dir.mkdir(parents=True, exist_ok=True)
+        return self.events_dir / f"{first:020d}{self.SEGMENT_SUFFIX}"
+
+    def _last_offset(self, segments: list[tuple[int, Path]], repair: bool = False) -> int:
+        """Read the offset of the last complete event.
+
+        With repair set (only under the lock), a torn line left by a crashed writer is cut off so the next
+        append starts on a fresh line.
+        """
+        for first, path in reversed(segments):
+            with path.open("rb+" if repair else "rb") as handle:
+                size = handle.seek(0, os.SEEK_END)
+                chunk = b""
+                position = size
+                while position > 0 and chunk.count(b"\n") < 2:
+                    position = max(position - 4096, 0)
+                    handle.seek(position)
+                    chunk = handle.read(size - position)
+                complete = chunk[: chunk.rfind(b"\n") + 1]
+                if repair and len(complete) < len(chunk):
+                    handle.truncate(position + len(complete))
+            lines = complete.split(b"\n")[:-1]
+            if lines and (position == 0 or len(lines) > 1):
+                return TaskEvent.model_validate_json(lines[-1]).offset
+            if position == 0:
+                return first - 1  # empty segment, e.g. its only line was torn
+        return 0
+
+
+class ViewRebuildRequired(Exception):
+    """Raised by EventLogView._apply when events cannot be applied incrementally."""
+
+
+class EventLogView(ABC):
+    """Derived data of a task store, persisted as JSON and kept current by replaying the event log.
+
+    The view remembers the offset of the last event it applied, and every load first replays the events
+    logged since then, so it follows writes from any process without the write path having to rewrite it.
+    It is rebuilt from the task metadata when it is missing, from an older format, or when the events it
+    needs were compacted away. Changes git makes to the task files (a checkout or pull) log no events, so the
+    view also records a stamp of the store's source, such as the checked-out commit, and is rebuilt when
+    that changes.
+    """
+
+    FILENAME: str
+    VERSION: int
+
+    def __init__(
+        self,
+        tasks_dir: Path,
+        events: EventLog,
+        scan: Callable[[], Iterable[TaskMetadata]],
+        stamp: Callable[[], str | None] | None = None,
+    ) -> None:
+        """Initialize the view.
+
+        Args:
+            tasks_dir: Directory of the task store
+            events: Event log of the store
+            scan: Returns the metadata of every task, used to rebuild the view
+            stamp: Returns a value that changes whenever the task files may have changed behind the event log
+        """
+        self.path = tasks_dir / self.FILENAME
+        self.lock_path = self.path.with_suffix(".lock")
+        self.events = events
+        self.scan = scan
+        self.stamp = stamp or (lambda: None)
+
+    def load(self) -> dict[str, Any]:
+        """Return the up-to-date view, catching up with the event log first."""
+        with file_lock(self.lock_path):
+            data = self._read()
+            offset: int = data["offset"] if data else -1
+            if data is None or offset < self.events.first_offset() - 1 or data.get("stamp") != self.stamp():
+                return self._rebuild()
+            events = list(self.events.read(offset))
+            if events:
+                try:
+                    self._apply(data, events)
+                except ViewRebuildRequired:
+                    return self._rebuild()
+                data["offset"] = events[-1].offset
+                self._write(data)
+            return data
+
+    def rebuild(self) -> dict[str, Any]:
+        """Rebuild the view from the task metadata."""
+        with file_lock(self.lock_path):
+            return self._rebuild()
+
+    @abstractmethod
+    def _build(self, tasks: Iterable[TaskMetadata]) -> dict[str, Any]:
+        """Compute the view's data from scratch."""
+
+    @abstractmethod
+    def _apply(self, data: dict[str, Any], events: list[TaskEvent]) -> None:
+        """Update the view's data in place with newly logged events (applying an event twice must be harmless)."""
+
+    def _rebuild(self) -> dict[str, Any]:
+        # take the offset first: events logged during the scan are replayed again next time
+        offset = self.events.last_offset()
+        stamp = self.stamp()
+        data = self._build(self.scan())
+        data.update(version=self.VERSION, offset=offset, stamp=stamp)
+        self._write(data)
+        return data
+
+    def _read(self) -> dict[str, Any] | None:
+        try:
+            data: object = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        view = cast("dict[str, Any]", data)
+        return view if view.get("version") == self.VERSION else None
+
+    def _write(self, data: dict[str, Any]) -> None:
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(self.path)
@@ -6,6 +6,10 @@ class TaskNotFoundError(TaskError):
     pass
 
 
+class TaskExistsError(TaskError):
+    pass
+
+
 class AmbiguousTaskIdError(TaskError):
     pass
 
@@ -16,3 +20,7 @@ class InvalidTaskStatusError(TaskError):
 
 class CircularDependencyError(TaskError):
     pass
+
+
+class PathConflictError(TaskError):
+    pass
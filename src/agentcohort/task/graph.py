@@ -0,0 +1,226 @@
+import sys
+from array import array
+from collections.abc import Iterable
+
+from agentcohort.task.models import Task, TaskMetadata, TaskStatus, TaskType
+from agentcohort.task.utils import TreeVisualizer
+
+_STATUSES = list(TaskStatus)
+_TYPES = list(TaskType)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_TYPE_CODES = {task_type: code for code, task_type in enumerate(_TYPES)}
+_MISSING = -1  # status, type and priority of ids that are referenced as deps but have no task
+_OPEN = _STATUS_CODES[TaskStatus.OPEN]
+_IN_PROGRESS = _STATUS_CODES[TaskStatus.IN_PROGRESS]
+_CLOSED = _STATUS_CODES[TaskStatus.CLOSED]
+
+
+class CompactTaskGraph:
+    """Columnar, read-only copy of the task dependency graph.
+
+    Every task id is interned and numbered; status, type and priority live in ``array('b')`` columns indexed by
+    that number, and the deps of all tasks are stored in compressed sparse row form: the deps of node ``n`` are
+    ``dep_targets[dep_offsets[n]:dep_offsets[n + 1]]``. Ids that are referenced as deps but have no task get a
+    node with status -1, so they count as unclosed, like in the object-based queries. A 100k-task store takes a
+    few tens of bytes per task plus its id and title, instead of a pydantic object with several lists.
+    """
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.titles: list[str] = []
+        self.status = array("b")
+        self.type = array("b")
+        self.priority = array("b")
+        self.dep_offsets = array("l", [0])
+        self.dep_targets = array("l")
+        self._nodes: dict[str, int] = {}
+
+    @classmethod
+    def build(cls, tasks: Iterable[Task | TaskMetadata]) -> "CompactTaskGraph":
+        """Build the graph in one pass over tasks, which may be a generator so only one task is alive at a time."""
+        graph = cls()
+        sources = array("l")
+        targets = array("l")
+        for task in tasks:
+            node = graph._intern(task.id)
+            graph.titles[node] = task.title
+            graph.status[node] = _STATUS_CODES[task.status]
+            graph.type[node] = _TYPE_CODES[task.type]
+            graph.priority[node] = task.priority
+            for dep_id in task.deps:
+                sources.append(node)
+                targets.append(graph._intern(dep_id))
+        graph._set_edges(sources, targets)
+        return graph
+
+    def _intern(self, task_id: str) -> int:
+        node = self._nodes.get(task_id)
+        if node is None:
+            node = self._nodes[sys.intern(task_id)] = len(self.ids)
+            self.ids.append(task_id)
+            self.titles.append("")
+            self.status.append(_MISSING)
+            self.type.append(_MISSING)
+            self.priority.append(_MISSING)
+        return node
+
+    def _set_edges(self, sources: array[int], targets: array[int]) -> None:
+        """Turn (source, target) edge lists into CSR arrays with a counting sort that keeps each task's dep order."""
+        offsets = array("l", bytes(self.dep_offsets.itemsize * (len(self.ids) + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(len(self.ids)):
+            offsets[node + 1] += offsets[node]
+        fill = array("l", offsets)
+        dep_targets = array("l", bytes(self.dep_targets.itemsize * len(targets)))
+        for source, target in zip(sources, targets, strict=True):
+            dep_targets[fill[source]] = target
+            fill[source] += 1
+        self.dep_offsets = offsets
+        self.dep_targets = dep_targets
+
+    def __len__(self) -> int:
+        return sum(code != _MISSING for code in self.status)
+
+    def __contains__(self, task_id: object) -> bool:
+        node = self._nodes.get(task_id) if isinstance(task_id, str) else None
+        return node is not None and self.status[node] != _MISSING
+
+    def node(self, task_id: str) -> int | None:
+        return self._nodes.get(task_id)
+
+    def status_of(self, task_id: str) -> TaskStatus | None:
+        node = self._nodes.get(task_id)
+        return None if node is None or self.status[node] == _MISSING else _STATUSES[self.status[node]]
+
+    def title_of(self, task_id: str) -> str:
+        node = self._nodes.get(task_id)
+        return "" if node is None else self.titles[node]
+
+    def deps_of(self, task_id: str) -> list[str]:
+        node = self._nodes.get(task_id)
+        if node is None:
+            return []
+        return [self.ids[dep] for dep in self.dep_targets[self.dep_offsets[node] : self.dep_offsets[node + 1]]]
+
+    def nbytes(self) -> int:
+        """Size of the columns and edge arrays (ids, titles and the id map are not included)."""
+        columns = (self.status, self.type, self.priority, self.dep_offsets, self.dep_targets)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _blocked(self, node: int) -> bool:
+        status = self.status
+        return any(
+            status[dep] != _CLOSED for dep in self.dep_targets[self.dep_offsets[node] : self.dep_offsets[node + 1]]
+        )
+
+    def ready(self) -> list[str]:
+        """Ids of open and in-progress tasks whose deps are all closed, in node (not store) order."""
+        return [
+            self.ids[node]
+            for node, code in enumerate(self.status)
+            if code in (_OPEN, _IN_PROGRESS) and not self._blocked(node)
+        ]
+
+    def blocked(self) -> list[str]:
+        """Ids of open and in-progress tasks with a dep that is not closed or does not exist, in node order."""
+        return [
+            self.ids[node]
+            for node, code in enumerate(self.status)
+            if code in (_OPEN, _IN_PROGRESS) and self._blocked(node)
+        ]
+
+    def reaches(self, start_id: str, target_id: str) -> bool:
+        """Tell whether target_id can be reached from start_id by following deps."""
+        start = self._nodes.get(start_id)
+        target = self._nodes.get(target_id)
+        if start is None or target is None:
+            return start_id == target_id
+        visited = bytearray(len(self.ids))
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            if visited[node]:
+                continue
+            visited[node] = 1
+            stack.extend(self.dep_targets[self.dep_offsets[node] : self.dep_offsets[node + 1]])
+        return False
+
+    def find_cycles(self) -> list[list[str]]:
+        """Return every dependency cycle as the sorted ids of one strongly connected component (Tarjan, linear)."""
+        count = len(self.ids)
+        offsets, targets = self.dep_offsets, self.dep_targets
+        index = array("l", [-1]) * count
+        lowlink = array("l", bytes(offsets.itemsize * count))
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        cycles: list[list[str]] = []
+        counter = 0
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, offsets[root])]  # (node, position of the next dep to visit)
+            while work:
+                node, position = work[-1]
+                end = offsets[node + 1]
+                while position < end:
+                    dep = targets[position]
+                    position += 1
+                    if index[dep] == -1:
+                        work[-1] = (node, position)
+                        index[dep] = lowlink[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack[dep] = 1
+                        work.append((dep, offsets[dep]))
+                        break
+                    if on_stack[dep]:
+                        lowlink[node] = min(lowlink[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] != index[node]:
+                        continue
+                    component: list[int] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in targets[offsets[node] : offsets[node + 1]]:
+                        cycles.append(sorted(self.ids[member] for member in component))
+        return cycles
+
+    def visualize_tree(self, root_id: str, full_mode: bool = False) -> str:
+        """Render the dependency tree below root_id, exactly like TreeVisualizer does for task objects."""
+        return _CompactTreeVisualizer(self).visualize_tree(root_id, full_mode)
+
+
+class _CompactTreeVisualizer(TreeVisualizer):
+    def __init__(self, graph: CompactTaskGraph) -> None:
+        super().__init__({})
+        self.graph = graph
+        self._dep_lists: dict[str, list[str]] = {}  # the tree walks each subtree node several times
+
+    def _exists(self, task_id: str) -> bool:
+        return task_id in self.graph
+
+    def _deps(self, task_id: str) -> list[str]:
+        deps = self._dep_lists.get(task_id)
+        if deps is None:
+            deps = self._dep_lists[task_id] = self.graph.deps_of(task_id)
+        return deps
+
+    def _describe(self, task_id: str) -> str:
+        status = self.graph.status_of(task_id)
+        return f"{task_id} [{status.value if status else 'missing'}] {self.graph.title_of(task_id)}"
@@ -1,17 +1,38 @@
-import hashlib
-import os
-from datetime import UTC, datetime
+import secrets
+import time
 from pathlib import Path
 
+# Crockford base32 (lowercase) keeps sortable ids lexicographically ordered and unambiguous to read.
+_BASE32_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+_TIMESTAMP_LENGTH = 10  # 48-bit millisecond timestamp
+
 
 class TaskIdGenerator:
-    def __init__(self, project_dir: Path) -> None:
+    """Generate `<prefix>-<suffix>` task ids.
+
+    The random suffix is sized from the current store size so that a fresh id collides with an existing one
+    with probability below 1/COLLISION_HEADROOM; every retry after a collision adds one more character.
+    Uniqueness itself is guaranteed by the repository, which reserves the id with an atomic mkdir.
+
+    With ``sortable=True`` the suffix starts with a ULID-style millisecond timestamp, so ids sort in creation
+    order. Ids of the same length generated within the same millisecond by one generator are kept monotonic.
+    """
+
+    MIN_SUFFIX_LENGTH = 4
+    COLLISION_HEADROOM = 1024
+
+    def __init__(self, project_dir: Path, sortable: bool = False) -> None:
         self.project_dir = project_dir
+        self.sortable = sortable
+        self._last_timestamp = -1
+        self._last_random = 0
+        self._last_length = 0
 
-    def generate(self) -> str:
+    def generate(self, store_size: int = 0, attempt: int = 0) -> str:
         prefix = self._extract_prefix()
-        hash_suffix = self._generate_hash()
-        return f"{prefix}-{hash_suffix}"
+        length = self._suffix_length(store_size) + attempt
+        suffix = self._generate_sortable(length) if self.sortable else self._generate_random(length)
+        return f"{prefix}-{suffix}"
 
     def _extract_prefix(self) -> str:
         dir_name = self.project_dir.name
@@ -19,6 +40,31 @@ class TaskIdGenerator:
         prefix = "".join(seg[0].lower() for seg in segments if seg) if segments else dir_name[:3].lower()
         return prefix if prefix else "unn"
 
-    def _generate_hash(self) -> str:
-        data = f"{os.getpid()}{datetime.now(UTC).isoformat()}"
-        return hashlib.sha256(data.encode()).hexdigest()[:4]
+    def _suffix_length(self, store_size: int) -> int:
+        length = self.MIN_SUFFIX_LENGTH
+        while 16**length < (store_size + 1) * self.COLLISION_HEADROOM:
+            length += 1
+        return length
+
+    def _generate_random(self, length: int) -> str:
+        return secrets.token_hex((length + 1) // 2)[:length]
+
+    def _generate_sortable(self, length: int) -> str:
+        timestamp = max(time.time_ns() // 1_000_000, self._last_timestamp)
+        if timestamp == self._last_timestamp and length == self._last_length:
+            random_part = self._last_random + 1
+        else:
+            # a new millisecond, or a suffix of another length (a retry or a grown store), gets fresh randomness
+            random_part = secrets.randbits(5 * length - 1)  # leave headroom for monotonic increments
+        self._last_timestamp = timestamp
+        self._last_random = random_part
+        self._last_length = length
+        return _encode_base32(timestamp, _TIMESTAMP_LENGTH) + _encode_base32(random_part, length)
+
+
+def _encode_base32(value: int, length: int) -> str:
+    chars: list[str] = []
+    for _ in range(length):
+        chars.append(_BASE32_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
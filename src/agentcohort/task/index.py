@@ -0,0 +1,68 @@
+from collections.abc import Iterable
+from typing import Any
+
+from agentcohort.task.events import EventLogView
+from agentcohort.task.models import TaskEvent, TaskEventType, TaskMetadata
+
+INDEXED_FIELDS: tuple[str, ...] = ("status", "assignee", "type", "parent", "priority")
+
+
+class TaskIndex(EventLogView):
+    """Persisted secondary indexes of a task store: field value -> ids, for every field in INDEXED_FIELDS."""
+
+    FILENAME = ".index.json"
+    VERSION = 1
+
+    def lookup(self, **filters: Any) -> set[str]:
+        """Return the ids of the tasks whose fields equal all given values (e.g. ``status="open"``)."""
+        unknown = set(filters) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"not indexed: {', '.join(sorted(unknown))}")
+        fields: dict[str, dict[str, list[str]]] = self.load()["fields"]
+        result: set[str] | None = None
+        for field, value in filters.items():
+            ids = set(fields[field].get(self._key(value), ()))
+            result = ids if result is None else result & ids
+        return result if result is not None else set()
+
+    def _build(self, tasks: Iterable[TaskMetadata]) -> dict[str, Any]:
+        fields: dict[str, dict[str, list[str]]] = {field: {} for field in INDEXED_FIELDS}
+        ids: list[str] = []
+        for metadata in tasks:
+            ids.append(metadata.id)
+            values = metadata.model_dump(mode="json", include=set(INDEXED_FIELDS))
+            for field, value in values.items():
+                if value is not None:
+                    fields[field].setdefault(self._key(value), []).append(metadata.id)
+        return {"ids": ids, "fields": fields}
+
+    def _apply(self, data: dict[str, Any], events: list[TaskEvent]) -> None:
+        fields: dict[str, dict[str, list[str]]] = data["fields"]
+        buckets = {field: {key: set(ids) for key, ids in values.items()} for field, values in fields.items()}
+        ids: set[str] = set(data["ids"])
+        for event in events:
+            if event.type == TaskEventType.DELETED:
+                ids.discard(event.task_id)
+                for values in buckets.values():
+                    for members in values.values():
+                        members.discard(event.task_id)
+                continue
+            if event.type == TaskEventType.CREATED:
+                ids.add(event.task_id)
+            for field in INDEXED_FIELDS:
+                if field not in event.changes:
+                    continue
+                for members in buckets[field].values():
+                    members.discard(event.task_id)
+                value = event.changes[field]
+                if value is not None:
+                    buckets[field].setdefault(self._key(value), set()).add(event.task_id)
+        data["ids"] = sorted(ids)
+        data["fields"] = {
+            field: {key: sorted(members) for key, members in values.items() if members}
+            for field, values in buckets.items()
+        }
+
+    @staticmethod
+    def _key(value: Any) -> str:
+        return str(value)
@@ -0,0 +1,103 @@
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatchcase
+from functools import lru_cache
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+def split_pattern(pattern: str) -> tuple[str, ...]:
+    """Split a declared path glob into normalized segments (``./`` and empty segments dropped)."""
+    return tuple(segment for segment in pattern.strip().strip("/").split("/") if segment not in ("", "."))
+
+
+def is_literal(segment: str) -> bool:
+    return not _WILDCARD_CHARS.intersection(segment)
+
+
+@lru_cache(maxsize=1 << 16)
+def patterns_overlap(a: tuple[str, ...], b: tuple[str, ...]) -> bool:
+    """Tell whether two declared patterns can cover a common path.
+
+    A pattern covers every path it matches and everything below those paths, so ``src/api`` covers
+    ``src/api/views.py``. ``**`` matches any number of segments. Two wildcard segments facing each other are
+    assumed to overlap, which keeps the check conservative: it may report a conflict that cannot happen, but
+    never misses one.
+    """
+    if not a or not b:
+        return True  # one pattern ended, so it covers everything below the other one's remaining segments
+    head_a, head_b = a[0], b[0]
+    if head_a == "**":
+        return patterns_overlap(a[1:], b) or patterns_overlap(a, b[1:])
+    if head_b == "**":
+        return patterns_overlap(a, b[1:]) or patterns_overlap(a[1:], b)
+    if is_literal(head_a) and is_literal(head_b):
+        segments_match = head_a == head_b
+    elif is_literal(head_a):
+        segments_match = fnmatchcase(head_a, head_b)
+    elif is_literal(head_b):
+        segments_match = fnmatchcase(head_b, head_a)
+    else:
+        segments_match = True
+    return segments_match and patterns_overlap(a[1:], b[1:])
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.entries: list[tuple[str, tuple[str, ...]]] = []  # (task id, pattern segments)
+
+
+class PathLockIndex:
+    """Index of the path globs declared by tasks, answering "which tasks could touch the same files?".
+
+    Patterns are stored in a trie under their literal prefix (the segments before the first wildcard).
+    A query only compares against patterns stored on its own prefix path or below it; patterns in
+    unrelated subtrees (``docs/`` vs ``src/``) are never looked at.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def add(self, task_id: str, patterns: Iterable[str]) -> None:
+        for pattern in patterns:
+            segments = split_pattern(pattern)
+            node = self._root
+            for segment in segments:
+                if not is_literal(segment):
+                    break
+                node = node.children.setdefault(segment, _TrieNode())
+            node.entries.append((task_id, segments))
+
+    def conflicts(self, patterns: Iterable[str], exclude: str | None = None) -> set[str]:
+        """Return the ids of tasks whose patterns overlap any of the given ones.
+
+        Args:
+            patterns: Path globs to check
+            exclude: Task id to leave out (typically the task being checked)
+        """
+        found: set[str] = set()
+        for pattern in patterns:
+            segments = split_pattern(pattern)
+            for task_id, other in self._candidates(segments):
+                if task_id != exclude and task_id not in found and patterns_overlap(segments, other):
+                    found.add(task_id)
+        return found
+
+    def _candidates(self, segments: tuple[str, ...]) -> Iterator[tuple[str, tuple[str, ...]]]:
+        node = self._root
+        for segment in segments:
+            if not is_literal(segment):
+                break
+            yield from node.entries  # patterns with a shorter literal prefix may reach into this subtree
+            child = node.children.get(segment)
+            if child is None:
+                return
+            node = child
+        # everything below the query's literal prefix can overlap with it
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from current.entries
+            stack.extend(current.children.values())
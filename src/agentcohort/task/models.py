@@ -1,7 +1,8 @@
 from datetime import datetime
 from enum import StrEnum
+from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, computed_field, field_validator
 
 
 class TaskStatus(StrEnum):
@@ -34,10 +35,15 @@ class TaskBase(BaseModel):
     assignee: str | None = None
     external_ref: str | None = None
     parent: str | None = None
+    worktree: str | None = None  # path of the worktree the task is being worked on in
+    paths: list[str] = Field(default_factory=list)  # globs of repository paths the task will touch
+    started_at: str | None = None  # set by the store when the status changes to in_progress
+    closed_at: str | None = None  # set by the store when the status changes to closed
+    updated_at: str | None = None  # set by the store on every change of fields or body files
 
-    @field_validator("created", mode="before")
+    @field_validator("created", "started_at", "closed_at", "updated_at", mode="before")
     @classmethod
-    def validate_created(cls, v: str | datetime) -> str:
+    def validate_created(cls, v: str | datetime | None) -> str | None:
         if isinstance(v, datetime):
             return v.isoformat()
         return v
@@ -54,3 +60,108 @@ class Task(TaskBase):
     design: str | None = None
     acceptance: str | None = None
     notes: list[Note] = Field(default_factory=list)
+
+
+class GraphIssueKind(StrEnum):
+    CYCLE = "cycle"
+    DANGLING_DEP = "dangling_dep"
+    DANGLING_LINK = "dangling_link"
+    DANGLING_PARENT = "dangling_parent"
+    ASYMMETRIC_LINK = "asymmetric_link"  # task_id is linked from refs but does not link back
+
+
+class GraphIssue(BaseModel):
+    kind: GraphIssueKind
+    task_id: str
+    refs: list[str] = Field(default_factory=list)
+
+    def describe(self) -> str:
+        if self.kind == GraphIssueKind.CYCLE:
+            return f"dependency cycle among: {', '.join(self.refs)}"
+        return f"{self.task_id}: {self.kind.value.replace('_', ' ')} -> {', '.join(self.refs)}"
+
+
+class DoctorReport(BaseModel):
+    issues: list[GraphIssue] = Field(default_factory=list)
+    repairs: list[str] = Field(default_factory=list)  # one line per change made by --fix
+    updated: list[str] = Field(default_factory=list)  # ids of the tasks written
+
+
+class MergeResult(BaseModel):
+    materialized: int = 0  # tasks whose operation log changed since it was last folded
+    converted: int = 0  # tasks moved from metadata.json to an operation log
+    created: list[str] = Field(default_factory=list)
+    updated: list[str] = Field(default_factory=list)
+    deleted: list[str] = Field(default_factory=list)
+
+
+class ImportResult(BaseModel):
+    imported: int = 0
+    skipped: list[str] = Field(default_factory=list)
+    issues: list[GraphIssue] = Field(default_factory=list)
+
+
+class TaskEventType(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    NOTE_ADDED = "note_added"
+    DELETED = "deleted"
+
+
+class TaskEvent(BaseModel):
+    offset: int
+    timestamp: datetime
+    type: TaskEventType
+    task_id: str
+    changes: dict[str, Any] = Field(default_factory=dict)  # new values of the fields that changed
+
+
+class TaskRollup(BaseModel):
+    """Status counts over all descendants of a task."""
+
+    task_id: str
+    open: int = 0
+    in_progress: int = 0
+    closed: int = 0
+    highest_blocking_priority: int | None = None  # best priority among unclosed descendants
+
+    @computed_field
+    @property
+    def total(self) -> int:
+        return self.open + self.in_progress + self.closed
+
+    @computed_field
+    @property
+    def percent_done(self) -> float:
+        return 100.0 * self.closed / self.total if self.total else 0.0
+
+
+class DurationStats(BaseModel):
+    """Distribution of a duration, in seconds."""
+
+    count: int
+    mean: float
+    p50: float
+    p85: float
+    p95: float
+    max: float
+
+
+class IntervalCounts(BaseModel):
+    start: datetime
+    opened: int = 0
+    started: int = 0
+    closed: int = 0
+
+
+class TaskStats(BaseModel):
+    since: datetime
+    until: datetime
+    intervals: list[IntervalCounts] = Field(default_factory=list)
+    lead_time: DurationStats | None = None  # created -> closed, for tasks closed in the period
+    cycle_time: DurationStats | None = None  # started -> closed, for tasks closed in the period
+    blocked_time: DurationStats | None = (
+        None  # created -> last dependency closed (or now); tasks never blocked are left out
+    )
+    blocked_now: int = 0
+    wip: dict[str, int] = Field(default_factory=dict)  # in-progress tasks per assignee
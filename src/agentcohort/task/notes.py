@@ -0,0 +1,194 @@
+import json
+import struct
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+from agentcohort.locking import file_lock
+from agentcohort.task.models import Note
+
+NOTE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+LEGACY_NOTE_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+_OFFSET = struct.Struct("<Q")
+
+
+class NoteLog:
+    """Append-only JSONL log of a task's notes.
+
+    Each note is one line in ``notes.jsonl``. ``notes.idx`` holds the byte offset of every line as a
+    fixed-width little-endian integer, so appends, counts and range/tail reads only touch the entries they
+    need: the count is the index's size, and a read seeks to the two offsets around its range.
+    The index is derived data: when it disagrees with the log (e.g. after a crash between the two
+    writes) it is rebuilt from the log and renamed into place, so the lock is held on ``.notes.lock``.
+    """
+
+    LOG_FILENAME = "notes.jsonl"
+    INDEX_FILENAME = "notes.idx"
+    LOCK_FILENAME = ".notes.lock"  # never replaced, unlike notes.idx; a dot-file, so the store ignores it
+
+    def __init__(self, task_dir: Path) -> None:
+        self.task_dir = task_dir
+        self.log_path = task_dir / self.LOG_FILENAME
+        self.index_path = task_dir / self.INDEX_FILENAME
+        self.lock_path = task_dir / self.LOCK_FILENAME
+
+    def append(self, note: Note) -> int:
+        """Append a note and return its position in the log."""
+        with file_lock(self.lock_path):
+            position = self._count_or_rebuild()
+            self._append_lines([note])
+            return position
+
+    def extend(self, notes: Iterable[Note]) -> None:
+        with file_lock(self.lock_path):
+            self._count_or_rebuild()
+            self._append_lines(list(notes))
+
+    def count(self) -> int:
+        if not self.log_path.exists():
+            return 0
+        with self._locked_index() as count:
+            return count
+
+    def read(self, start: int = 0, stop: int | None = None) -> list[Note]:
+        """Read notes[start:stop] using slice semantics (negative indices count from the end)."""
+        if not self.log_path.exists():
+            return []
+        with self._locked_index() as count:
+            first, last, _ = slice(start, stop).indices(count)
+            if first >= last:
+                return []
+            begin = self._offset_at(first)
+            with self.log_path.open("rb") as handle:
+                handle.seek(begin)
+                data = handle.read(self._offset_at(last) - begin) if last < count else handle.read()
+            return [self._decode(line) for line in data.splitlines() if line]
+
+    def migrate_legacy(self, filenames: Iterable[str]) -> None:
+        """Fold legacy ``note-<timestamp>.md`` files into the log and delete them.
+
+        Notes already in the log are merged with the legacy ones in timestamp order.
+        """
+        with file_lock(self.lock_path):
+            legacy: list[Note] = []
+            legacy_paths: list[Path] = []
+            for filename in sorted(filenames):
+                file_path = self.task_dir / filename
+                note = self._read_legacy_note(file_path)
+                if note:
+                    legacy.append(note)
+                    legacy_paths.append(file_path)
+            existing = self.read()
+            merged = sorted([*existing, *legacy], key=lambda n: n.timestamp)
+
+            self.log_path.unlink(missing_ok=True)
+            self._write_offsets([])
+            self._append_lines(merged)
+            for file_path in legacy_paths:
+                file_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def new_note(content: str) -> Note:
+        return Note(timestamp=datetime.now(UTC).strftime(NOTE_TIMESTAMP_FORMAT), content=content)
+
+    def _append_lines(self, notes: list[Note]) -> None:
+        if not notes:
+            return
+        self.task_dir.mkdir(parents=True, exist_ok=True)
+        new_offsets: list[int] = []
+        with self.log_path.open("ab") as handle:
+            position = handle.tell()
+            chunks: list[bytes] = []
+            for note in notes:
+                line = self._encode(note)
+                new_offsets.append(position)
+                chunks.append(line)
+                position += len(line)
+            handle.write(b"".join(chunks))
+        with self.index_path.open("ab") as handle:
+            handle.write(b"".join(_OFFSET.pack(offset) for offset in new_offsets))
+
+    @contextmanager
+    def _locked_index(self) -> Generator[int]:
+        """Hold the index lock and yield the number of notes, rebuilding the index first if it disagrees with the log.
+
+        The check runs under a shared lock; only a rebuild takes the exclusive one.
+        """
+        with file_lock(self.lock_path, shared=True):
+            count = self._indexed_count()
+            if count is not None:
+                yield count
+                return
+        with file_lock(self.lock_path):
+            yield self._count_or_rebuild()
+
+    def _count_or_rebuild(self) -> int:
+        """Return the number of notes; the caller must hold the exclusive index lock."""
+        count = self._indexed_count()
+        return count if count is not None else len(self._rebuild_offsets())
+
+    def _indexed_count(self) -> int | None:
+        """Return the number of entries in the index, or None if it does not match the log.
+
+        Only the last entry is checked: it must point at the start of the log's last line.
+        """
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        index_size = self.index_path.stat().st_size if self.index_path.exists() else 0
+        count, torn = divmod(index_size, _OFFSET.size)
+        if torn:
+            return None
+        if count == 0:
+            return 0 if log_size == 0 else None
+        last = self._offset_at(count - 1)
+        if last >= log_size:
+            return None
+        with self.log_path.open("rb") as handle:
+            handle.seek(last)
+            tail = handle.read()
+        return count if b"\n" not in tail[:-1] else None
+
+    def _offset_at(self, position: int) -> int:
+        with self.index_path.open("rb") as handle:
+            handle.seek(position * _OFFSET.size)
+            (offset,) = _OFFSET.unpack(handle.read(_OFFSET.size))
+        return offset
+
+    def _rebuild_offsets(self) -> list[int]:
+        offsets: list[int] = []
+        if self.log_path.exists():
+            position = 0
+            with self.log_path.open("rb") as handle:
+                for line in handle:
+                    if line.strip():
+                        offsets.append(position)
+                    position += len(line)
+        self._write_offsets(offsets)
+        return offsets
+
+    def _write_offsets(self, offsets: list[int]) -> None:
+        if not offsets and not self.index_path.exists():
+            return
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_bytes(b"".join(_OFFSET.pack(offset) for offset in offsets))
+        tmp_path.replace(self.index_path)
+
+    @staticmethod
+    def _encode(note: Note) -> bytes:
+        return (json.dumps(note.model_dump(mode="json"), ensure_ascii=False) + "\n").encode()
+
+    @staticmethod
+    def _decode(line: bytes) -> Note:
+        return Note.model_validate(json.loads(line))
+
+    @staticmethod
+    def _read_legacy_note(file_path: Path) -> Note | None:
+        filename = file_path.name
+        if not filename.startswith("note-") or not filename.endswith(".md") or not file_path.exists():
+            return None
+        try:
+            dt = datetime.strptime(filename[5:-3], LEGACY_NOTE_TIMESTAMP_FORMAT)
+        except ValueError:
+            return None
+        return Note(timestamp=dt.strftime(NOTE_TIMESTAMP_FORMAT), content=file_path.read_text())
@@ -0,0 +1,160 @@
+import json
+import os
+import secrets
+import time
+from pathlib import Path
+from typing import Any
+
+from agentcohort.locking import file_lock
+
+# metadata fields holding sets of ids or paths: concurrent additions and removals of different elements all survive
+SET_FIELDS = frozenset({"deps", "links", "paths", "files"})
+
+GITATTRIBUTES = """\
+# Written by agentcohort. Task operation logs and notes are append-only, so a merge keeps the lines of both sides.
+*/ops.jsonl merge=union
+*/notes.jsonl merge=union
+"""
+
+GITIGNORE = """\
+# Written by agentcohort. Everything here is derived from the committed ops.jsonl and notes.jsonl files.
+.*
+!.gitignore
+!.gitattributes
+*/metadata.json
+*/notes.idx
+*/*.tmp
+"""
+
+
+def next_clock(last: str | None, replica: str) -> str:
+    """Return a hybrid logical clock reading later than last, as a string that sorts in clock order.
+
+    The reading is the wall clock in milliseconds unless last is ahead of it (another replica's clock ran fast, or
+    several writes fell in one millisecond), in which case it keeps last's time and bumps its counter. The replica
+    id makes readings of different replicas distinct, so every operation has a unique position in the total order.
+    """
+    wall = time.time_ns() // 1_000_000
+    counter = 0
+    if last is not None:
+        last_wall, last_counter, _ = last.split(".", 2)
+        if int(last_wall) >= wall:
+            wall, counter = int(last_wall), int(last_counter) + 1
+    return f"{wall:013d}.{counter:05d}.{replica}"
+
+
+def replica_id(tasks_dir: Path) -> str:
+    """Return the id of this copy of the store, creating it on first use (it is not committed)."""
+    path = tasks_dir / ".replica"
+    with file_lock(tasks_dir / ".lock"):
+        if not path.exists():
+            path.write_text(secrets.token_hex(4))
+        return path.read_text().strip()
+
+
+def write_git_files(tasks_dir: Path) -> None:
+    """Write the .gitattributes and .gitignore that make git merge the store without conflicts."""
+    for filename, content in ((".gitattributes", GITATTRIBUTES), (".gitignore", GITIGNORE)):
+        path = tasks_dir / filename
+        if not path.exists() or path.read_text() != content:
+            path.write_text(content)
+
+
+class TaskOpLog:
+    """Append-only log of the metadata changes of one task, merged by git without conflicts.
+
+    Every change is one JSON line in ``ops.jsonl`` stamped with a hybrid logical clock: plain fields are
+    last-writer-wins registers, and the fields in SET_FIELDS record which elements were added and removed, so
+    concurrent edits of different elements all survive. Folding the lines in clock order gives the same state
+    whatever order they are stored in, which is what lets git's union merge simply keep the lines of both
+    branches. ``metadata.json`` is a cache of the folded state; it records the log's stamp() when it was
+    written and is valid while that still matches.
+    """
+
+    FILENAME = "ops.jsonl"
+
+    def __init__(self, task_dir: Path) -> None:
+        self.task_dir = task_dir
+        self.path = task_dir / self.FILENAME
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def stamp(self) -> dict[str, Any] | None:
+        """Identify the log's content by its size and the clock of its last line, or None if there is no log.
+
+        Only the tail is read. Appends and git merges both grow the log; a checkout that swaps it for one of the
+        same size still ends in a different operation.
+        """
+        try:
+            with self.path.open("rb") as handle:
+                size = handle.seek(0, os.SEEK_END)
+                handle.seek(max(size - 4096, 0))
+                tail = handle.read()
+        except FileNotFoundError:
+            return None
+        try:
+            clock = json.loads(tail.rstrip(b"\n").rsplit(b"\n", 1)[-1])["clock"]
+        except (ValueError, KeyError, TypeError):
+            clock = None  # a torn or very long last line; the size still tells most changes apart
+        return {"size": size, "clock": clock}
+
+    def read(self) -> list[dict[str, Any]]:
+        """Return the operations sorted by clock; a torn last line (from a crash mid-append) is skipped."""
+        if not self.path.exists():
+            return []
+        ops: list[dict[str, Any]] = []
+        for line in self.path.read_bytes().splitlines():
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                continue
+        ops.sort(key=lambda op: op["clock"])
+        return ops
+
+    def materialize(self) -> tuple[dict[str, Any], str | None]:
+        """Fold the log into the current field values and return them with the clock of the last operation."""
+        ops = self.read()
+        state: dict[str, Any] = {}
+        elements: dict[str, dict[Any, tuple[str, bool]]] = {}
+        for op in ops:
+            clock = op["clock"]
+            state.update(op.get("set", {}))
+            for present, key in ((True, "add"), (False, "remove")):
+                for field, values in op.get(key, {}).items():
+                    field_elements = elements.setdefault(field, {})
+                    for value in values:
+                        field_elements[value] = (clock, present)
+        for field, field_elements in elements.items():
+            # elements keep the order in which they were (last) added
+            ordered = sorted(field_elements.items(), key=lambda item: (item[1][0], item[0]))
+            state[field] = [value for value, (_, present) in ordered if present]
+        return state, ops[-1]["clock"] if ops else None
+
+    def record(self, old: dict[str, Any], new: dict[str, Any], last_clock: str | None, replica: str) -> bool:
+        """Append the difference between two states of the task, returning False if there is none.
+
+        Args:
+            old: Field values the change is based on (the materialized state)
+            new: Field values after the change
+            last_clock: Clock of the last operation in the log; the new one is stamped later
+            replica: Id of the store copy making the change
+        """
+        op: dict[str, Any] = {}
+        for field, value in new.items():
+            if field in SET_FIELDS:
+                before: list[Any] = old.get(field) or []
+                added = [v for v in value if v not in before]
+                removed = [v for v in before if v not in value]
+                if added:
+                    op.setdefault("add", {})[field] = added
+                if removed:
+                    op.setdefault("remove", {})[field] = removed
+            elif field not in old or old[field] != value:
+                op.setdefault("set", {})[field] = value
+        if not op:
+            return False
+        line = json.dumps({"clock": next_clock(last_clock, replica), **op}, ensure_ascii=False)
+        with self.path.open("ab") as handle:
+            handle.write(line.encode() + b"\n")
+        return True
@@ -0,0 +1,133 @@
+import heapq
+from collections.abc import Callable, Hashable, Iterable
+from datetime import datetime
+
+from agentcohort.task.models import Task
+
+type _Key = tuple[float, str]
+
+
+class ReadyQueue:
+    """Heap of ready tasks ordered by aged priority, optionally sharing picks fairly between groups.
+
+    Without aging tasks come out by (priority, id). With aging a task gains one priority level for every
+    ``aging_hours`` it has been ready, so low-priority work cannot starve. All tasks age at the same rate,
+    which makes the aged order independent of the current time: the heap key is simply
+    ``priority * aging + ready_at``, and entries never have to be re-sorted as time passes.
+
+    With fair sharing, tasks are grouped (e.g. by assignee) and each pick goes to the group that has the
+    fewest tasks in progress so far, counting earlier picks, with ties going to the better head task.
+    Groups are kept in a second heap, so push and pop are O(log n). Removal is lazy.
+    """
+
+    def __init__(self, aging_hours: float | None = None, group_of: Callable[[Task], Hashable] | None = None) -> None:
+        """Initialize an empty queue.
+
+        Args:
+            aging_hours: Hours of readiness that improve a task's priority by one level (None disables aging)
+            group_of: Returns the fair-share group of a task (None puts every task in one group)
+        """
+        if aging_hours is not None and aging_hours <= 0:
+            raise ValueError("aging_hours must be positive")
+        self.aging_seconds = aging_hours * 3600 if aging_hours is not None else None
+        self.group_of = group_of
+        self._tasks: dict[str, tuple[_Key, Hashable, Task]] = {}
+        self._heaps: dict[Hashable, list[tuple[_Key, str]]] = {}
+        self._load: dict[Hashable, int] = {}
+        self._groups: list[tuple[int, _Key, int, Hashable]] = []
+        self._group_ids: dict[Hashable, int] = {}  # tie-breaker, as group values need not be comparable
+        self._queued: dict[Hashable, tuple[int, _Key]] = {}  # newest entry of each group in self._groups
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def set_load(self, group: Hashable, count: int) -> None:
+        """Record how many tasks a group already has in progress."""
+        self._load[group] = count
+        self._push_group(group)
+
+    def push(self, task: Task, ready_at: datetime) -> None:
+        """Add a task that became ready at ready_at, replacing an earlier entry for the same task."""
+        if self.aging_seconds is None:
+            key: _Key = (task.priority, task.id)
+        else:
+            key = (task.priority * self.aging_seconds + ready_at.timestamp(), task.id)
+        group = self.group_of(task) if self.group_of is not None else None
+        self._tasks[task.id] = (key, group, task)
+        heap = self._heaps.setdefault(group, [])
+        heapq.heappush(heap, (key, task.id))
+        if heap[0][1] == task.id:
+            self._push_group(group)
+
+    def remove(self, task_id: str) -> None:
+        self._tasks.pop(task_id, None)
+
+    def pop(self) -> Task:
+        """Remove and return the next task.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        while self._groups:
+            load, key, _, group = heapq.heappop(self._groups)
+            if self._queued.get(group) == (load, key):
+                del self._queued[group]
+            heap = self._heaps[group]
+            self._clean(group)
+            if not heap:
+                continue
+            if (load, key) != (self._load.get(group, 0), heap[0][0]):
+                self._push_group(group)  # stale entry: requeue the group with its current state
+                continue
+            _, task_id = heapq.heappop(heap)
+            _, _, task = self._tasks.pop(task_id)
+            self._load[group] = load + 1
+            self._push_group(group)
+            return task
+        raise IndexError("pop from an empty ReadyQueue")
+
+    def drain(self) -> list[Task]:
+        """Pop every task, returning them in pick order."""
+        return [self.pop() for _ in range(len(self._tasks))]
+
+    @classmethod
+    def build(
+        cls,
+        tasks: Iterable[tuple[Task, datetime]],
+        aging_hours: float | None = None,
+        group_of: Callable[[Task], Hashable] | None = None,
+        loads: dict[Hashable, int] | None = None,
+    ) -> "ReadyQueue":
+        """Create a queue from (task, ready_at) pairs and per-group in-progress counts."""
+        queue = cls(aging_hours, group_of)
+        for group, count in (loads or {}).items():
+            queue.set_load(group, count)
+        for task, ready_at in tasks:
+            queue.push(task, ready_at)
+        return queue
+
+    def _clean(self, group: Hashable) -> None:
+        """Drop removed or replaced tasks from the top of a group heap."""
+        heap = self._heaps[group]
+        while heap:
+            key, task_id = heap[0]
+            entry = self._tasks.get(task_id)
+            if entry is not None and entry[:2] == (key, group):
+                return
+            heapq.heappop(heap)
+
+    def _push_group(self, group: Hashable) -> None:
+        heap = self._heaps.get(group)
+        if not heap:
+            return
+        self._clean(group)
+        if heap:
+            state = (self._load.get(group, 0), heap[0][0])
+            if self._queued.get(group) == state:
+                return
+            self._queued[group] = state
+            tie = self._group_ids.setdefault(group, len(self._group_ids))
+            heapq.heappush(self._groups, (*state, tie, group))
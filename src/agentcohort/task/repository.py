@@ -1,12 +1,85 @@
+import functools
 import json
+import os
 import shutil
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-
-from agentcohort.task.exceptions import TaskNotFoundError
-from agentcohort.task.models import Note, Task, TaskMetadata, TaskStatus
+from typing import Any, Literal, cast
+
+from agentcohort.locking import file_lock
+from agentcohort.task.events import EventLog
+from agentcohort.task.exceptions import TaskExistsError, TaskNotFoundError
+from agentcohort.task.graph import CompactTaskGraph
+from agentcohort.task.index import TaskIndex
+from agentcohort.task.models import (
+    MergeResult,
+    Note,
+    Task,
+    TaskEvent,
+    TaskEventType,
+    TaskMetadata,
+    TaskRollup,
+    TaskStats,
+    TaskStatus,
+    TaskType,
+)
+from agentcohort.task.notes import NoteLog
+from agentcohort.task.oplog import GITIGNORE as OPLOG_GITIGNORE
+from agentcohort.task.oplog import TaskOpLog, replica_id, write_git_files
+from agentcohort.task.rollups import TaskRollups
+from agentcohort.task.stats import TaskFacts, compute_stats
+from agentcohort.task.timeline import TimeIndex
 from agentcohort.task.utils import PartialIdMatcher
+from agentcohort.worktree.git import read_head_commit
+
+TASK_BODY_FILES: tuple[str, ...] = ("description.md", "design.md", "acceptance.md")
+STORE_GITIGNORE = """\
+# Written by agentcohort. Dot-files are local state: locks, the event log and the views derived from the tasks.
+.*
+!.gitignore
+*/notes.idx
+*/*.tmp
+"""
+# metadata fields that update() writes; changes to them are reported in the event log
+_UPDATED_FIELDS = {
+    "status",
+    "priority",
+    "deps",
+    "links",
+    "assignee",
+    "external_ref",
+    "parent",
+    "worktree",
+    "paths",
+    "started_at",
+    "closed_at",
+    "title",
+}
+
+
+class TaskSnapshot:
+    """Tasks as of one generation of the store (the offset of the last event reflected in them).
+
+    Tasks returned by list_all are shared with the snapshot and must be treated as read-only. The compact graph
+    built from the snapshot is kept until a write inside the transaction changes a task.
+    """
+
+    def __init__(self, generation: int, tasks: dict[str, Task]) -> None:
+        self.generation = generation
+        self.tasks = tasks
+        self.graph: CompactTaskGraph | None = None
+
+    def get(self, task_id: str) -> Task:
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise TaskNotFoundError(f"task '{task_id}' not found")
+        return task.model_copy(deep=True)
+
+    def list_all(self) -> list[Task]:
+        return [self.tasks[task_id] for task_id in sorted(self.tasks)]
 
 
 class TaskRepository(ABC):
@@ -14,10 +87,30 @@ class TaskRepository(ABC):
     def create(self, task: Task) -> Task:
         pass
 
+    @abstractmethod
+    def create_many(self, tasks: Iterable[Task]) -> list[str]:
+        pass
+
     @abstractmethod
     def get(self, task_id: str) -> Task:
         pass
 
+    @abstractmethod
+    def get_metadata(self, task_id: str) -> TaskMetadata:
+        pass
+
+    @abstractmethod
+    def lock(self) -> AbstractContextManager[None]:
+        pass
+
+    @abstractmethod
+    def read_transaction(self) -> AbstractContextManager[TaskSnapshot]:
+        pass
+
+    @abstractmethod
+    def resolve_id(self, partial_id: str) -> str:
+        pass
+
     @abstractmethod
     def find_by_partial_id(self, partial_id: str) -> Task:
         pass
@@ -26,10 +119,45 @@ class TaskRepository(ABC):
     def list_all(self) -> list[Task]:
         pass
 
+    @abstractmethod
+    def iter_all(self) -> Iterator[Task]:
+        pass
+
     @abstractmethod
     def find_by_status(self, status: TaskStatus) -> list[Task]:
         pass
 
+    @abstractmethod
+    def find_by(
+        self,
+        status: TaskStatus | None = None,
+        assignee: str | None = None,
+        type: TaskType | None = None,
+        parent: str | None = None,
+        priority: int | None = None,
+    ) -> list[Task]:
+        pass
+
+    @abstractmethod
+    def reindex(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_rollup(self, task_id: str) -> TaskRollup:
+        pass
+
+    @abstractmethod
+    def get_stats(self, since: datetime, until: datetime, interval: timedelta) -> TaskStats:
+        pass
+
+    @abstractmethod
+    def merge(self) -> MergeResult:
+        pass
+
+    @abstractmethod
+    def load_graph(self) -> CompactTaskGraph:
+        pass
+
     @abstractmethod
     def find_ready(self) -> list[Task]:
         pass
@@ -42,6 +170,14 @@ class TaskRepository(ABC):
     def find_recently_closed(self, limit: int = 20) -> list[Task]:
         pass
 
+    @abstractmethod
+    def find_updated_since(self, since: datetime) -> list[Task]:
+        pass
+
+    @abstractmethod
+    def closed_between(self, start: datetime, end: datetime | None = None) -> list[tuple[str, datetime]]:
+        pass
+
     @abstractmethod
     def update(self, task: Task) -> Task:
         pass
@@ -55,25 +191,89 @@ class TaskRepository(ABC):
         pass
 
     @abstractmethod
-    def add_note_to_task(self, task_id: str, note_content: str) -> tuple[Task, str]:
+    def add_note_to_task(self, task_id: str, note_content: str) -> int:
+        pass
+
+    @abstractmethod
+    def get_notes(self, task_id: str, start: int = 0, stop: int | None = None) -> list[Note]:
+        pass
+
+    @abstractmethod
+    def count_notes(self, task_id: str) -> int:
+        pass
+
+    @abstractmethod
+    def read_events(self, since: int = 0) -> Iterator[TaskEvent]:
+        pass
+
+    @abstractmethod
+    def first_event_offset(self) -> int:
+        pass
+
+    @abstractmethod
+    def compact_events(self, before: int) -> int:
         pass
 
 
 class DirectoryTaskRepository(TaskRepository):
-    def __init__(self, tasks_dir: Path) -> None:
+    def __init__(
+        self, tasks_dir: Path, compact_graph: bool = False, store_format: Literal["json", "oplog"] = "json"
+    ) -> None:
         self.tasks_dir = tasks_dir
+        self.compact_graph = compact_graph
+        self.store_format = store_format
         self.tasks_dir.mkdir(parents=True, exist_ok=True)
+        self.events = EventLog(tasks_dir)
+        # git changes the task files without logging events; the views are rebuilt when the checkout moves
+        stamp = functools.partial(read_head_commit, tasks_dir)
+        self.index = TaskIndex(tasks_dir, self.events, self._scan_metadata, stamp)
+        self.rollups = TaskRollups(tasks_dir, self.events, self._scan_metadata, stamp)
+        self.timeline = TimeIndex(tasks_dir, self.events, self._scan_metadata, stamp)
+        self.facts = TaskFacts(tasks_dir, self.events, self._scan_metadata, stamp)
+        self._snapshot: TaskSnapshot | None = None
+        self._replica: str | None = None
+        if store_format == "oplog":
+            write_git_files(tasks_dir)
+        else:
+            self._write_gitignore()
+
+    def _write_gitignore(self) -> None:
+        """Keep the store's local state out of git; a .gitignore of the user's own is left alone."""
+        path = self.tasks_dir / ".gitignore"
+        # the oplog store's .gitignore also ignores metadata.json, which this format commits
+        if not path.exists() or path.read_text() == OPLOG_GITIGNORE:
+            path.write_text(STORE_GITIGNORE)
 
     def _get_task_dir(self, task_id: str) -> Path:
         return self.tasks_dir / task_id
 
     def _get_all_task_dirs(self) -> list[Path]:
-        return [d for d in self.tasks_dir.iterdir() if d.is_dir()]
+        return sorted(d for d in self.tasks_dir.iterdir() if d.is_dir() and not d.name.startswith("."))
 
     def _get_metadata_path(self, task_dir: Path) -> Path:
         return task_dir / "metadata.json"
 
     def _read_metadata(self, task_dir: Path) -> TaskMetadata:
+        op_log = TaskOpLog(task_dir)
+        stamp = op_log.stamp()
+        if stamp is None:
+            return self._read_metadata_file(task_dir)
+        cached = self._load_metadata_cache(task_dir)
+        if cached is not None and cached.get("oplog") == stamp:
+            return TaskMetadata.model_validate(cached)
+        # the log changed behind the cache's back (a git merge or checkout): fold it in memory; the cache is only
+        # rewritten under the store lock, by the next write or 'task merge'
+        state, _ = op_log.materialize()
+        return TaskMetadata.model_validate(state)
+
+    def _load_metadata_cache(self, task_dir: Path) -> dict[str, Any] | None:
+        try:
+            data: object = json.loads(self._get_metadata_path(task_dir).read_text())
+        except (OSError, ValueError):
+            return None
+        return cast("dict[str, Any]", data) if isinstance(data, dict) else None
+
+    def _read_metadata_file(self, task_dir: Path) -> TaskMetadata:
         metadata_path = self._get_metadata_path(task_dir)
         if not metadata_path.exists():
             raise TaskNotFoundError(f"task metadata not found in {task_dir}")
@@ -81,8 +281,29 @@ class DirectoryTaskRepository(TaskRepository):
         return TaskMetadata.model_validate(data)
 
     def _write_metadata(self, task_dir: Path, metadata: TaskMetadata) -> None:
+        """Write the metadata (recording the change in the operation log, if the task has one); hold the lock."""
+        op_log = TaskOpLog(task_dir)
+        if self.store_format == "oplog" or op_log.exists():
+            old, last_clock = op_log.materialize()
+            op_log.record(old, metadata.model_dump(mode="json"), last_clock, self._replica_id())
+        self._write_metadata_file(task_dir, metadata, op_log.stamp())
+
+    def _replica_id(self) -> str:
+        if self._replica is None:
+            self._replica = replica_id(self.tasks_dir)
+        return self._replica
+
+    def _write_metadata_file(
+        self, task_dir: Path, metadata: TaskMetadata, oplog_stamp: dict[str, Any] | None = None
+    ) -> None:
+        # write-then-rename so readers in other worktrees never see a half-written file
         metadata_path = self._get_metadata_path(task_dir)
-        metadata_path.write_text(json.dumps(metadata.model_dump(mode="json"), indent=2))
+        data = metadata.model_dump(mode="json")
+        if oplog_stamp is not None:
+            data["oplog"] = oplog_stamp  # the operation log this cache was folded from
+        tmp_path = metadata_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        tmp_path.replace(metadata_path)
 
     def _read_markdown_file(self, task_dir: Path, filename: str) -> str:
         file_path = task_dir / filename
@@ -95,32 +316,58 @@ class DirectoryTaskRepository(TaskRepository):
         task_dir.mkdir(parents=True, exist_ok=True)
         file_path.write_text(content)
 
-    def _read_all_notes(self, task_dir: Path) -> list[Note]:
-        notes: list[Note] = []
-        for file_path in sorted(task_dir.glob("note-*.md")):
-            note = self._read_note_file(file_path)
-            if note:
-                notes.append(note)
-        return notes
-
-    def _read_note_file(self, file_path: Path) -> Note | None:
-        filename = file_path.name
-        if not filename.startswith("note-") or not filename.endswith(".md"):
-            return None
-        timestamp_str = filename[5:-3]
-        try:
-            dt = datetime.strptime(timestamp_str, "%Y%m%dT%H%M%S%f")
-            formatted_timestamp = dt.strftime("%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            return None
-        content = file_path.read_text()
-        return Note(timestamp=formatted_timestamp, content=content)
+    def _get_note_log(self, task_dir: Path, metadata: TaskMetadata) -> NoteLog:
+        note_log = NoteLog(task_dir)
+        legacy_files = [f for f in metadata.files if f.startswith("note-") and f.endswith(".md")]
+        if legacy_files:
+            with self.lock():
+                note_log.migrate_legacy(legacy_files)
+                metadata.files = [f for f in metadata.files if f not in legacy_files]
+                self._write_metadata(task_dir, metadata)
+        return note_log
 
     def create(self, task: Task) -> Task:
+        with self.lock():
+            metadata = self._write_new_task(task)
+            self.events.append(TaskEventType.CREATED, task.id, self._created_changes(metadata))
+            self._refresh_snapshot(task.id)
+            return task
+
+    def create_many(self, tasks: Iterable[Task]) -> list[str]:
+        """Create tasks under one hold of the store lock and log their events in one append.
+
+        Returns:
+            Ids of the tasks that already existed and were skipped
+        """
+        skipped: list[str] = []
+        created: list[TaskMetadata] = []
+        with self.lock():
+            for task in tasks:
+                try:
+                    created.append(self._write_new_task(task))
+                except TaskExistsError:
+                    skipped.append(task.id)
+            self.events.extend(
+                (TaskEventType.CREATED, metadata.id, self._created_changes(metadata)) for metadata in created
+            )
+            for metadata in created:
+                self._refresh_snapshot(metadata.id)
+        return skipped
+
+    @staticmethod
+    def _created_changes(metadata: TaskMetadata) -> dict[str, Any]:
+        return metadata.model_dump(mode="json", exclude={"id", "files"})
+
+    def _write_new_task(self, task: Task) -> TaskMetadata:
+        """Write the files of a new task; the caller holds the lock and logs the event."""
         task_dir = self._get_task_dir(task.id)
-        task_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            # mkdir is atomic, so it doubles as the reservation of the id across concurrent writers
+            task_dir.mkdir(parents=True)
+        except FileExistsError:
+            raise TaskExistsError(f"task '{task.id}' already exists") from None
 
-        files = ["description.md", "design.md", "acceptance.md"]
+        files = list(TASK_BODY_FILES)
         metadata = TaskMetadata(
             id=task.id,
             status=task.status,
@@ -132,6 +379,11 @@ class DirectoryTaskRepository(TaskRepository):
             assignee=task.assignee,
             external_ref=task.external_ref,
             parent=task.parent,
+            worktree=task.worktree,
+            paths=task.paths,
+            started_at=task.started_at,
+            closed_at=task.closed_at,
+            updated_at=task.updated_at or task.created,
             title=task.title,
             files=files,
         )
@@ -140,10 +392,43 @@ class DirectoryTaskRepository(TaskRepository):
         self._write_markdown_file(task_dir, "description.md", task.description or "")
         self._write_markdown_file(task_dir, "design.md", task.design or "")
         self._write_markdown_file(task_dir, "acceptance.md", task.acceptance or "")
-
-        return task
+        if task.notes:
+            NoteLog(task_dir).extend(task.notes)
+        return metadata
 
     def get(self, task_id: str) -> Task:
+        if self._snapshot is not None:
+            return self._snapshot.get(task_id)
+        return self._read_task(task_id)
+
+    @contextmanager
+    def read_transaction(self) -> Generator[TaskSnapshot]:
+        """Serve every read inside the block from one consistent snapshot of the store.
+
+        The store is scanned once; events logged during the scan are then replayed by re-reading just the tasks
+        they name, until no new event shows up, so the snapshot matches one generation of the event log without
+        rescanning. Writes made inside the block go to disk and are reflected in the snapshot. Nested calls share
+        the outer snapshot.
+        """
+        if self._snapshot is not None:
+            yield self._snapshot
+            return
+        generation = self.events.last_offset()
+        tasks = {task_dir.name: self._read_task(task_dir.name) for task_dir in self._get_all_task_dirs()}
+        while changed := list(self.events.read(generation)):
+            generation = changed[-1].offset
+            for task_id in {event.task_id for event in changed}:
+                try:
+                    tasks[task_id] = self._read_task(task_id)
+                except TaskNotFoundError:
+                    tasks.pop(task_id, None)
+        self._snapshot = TaskSnapshot(generation, tasks)
+        try:
+            yield self._snapshot
+        finally:
+            self._snapshot = None
+
+    def _read_task(self, task_id: str) -> Task:
         task_dir = self._get_task_dir(task_id)
         if not task_dir.exists():
             raise TaskNotFoundError(f"task '{task_id}' not found")
@@ -152,7 +437,7 @@ class DirectoryTaskRepository(TaskRepository):
         description = self._read_markdown_file(task_dir, "description.md")
         design = self._read_markdown_file(task_dir, "design.md")
         acceptance = self._read_markdown_file(task_dir, "acceptance.md")
-        notes = self._read_all_notes(task_dir)
+        notes = self._get_note_log(task_dir, metadata).read()
 
         return Task(
             id=metadata.id,
@@ -166,30 +451,158 @@ class DirectoryTaskRepository(TaskRepository):
             assignee=metadata.assignee,
             external_ref=metadata.external_ref,
             parent=metadata.parent,
+            worktree=metadata.worktree,
+            paths=metadata.paths,
+            started_at=metadata.started_at,
+            closed_at=metadata.closed_at,
+            updated_at=metadata.updated_at,
             description=description,
             design=design,
             acceptance=acceptance,
             notes=notes,
         )
 
-    def find_by_partial_id(self, partial_id: str) -> Task:
+    def lock(self) -> AbstractContextManager[None]:
+        """Exclusive lock over the store for read-check-write sequences such as claiming a task."""
+        return file_lock(self.tasks_dir / ".lock")
+
+    def get_metadata(self, task_id: str) -> TaskMetadata:
+        task_dir = self._get_task_dir(task_id)
+        if not task_dir.exists():
+            raise TaskNotFoundError(f"task '{task_id}' not found")
+        return self._read_metadata(task_dir)
+
+    def resolve_id(self, partial_id: str) -> str:
         all_ids = self.get_all_ids()
         matcher = PartialIdMatcher(all_ids)
-        resolved_id = matcher.resolve(partial_id)
-        return self.get(resolved_id)
+        return matcher.resolve(partial_id)
+
+    def find_by_partial_id(self, partial_id: str) -> Task:
+        return self.get(self.resolve_id(partial_id))
 
     def list_all(self) -> list[Task]:
-        tasks: list[Task] = []
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Task]:
+        if self._snapshot is not None:
+            yield from self._snapshot.list_all()
+            return
         for task_dir in self._get_all_task_dirs():
-            task_id = task_dir.name
-            task = self.get(task_id)
-            tasks.append(task)
-        return tasks
+            yield self.get(task_dir.name)
 
     def find_by_status(self, status: TaskStatus) -> list[Task]:
-        return [task for task in self.list_all() if task.status == status]
+        return self.find_by(status=status)
+
+    def find_by(
+        self,
+        status: TaskStatus | None = None,
+        assignee: str | None = None,
+        type: TaskType | None = None,
+        parent: str | None = None,
+        priority: int | None = None,
+    ) -> list[Task]:
+        """Return the tasks matching all given field values, reading only those tasks from disk."""
+        filters = {"status": status, "assignee": assignee, "type": type, "parent": parent, "priority": priority}
+        filters = {field: value for field, value in filters.items() if value is not None}
+        if not filters:
+            return self.list_all()
+        if self._snapshot is not None:
+            candidates = self._snapshot.list_all()
+        else:
+            candidates = self._get_existing(sorted(self.index.lookup(**filters)))
+        # the index can lag behind files changed outside the repository (e.g. uncommitted edits reverted by git)
+        return [task for task in candidates if all(getattr(task, f) == v for f, v in filters.items())]
+
+    def reindex(self) -> int:
+        """Rebuild the secondary indexes and rollups from the task metadata and return the number of tasks indexed."""
+        self.rollups.rebuild()
+        self.timeline.rebuild()
+        self.facts.rebuild()
+        return len(self.index.rebuild()["ids"])
+
+    def get_rollup(self, task_id: str) -> TaskRollup:
+        if not self._get_task_dir(task_id).exists():
+            raise TaskNotFoundError(f"task '{task_id}' not found")
+        return self.rollups.rollup(task_id)
+
+    def get_stats(self, since: datetime, until: datetime, interval: timedelta) -> TaskStats:
+        return compute_stats(self.facts.rows(), since, until, interval)
+
+    def _scan_metadata(self) -> Iterator[TaskMetadata]:
+        for task_dir in self._get_all_task_dirs():
+            try:
+                metadata = self._read_metadata(task_dir)
+            except TaskNotFoundError:
+                continue
+            # tasks written before the store kept timestamps are dated by their directory
+            if metadata.closed_at is None and metadata.status == TaskStatus.CLOSED:
+                metadata.closed_at = datetime.fromtimestamp(task_dir.stat().st_mtime, UTC).isoformat()
+            if metadata.updated_at is None:
+                metadata.updated_at = metadata.created
+            yield metadata
+
+    def merge(self) -> MergeResult:
+        """Bring the store's derived state up to date after git changed its files, e.g. by merging a branch.
+
+        Tasks whose operation log changed since their metadata.json was written are folded again, and the
+        differences are logged as events, so indexes and other views catch up; tasks that appeared or disappeared
+        are logged as created or deleted. With the oplog format, tasks that only have a metadata.json get an
+        operation log. The result does not depend on the order in which the merged operations were stored.
+        """
+        result = MergeResult()
+        with self.lock():
+            if self.store_format == "oplog":
+                write_git_files(self.tasks_dir)
+            known = set(self.index.load()["ids"])
+            present: set[str] = set()
+            for task_dir in self._get_all_task_dirs():
+                op_log = TaskOpLog(task_dir)
+                stamp = op_log.stamp()
+                cache = self._load_metadata_cache(task_dir)
+                stale = stamp is not None and (cache is None or cache.get("oplog") != stamp)
+                convert = self.store_format == "oplog" and stamp is None
+                if not (stale or convert or task_dir.name not in known):
+                    present.add(task_dir.name)
+                    continue
+                cached = TaskMetadata.model_validate(cache) if cache is not None else None
+                try:
+                    metadata = self._read_metadata(task_dir)
+                except TaskNotFoundError:
+                    continue
+                present.add(task_dir.name)
+                if stale:
+                    self._write_metadata_file(task_dir, metadata, stamp)
+                    result.materialized += 1
+                if convert:
+                    self._write_metadata(task_dir, metadata)
+                    result.converted += 1
+
+                values = metadata.model_dump(mode="json", exclude={"id", "files"})
+                if task_dir.name not in known:
+                    self.events.append(TaskEventType.CREATED, metadata.id, values)
+                    result.created.append(metadata.id)
+                    continue
+                old_values = cached.model_dump(mode="json", exclude={"id", "files"}) if cached else {}
+                changes = {field: value for field, value in values.items() if old_values.get(field) != value}
+                if changes:
+                    self.events.append(TaskEventType.UPDATED, metadata.id, changes)
+                    result.updated.append(metadata.id)
+            for task_id in sorted(known - present):
+                self.events.append(TaskEventType.DELETED, task_id)
+                result.deleted.append(task_id)
+        return result
+
+    def load_graph(self) -> CompactTaskGraph:
+        """Build a columnar copy of the dependency graph from task metadata, or once per active snapshot."""
+        if self._snapshot is not None:
+            if self._snapshot.graph is None:
+                self._snapshot.graph = CompactTaskGraph.build(self._snapshot.list_all())
+            return self._snapshot.graph
+        return CompactTaskGraph.build(self._scan_metadata())
 
     def find_ready(self) -> list[Task]:
+        if self.compact_graph:
+            return self._get_existing(sorted(self.load_graph().ready()))
         all_tasks = {task.id: task for task in self.list_all()}
         result: list[Task] = []
         for task in all_tasks.values():
@@ -206,6 +619,8 @@ class DirectoryTaskRepository(TaskRepository):
         return result
 
     def find_blocked(self) -> list[Task]:
+        if self.compact_graph:
+            return self._get_existing(sorted(self.load_graph().blocked()))
         all_tasks = {task.id: task for task in self.list_all()}
         result: list[Task] = []
         for task in all_tasks.values():
@@ -221,21 +636,61 @@ class DirectoryTaskRepository(TaskRepository):
         return result
 
     def find_recently_closed(self, limit: int = 20) -> list[Task]:
-        closed_tasks = self.find_by_status(TaskStatus.CLOSED)
-        with_mtime: list[tuple[float, Task]] = []
-        for task in closed_tasks:
-            task_dir = self._get_task_dir(task.id)
-            mtime = task_dir.stat().st_mtime
-            with_mtime.append((mtime, task))
-        with_mtime.sort(key=lambda x: x[0], reverse=True)
-        return [task for _, task in with_mtime[:limit]]
+        return self._get_existing(self.timeline.latest("closed_at", limit))
+
+    def find_updated_since(self, since: datetime) -> list[Task]:
+        """Return the tasks changed at or after since, most recently changed first."""
+        return self._get_existing(task_id for task_id, _ in self.timeline.since("updated_at", since))
+
+    def closed_between(self, start: datetime, end: datetime | None = None) -> list[tuple[str, datetime]]:
+        """Return (id, closed_at) of the tasks closed in [start, end), most recent first."""
+        return self.timeline.since("closed_at", start, end)
+
+    def _get_existing(self, task_ids: Iterable[str]) -> list[Task]:
+        tasks: list[Task] = []
+        for task_id in task_ids:
+            try:
+                tasks.append(self.get(task_id))
+            except TaskNotFoundError:
+                continue  # deleted after the index was read
+        return tasks
 
     def update(self, task: Task) -> Task:
+        with self.lock():
+            return self._update(task)
+
+    def _update(self, task: Task) -> Task:
         task_dir = self._get_task_dir(task.id)
         if not task_dir.exists():
             raise TaskNotFoundError(f"task '{task.id}' not found")
 
         metadata = self._read_metadata(task_dir)
+        now = datetime.now(UTC).isoformat()
+        if task.status == TaskStatus.IN_PROGRESS and metadata.status != TaskStatus.IN_PROGRESS:
+            task.started_at = now
+        if task.status != TaskStatus.CLOSED:
+            task.closed_at = None
+        elif metadata.status != TaskStatus.CLOSED:
+            task.closed_at = now
+        old_values = metadata.model_dump(mode="json", include=_UPDATED_FIELDS)
+        changes = {
+            field: value
+            for field, value in task.model_dump(mode="json", include=_UPDATED_FIELDS).items()
+            if old_values[field] != value
+        }
+        bodies: dict[str, str] = {}
+        for field, filename in (
+            ("description", "description.md"),
+            ("design", "design.md"),
+            ("acceptance", "acceptance.md"),
+        ):
+            content = getattr(task, field) or ""
+            if self._read_markdown_file(task_dir, filename) != content:
+                bodies[filename] = changes[field] = content
+        if changes:
+            task.updated_at = changes["updated_at"] = now
+        else:
+            task.updated_at = metadata.updated_at
 
         metadata.status = task.status
         metadata.priority = task.priority
@@ -244,17 +699,28 @@ class DirectoryTaskRepository(TaskRepository):
         metadata.assignee = task.assignee
         metadata.external_ref = task.external_ref
         metadata.parent = task.parent
+        metadata.worktree = task.worktree
+        metadata.paths = task.paths
+        metadata.started_at = task.started_at
+        metadata.closed_at = task.closed_at
+        metadata.updated_at = task.updated_at
         metadata.title = task.title
 
-        self._write_metadata(task_dir, metadata)
-
-        self._write_markdown_file(task_dir, "description.md", task.description or "")
-        self._write_markdown_file(task_dir, "design.md", task.design or "")
-        self._write_markdown_file(task_dir, "acceptance.md", task.acceptance or "")
+        if changes:
+            self._write_metadata(task_dir, metadata)
+        for filename, content in bodies.items():
+            self._write_markdown_file(task_dir, filename, content)
 
+        if changes:
+            self.events.append(TaskEventType.UPDATED, task.id, changes)
+        self._refresh_snapshot(task.id)
         return task
 
     def delete(self, task_id: str) -> None:
+        with self.lock():
+            self._delete(task_id)
+
+    def _delete(self, task_id: str) -> None:
         task_dir = self._get_task_dir(task_id)
         if not task_dir.exists():
             raise TaskNotFoundError(f"task '{task_id}' not found")
@@ -273,29 +739,60 @@ class DirectoryTaskRepository(TaskRepository):
                 task.parent = None
                 updated = True
             if updated:
-                self.update(task)
+                self._update(task)
 
         shutil.rmtree(task_dir)
+        self.events.append(TaskEventType.DELETED, task_id)
+        self._refresh_snapshot(task_id)
 
     def get_all_ids(self) -> list[str]:
+        if self._snapshot is not None:
+            return sorted(self._snapshot.tasks)
         return [task_dir.name for task_dir in self._get_all_task_dirs()]
 
-    def add_note_to_task(self, task_id: str, note_content: str) -> tuple[Task, str]:
-        from datetime import UTC
+    def _refresh_snapshot(self, task_id: str) -> None:
+        """Reflect a write made inside a read transaction in its snapshot."""
+        if self._snapshot is None:
+            return
+        self._snapshot.graph = None
+        try:
+            self._snapshot.tasks[task_id] = self._read_task(task_id)
+        except TaskNotFoundError:
+            self._snapshot.tasks.pop(task_id, None)
+
+    def add_note_to_task(self, task_id: str, note_content: str) -> int:
+        with self.lock():
+            return self._add_note_to_task(task_id, note_content)
 
+    def _add_note_to_task(self, task_id: str, note_content: str) -> int:
         task_dir = self._get_task_dir(task_id)
         if not task_dir.exists():
             raise TaskNotFoundError(f"task '{task_id}' not found")
+        metadata = self._read_metadata(task_dir)
+        index = self._get_note_log(task_dir, metadata).append(NoteLog.new_note(note_content))
+        self.events.append(TaskEventType.NOTE_ADDED, task_id, {"index": index})
+        self._refresh_snapshot(task_id)
+        return index
 
-        timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")[:-3]
-        note_filename = f"note-{timestamp}.md"
-
-        self._write_markdown_file(task_dir, note_filename, note_content)
+    def get_notes(self, task_id: str, start: int = 0, stop: int | None = None) -> list[Note]:
+        task_dir = self._get_task_dir(task_id)
+        if not task_dir.exists():
+            raise TaskNotFoundError(f"task '{task_id}' not found")
+        metadata = self._read_metadata(task_dir)
+        return self._get_note_log(task_dir, metadata).read(start, stop)
 
+    def count_notes(self, task_id: str) -> int:
+        task_dir = self._get_task_dir(task_id)
+        if not task_dir.exists():
+            raise TaskNotFoundError(f"task '{task_id}' not found")
         metadata = self._read_metadata(task_dir)
-        if note_filename not in metadata.files:
-            metadata.files.append(note_filename)
-            self._write_metadata(task_dir, metadata)
+        return self._get_note_log(task_dir, metadata).count()
+
+    def read_events(self, since: int = 0) -> Iterator[TaskEvent]:
+        return self.events.read(since)
+
+    def first_event_offset(self) -> int:
+        return self.events.first_offset()
 
-        updated_task = self.get(task_id)
-        return updated_task, note_filename
+    def compact_events(self, before: int) -> int:
+        return self.events.compact(before)
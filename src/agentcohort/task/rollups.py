@@ -0,0 +1,96 @@
+from collections.abc import Iterable
+from typing import Any
+
+from agentcohort.task.events import EventLogView, ViewRebuildRequired
+from agentcohort.task.models import TaskEvent, TaskEventType, TaskMetadata, TaskRollup, TaskStatus
+
+_STATUSES: tuple[TaskStatus, ...] = (TaskStatus.OPEN, TaskStatus.IN_PROGRESS, TaskStatus.CLOSED)
+_PRIORITIES = 5
+# a counter vector holds one count per status followed by the number of unclosed tasks per priority
+_WIDTH = len(_STATUSES) + _PRIORITIES
+
+
+class TaskRollups(EventLogView):
+    """Per-task counters over all descendants (by ``parent``), kept incrementally.
+
+    Every node stores its own status, priority and parent plus a counter vector summed over its subtree.
+    A status, priority or parent change of one task adjusts the vectors along its ancestor chain only, so
+    both updates and rollup queries cost O(depth) instead of a scan of the store. Subtree sums are not
+    defined for a parent cycle, so an update that runs into one rebuilds the counters instead.
+    """
+
+    FILENAME = ".rollups.json"
+    VERSION = 1
+
+    def rollup(self, task_id: str) -> TaskRollup:
+        """Return the counts over the descendants of task_id (zero counts for a task without children)."""
+        node = self.load()["nodes"].get(task_id)
+        counts: list[int] = node["counts"] if node else [0] * _WIDTH
+        blocking = counts[len(_STATUSES) :]
+        return TaskRollup(
+            task_id=task_id,
+            open=counts[0],
+            in_progress=counts[1],
+            closed=counts[2],
+            highest_blocking_priority=next((p for p in range(_PRIORITIES) if blocking[p]), None),
+        )
+
+    def _build(self, tasks: Iterable[TaskMetadata]) -> dict[str, Any]:
+        nodes: dict[str, dict[str, Any]] = {}
+        for metadata in tasks:
+            node = nodes.setdefault(metadata.id, _new_node())
+            node.update(parent=metadata.parent, status=metadata.status.value, priority=metadata.priority)
+        for task_id, node in list(nodes.items()):
+            _propagate(nodes, task_id, node["parent"], _own_counts(node), 1)
+        return {"nodes": nodes}
+
+    def _apply(self, data: dict[str, Any], events: list[TaskEvent]) -> None:
+        nodes: dict[str, dict[str, Any]] = data["nodes"]
+        for event in events:
+            if event.type == TaskEventType.NOTE_ADDED:
+                continue
+            node = nodes.setdefault(event.task_id, _new_node())
+            before = _add(_own_counts(node), node["counts"])
+            if not _propagate(nodes, event.task_id, node["parent"], before, -1):
+                raise ViewRebuildRequired(f"parent cycle through {event.task_id}")
+            if event.type == TaskEventType.DELETED:
+                node.update(parent=None, status=None, priority=None)
+            else:
+                for field in ("parent", "status", "priority"):
+                    if field in event.changes:
+                        node[field] = event.changes[field]
+                after = _add(_own_counts(node), node["counts"])
+                if not _propagate(nodes, event.task_id, node["parent"], after, 1):
+                    raise ViewRebuildRequired(f"parent cycle through {event.task_id}")
+            if node["status"] is None and not any(node["counts"]):
+                del nodes[event.task_id]
+
+
+def _new_node() -> dict[str, Any]:
+    return {"parent": None, "status": None, "priority": None, "counts": [0] * _WIDTH}
+
+
+def _own_counts(node: dict[str, Any]) -> list[int]:
+    counts = [0] * _WIDTH
+    if node["status"] is not None:
+        counts[_STATUSES.index(TaskStatus(node["status"]))] = 1
+        if node["status"] != TaskStatus.CLOSED and node["priority"] is not None:
+            counts[len(_STATUSES) + node["priority"]] = 1
+    return counts
+
+
+def _add(a: list[int], b: list[int]) -> list[int]:
+    return [x + y for x, y in zip(a, b, strict=True)]
+
+
+def _propagate(nodes: dict[str, dict[str, Any]], task_id: str, parent: str | None, delta: list[int], sign: int) -> bool:
+    """Add sign * delta to the counters of every ancestor; return False if the chain runs into a cycle."""
+    seen = {task_id}
+    while parent is not None:
+        if parent in seen:
+            return False
+        seen.add(parent)
+        ancestor = nodes.setdefault(parent, _new_node())
+        ancestor["counts"] = [count + sign * d for count, d in zip(ancestor["counts"], delta, strict=True)]
+        parent = ancestor["parent"]
+    return True
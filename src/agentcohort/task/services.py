@@ -1,16 +1,58 @@
-from datetime import UTC, datetime
+import contextlib
+import itertools
+import json
+import operator
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import AbstractContextManager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Literal, TextIO
 
-from agentcohort.task.exceptions import CircularDependencyError, TaskNotFoundError
+from agentcohort.task.exceptions import (
+    CircularDependencyError,
+    InvalidTaskStatusError,
+    PathConflictError,
+    TaskError,
+    TaskExistsError,
+    TaskNotFoundError,
+)
+from agentcohort.task.graph import CompactTaskGraph
 from agentcohort.task.id_generator import TaskIdGenerator
-from agentcohort.task.models import Task, TaskStatus, TaskType
-from agentcohort.task.repository import TaskRepository
-from agentcohort.task.utils import TreeVisualizer
+from agentcohort.task.locks import PathLockIndex, is_literal, split_pattern
+from agentcohort.task.models import (
+    DoctorReport,
+    GraphIssue,
+    GraphIssueKind,
+    ImportResult,
+    MergeResult,
+    Note,
+    Task,
+    TaskBase,
+    TaskEvent,
+    TaskRollup,
+    TaskStats,
+    TaskStatus,
+    TaskType,
+)
+from agentcohort.task.queue import ReadyQueue
+from agentcohort.task.repository import TASK_BODY_FILES, TaskRepository, TaskSnapshot
+from agentcohort.task.utils import GraphValidator, TreeVisualizer, parse_timestamp
 
 
 class TaskService:
-    def __init__(self, repository: TaskRepository, id_generator: TaskIdGenerator) -> None:
+    MAX_ID_ATTEMPTS = 8
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        id_generator: TaskIdGenerator,
+        aging_hours: float | None = None,
+        fair_share: Literal["assignee", "type"] | None = None,
+    ) -> None:
         self.repository = repository
         self.id_generator = id_generator
+        self.aging_hours = aging_hours
+        self.fair_share = fair_share
 
     def create_task(
         self,
@@ -26,7 +68,6 @@ class TaskService:
     ) -> Task:
         if not 0 <= priority <= 4:
             raise ValueError("priority must be between 0 and 4")
-        task_id = self.id_generator.generate()
         if parent:
             try:
                 self.repository.find_by_partial_id(parent)
@@ -34,7 +75,7 @@ class TaskService:
                 raise ValueError(f"parent task '{parent}' not found")
         created = datetime.now(UTC).isoformat()
         task = Task(
-            id=task_id,
+            id="",
             status=TaskStatus.OPEN,
             type=task_type,
             priority=priority,
@@ -50,15 +91,49 @@ class TaskService:
             parent=parent,
             notes=[],
         )
-        return self.repository.create(task)
+        store_size = len(self.repository.get_all_ids())
+        for attempt in range(self.MAX_ID_ATTEMPTS):
+            task.id = self.id_generator.generate(store_size, attempt)
+            try:
+                return self.repository.create(task)
+            except TaskExistsError:
+                continue
+        raise TaskError(f"could not allocate a unique task id after {self.MAX_ID_ATTEMPTS} attempts")
 
     def set_status(self, task_id: str, status: TaskStatus) -> Task:
         task = self.repository.find_by_partial_id(task_id)
         task.status = status
         return self.repository.update(task)
 
-    def start_task(self, task_id: str) -> Task:
-        return self.set_status(task_id, TaskStatus.IN_PROGRESS)
+    def start_task(self, task_id: str, worktree: str | None = None) -> Task:
+        """Mark a task in_progress, recording the worktree it is worked on in if given."""
+        task = self.repository.find_by_partial_id(task_id)
+        task.status = TaskStatus.IN_PROGRESS
+        if worktree is not None:
+            task.worktree = worktree
+        return self.repository.update(task)
+
+    def clear_worktrees(self, bindings: dict[Path, str]) -> list[Task]:
+        """Forget the worktree of tasks whose bound worktree was removed or released.
+
+        A task that has since been started in another worktree keeps that one.
+
+        Args:
+            bindings: Removed bindings, worktree path to task id
+
+        Returns:
+            The tasks that were updated
+        """
+        cleared: list[Task] = []
+        for worktree_path, task_id in bindings.items():
+            try:
+                task = self.repository.get(task_id)
+            except TaskNotFoundError:
+                continue
+            if task.worktree == str(worktree_path):
+                task.worktree = None
+                cleared.append(self.repository.update(task))
+        return cleared
 
     def close_task(self, task_id: str) -> Task:
         return self.set_status(task_id, TaskStatus.CLOSED)
@@ -69,14 +144,178 @@ class TaskService:
     def get_task(self, task_id: str) -> Task:
         return self.repository.find_by_partial_id(task_id)
 
-    def list_tasks(self, status_filter: TaskStatus | None = None) -> list[Task]:
-        if status_filter is not None:
-            return self.repository.find_by_status(status_filter)
-        return self.repository.list_all()
+    def get_task_paths(self, task_id: str) -> tuple[str, list[str]]:
+        """Return the resolved task id and the directories to check out for the task.
 
-    def get_ready_tasks(self) -> list[Task]:
-        tasks = self.repository.find_ready()
-        return sorted(tasks, key=lambda t: (t.priority, t.id))
+        These are the literal prefixes of the declared path globs (a glob starting with a wildcard cannot narrow a
+        checkout) followed by any repository paths listed in the task's files metadata.
+        """
+        resolved_task_id = self.repository.resolve_id(task_id)
+        metadata = self.repository.get_metadata(resolved_task_id)
+        paths: list[str] = []
+        for pattern in metadata.paths:
+            prefix = "/".join(itertools.takewhile(is_literal, split_pattern(pattern)))
+            if prefix and prefix not in paths:
+                paths.append(prefix)
+        paths.extend(
+            f
+            for f in metadata.files
+            if f not in TASK_BODY_FILES and not (f.startswith("note-") and f.endswith(".md")) and f not in paths
+        )
+        return resolved_task_id, paths
+
+    def declare_paths(self, task_id: str, patterns: list[str]) -> Task:
+        """Add path globs (relative to the repository root) that the task is going to touch."""
+        task = self.repository.find_by_partial_id(task_id)
+        for pattern in patterns:
+            segments = split_pattern(pattern)
+            if not segments or ".." in segments:
+                raise ValueError(f"Invalid path pattern: '{pattern}'")
+            normalized = "/".join(segments)
+            if normalized not in task.paths:
+                task.paths.append(normalized)
+        return self.repository.update(task)
+
+    def undeclare_paths(self, task_id: str, patterns: list[str] | None = None) -> Task:
+        """Remove declared path globs, or all of them when patterns is None."""
+        task = self.repository.find_by_partial_id(task_id)
+        if patterns is None:
+            task.paths = []
+        else:
+            removed = {"/".join(split_pattern(pattern)) for pattern in patterns}
+            task.paths = [path for path in task.paths if path not in removed]
+        return self.repository.update(task)
+
+    def find_path_conflicts(self, tasks: list[Task]) -> dict[str, set[str]]:
+        """Map each task that is not yet in progress to the in-progress tasks whose declared paths overlap its own."""
+        index = PathLockIndex()
+        for task in self.repository.find_by_status(TaskStatus.IN_PROGRESS):
+            if task.paths:
+                index.add(task.id, task.paths)
+        conflicts: dict[str, set[str]] = {}
+        for task in tasks:
+            if task.paths and task.status != TaskStatus.IN_PROGRESS:
+                overlapping = index.conflicts(task.paths, exclude=task.id)
+                if overlapping:
+                    conflicts[task.id] = overlapping
+        return conflicts
+
+    def claim_task(self, task_id: str | None = None, assignee: str | None = None) -> Task:
+        """Start a ready task whose declared paths do not overlap those of any in-progress task.
+
+        Without task_id the highest-priority such task is claimed. The check and the status change happen under
+        the store lock, so agents claiming at the same time never end up with overlapping tasks.
+        """
+        with self.repository.lock(), self.repository.read_transaction():
+            if task_id is not None:
+                task = self.repository.find_by_partial_id(task_id)
+                if task.status != TaskStatus.OPEN:
+                    raise InvalidTaskStatusError(f"Task '{task.id}' is {task.status.value}, not open")
+                if not all(self._is_closed(dep_id) for dep_id in task.deps):
+                    raise TaskError(f"Task '{task.id}' is blocked by open dependencies")
+                conflicts = self.find_path_conflicts([task]).get(task.id)
+                if conflicts:
+                    holders = ", ".join(sorted(conflicts))
+                    raise PathConflictError(
+                        f"Task '{task.id}' declares paths overlapping in-progress task(s): {holders}"
+                    )
+            else:
+                # the ready list puts in-progress tasks first, so the first open one is the head of the queue
+                task = next((t for t in self.get_ready_tasks() if t.status == TaskStatus.OPEN), None)
+                if task is None:
+                    raise TaskError("No ready task can be claimed without overlapping an in-progress task")
+            task.status = TaskStatus.IN_PROGRESS
+            if assignee:
+                task.assignee = assignee
+            return self.repository.update(task)
+
+    def list_tasks(
+        self,
+        status_filter: TaskStatus | None = None,
+        assignee: str | None = None,
+        type_filter: TaskType | None = None,
+        updated_since: datetime | None = None,
+    ) -> list[Task]:
+        """List tasks matching all given filters; with updated_since, most recently changed first."""
+        if updated_since is None:
+            return self.repository.find_by(status=status_filter, assignee=assignee, type=type_filter)
+        if updated_since.tzinfo is None:
+            updated_since = updated_since.astimezone()  # a time given without timezone is local time
+        return [
+            task
+            for task in self.repository.find_updated_since(updated_since)
+            if (status_filter is None or task.status == status_filter)
+            and (assignee is None or task.assignee == assignee)
+            and (type_filter is None or task.type == type_filter)
+        ]
+
+    def reindex(self) -> int:
+        return self.repository.reindex()
+
+    def merge(self) -> MergeResult:
+        """Fold task operation logs changed by git (e.g. by merging a branch) and let the views catch up."""
+        return self.repository.merge()
+
+    def get_stats(
+        self, since: datetime | None = None, until: datetime | None = None, interval: timedelta = timedelta(days=1)
+    ) -> TaskStats:
+        """Compute throughput and timing statistics for [since, until), by default the last 30 days."""
+        until = until.astimezone() if until is not None else datetime.now(UTC)
+        since = since.astimezone() if since is not None else until - timedelta(days=30)
+        return self.repository.get_stats(since, until, interval)
+
+    def get_rollup(self, task_id: str) -> TaskRollup:
+        """Return status counts over the whole subtree of children below a task (typically an epic)."""
+        return self.repository.get_rollup(self.repository.resolve_id(task_id))
+
+    def get_ready_tasks(self, include_conflicting: bool = False) -> list[Task]:
+        """Return unblocked tasks: in-progress ones by priority, then open ones in the order they should be picked.
+
+        Open tasks whose paths overlap in-progress ones are left out unless include_conflicting is set.
+        """
+        with self.repository.read_transaction():
+            tasks = self.repository.find_ready()
+            if not include_conflicting:
+                conflicts = self.find_path_conflicts(tasks)
+                tasks = [task for task in tasks if task.id not in conflicts]
+            started = sorted((t for t in tasks if t.status == TaskStatus.IN_PROGRESS), key=lambda t: (t.priority, t.id))
+            return started + self._ready_queue([t for t in tasks if t.status == TaskStatus.OPEN]).drain()
+
+    def _ready_queue(self, tasks: list[Task]) -> ReadyQueue:
+        """Queue open ready tasks, aged from the time they became ready and shared out per the fair-share setting."""
+        group_of: Callable[[Task], Hashable] | None = None
+        loads: dict[Hashable, int] = {}
+        if self.fair_share is not None:
+            group_of = operator.attrgetter(self.fair_share)
+            for task in self.repository.find_by_status(TaskStatus.IN_PROGRESS):
+                loads[group_of(task)] = loads.get(group_of(task), 0) + 1
+
+        def ready_at(task: Task) -> datetime:
+            # a task becomes ready when it is created or when its last dependency closes
+            times = [parse_timestamp(task.created)]
+            for dep_id in task.deps:
+                with contextlib.suppress(TaskNotFoundError):
+                    closed_at = self.repository.get(dep_id).closed_at
+                    if closed_at:
+                        times.append(parse_timestamp(closed_at))
+            return max(times)
+
+        pairs = ((task, ready_at(task)) for task in tasks) if self.aging_hours else ((task, _EPOCH) for task in tasks)
+        return ReadyQueue.build(pairs, aging_hours=self.aging_hours, group_of=group_of, loads=loads)
+
+    def load_graph(self) -> CompactTaskGraph:
+        """Return a columnar copy of the dependency graph for callers that query the whole store repeatedly."""
+        return self.repository.load_graph()
+
+    def read_transaction(self) -> AbstractContextManager[TaskSnapshot]:
+        """Serve all reads inside the block from one consistent snapshot of the store."""
+        return self.repository.read_transaction()
+
+    def _is_closed(self, task_id: str) -> bool:
+        try:
+            return self.repository.get(task_id).status == TaskStatus.CLOSED
+        except TaskNotFoundError:
+            return False
 
     def get_blocked_tasks(self) -> list[Task]:
         tasks = self.repository.find_blocked()
@@ -85,14 +324,42 @@ class TaskService:
     def get_recently_closed_tasks(self, limit: int = 20) -> list[Task]:
         return self.repository.find_recently_closed(limit)
 
-    def add_note(self, task_id: str, note_content: str) -> tuple[Task, str]:
-        resolved_task_id = self.repository.find_by_partial_id(task_id).id
-        return self.repository.add_note_to_task(resolved_task_id, note_content)
+    def add_note(self, task_id: str, note_content: str) -> tuple[str, int]:
+        resolved_task_id = self.repository.resolve_id(task_id)
+        return resolved_task_id, self.repository.add_note_to_task(resolved_task_id, note_content)
+
+    def get_events(self, since: int = 0, limit: int | None = None) -> tuple[int, list[TaskEvent]]:
+        """Return the offset of the oldest event still logged and up to limit events after the since cursor.
+
+        If the oldest logged offset is greater than since + 1, events the caller has not seen were compacted away.
+        """
+        events = self.repository.read_events(since)
+        if limit is not None:
+            events = itertools.islice(events, limit)
+        return self.repository.first_event_offset(), list(events)
+
+    def compact_events(self, before: int) -> int:
+        """Drop logged events below the before offset (whole segments only) and return how many were dropped."""
+        return self.repository.compact_events(before)
+
+    def get_notes(
+        self, task_id: str, start: int = 0, stop: int | None = None, tail: int | None = None
+    ) -> tuple[str, int, list[Note]]:
+        """Return the resolved task id, the index of the first returned note and the notes."""
+        resolved_task_id = self.repository.resolve_id(task_id)
+        count = self.repository.count_notes(resolved_task_id)
+        if tail is not None:
+            if tail < 0:
+                raise ValueError("tail must be non-negative")
+            start, stop = max(count - tail, 0), None
+        first, last, _ = slice(start, stop).indices(count)
+        return resolved_task_id, first, self.repository.get_notes(resolved_task_id, first, last)
 
 
 class DependencyService:
-    def __init__(self, repository: TaskRepository) -> None:
+    def __init__(self, repository: TaskRepository, compact_graph: bool = False) -> None:
         self.repository = repository
+        self.compact_graph = compact_graph
 
     def add_dependency(self, task_id: str, dep_id: str) -> Task:
         task = self.repository.find_by_partial_id(task_id)
@@ -116,11 +383,15 @@ class DependencyService:
 
     def get_dependency_tree(self, root_id: str, full_mode: bool = False) -> str:
         resolved_id = self.repository.find_by_partial_id(root_id).id
+        if self.compact_graph:
+            return self.repository.load_graph().visualize_tree(resolved_id, full_mode)
         all_tasks = {task.id: task for task in self.repository.list_all()}
         visualizer = TreeVisualizer(all_tasks)
         return visualizer.visualize_tree(resolved_id, full_mode)
 
     def _detect_cycle(self, start_id: str, target_id: str) -> bool:
+        if self.compact_graph:
+            return self.repository.load_graph().reaches(start_id, target_id)
         all_tasks = {task.id: task for task in self.repository.list_all()}
         visited: set[str] = set()
         stack: list[str] = [start_id]
@@ -170,6 +441,67 @@ class LinkService:
         self.repository.update(task2)
 
 
+class DoctorService:
+    """Validates the whole task graph in one pass and repairs what it finds.
+
+    Checks run in linear time over one snapshot of the store: dependency cycles (Tarjan's strongly connected
+    components), deps, links and parents that name missing tasks, and links that are not mutual. Repairs drop
+    dangling references, add missing back-links and remove the back edges of every cycle; each affected task
+    is written once, under the store lock.
+    """
+
+    def __init__(self, repository: TaskRepository) -> None:
+        self.repository = repository
+
+    def check(self) -> list[GraphIssue]:
+        with self.repository.read_transaction():
+            return self._check({task.id: task for task in self.repository.iter_all()})
+
+    def _check(self, all_tasks: dict[str, Task]) -> list[GraphIssue]:
+        validator = GraphValidator(all_tasks)
+        return [*validator.find_dangling_refs(), *validator.find_asymmetric_links(), *validator.find_cycles()]
+
+    def fix(self) -> DoctorReport:
+        """Repair every issue found and return the issues with the changes made."""
+        with self.repository.lock(), self.repository.read_transaction():
+            all_tasks = {task.id: task for task in self.repository.iter_all()}
+            report = DoctorReport(issues=self._check(all_tasks))
+            # the snapshot's tasks are shared with its readers, so repairs are made on copies
+            changed: dict[str, Task] = {}
+
+            def editable(task_id: str) -> Task:
+                if task_id not in changed:
+                    changed[task_id] = all_tasks[task_id].model_copy(deep=True)
+                return changed[task_id]
+
+            validator = GraphValidator(all_tasks)
+            for issue in report.issues:
+                refs = set(issue.refs)
+                if issue.kind == GraphIssueKind.CYCLE:
+                    for task_id, dep_id in validator.back_edges(issue.refs):
+                        cycle_task = editable(task_id)
+                        cycle_task.deps = [d for d in cycle_task.deps if d != dep_id]
+                        report.repairs.append(f"{task_id}: removed dep {dep_id} to break a cycle")
+                    continue
+                task = editable(issue.task_id)
+                if issue.kind == GraphIssueKind.DANGLING_DEP:
+                    task.deps = [dep_id for dep_id in task.deps if dep_id not in refs]
+                    report.repairs.append(f"{task.id}: removed missing deps {', '.join(issue.refs)}")
+                elif issue.kind == GraphIssueKind.DANGLING_LINK:
+                    task.links = [link_id for link_id in task.links if link_id not in refs]
+                    report.repairs.append(f"{task.id}: removed missing links {', '.join(issue.refs)}")
+                elif issue.kind == GraphIssueKind.DANGLING_PARENT:
+                    task.parent = None
+                    report.repairs.append(f"{task.id}: cleared missing parent {issue.refs[0]}")
+                else:
+                    task.links.extend(issue.refs)
+                    report.repairs.append(f"{task.id}: linked back to {', '.join(issue.refs)}")
+            for task in changed.values():
+                self.repository.update(task)
+            report.updated = sorted(changed)
+            return report
+
+
 class QueryService:
     def __init__(self, repository: TaskRepository) -> None:
         self.repository = repository
@@ -179,3 +511,75 @@ class QueryService:
 
     def query_filtered(self) -> list[Task]:
         return self.query_all()
+
+
+class ArchiveService:
+    """Streams a whole task store to and from a JSONL archive.
+
+    The first line is a header, every following line is one task including its bodies and notes.
+    Full tasks are only held for a bounded number of batches at a time; an import additionally keeps the
+    graph fields (deps, links, parent) of imported tasks for the final validation.
+    """
+
+    ARCHIVE_FORMAT = "agentcohort-tasks"
+    ARCHIVE_VERSION = 1
+
+    def __init__(self, repository: TaskRepository) -> None:
+        self.repository = repository
+
+    def export_tasks(self, stream: TextIO) -> int:
+        stream.write(json.dumps({"format": self.ARCHIVE_FORMAT, "version": self.ARCHIVE_VERSION}) + "\n")
+        count = 0
+        for task in self.repository.iter_all():
+            stream.write(task.model_dump_json() + "\n")
+            count += 1
+        return count
+
+    def import_tasks(self, stream: TextIO, batch_size: int = 500) -> ImportResult:
+        """Create every task in the archive, skipping ids that already exist.
+
+        Each batch is written under one hold of the store lock with one event-log append (writing batches from
+        several threads gains nothing: the file system is the bottleneck). The dependency graph is validated
+        once, after all writes.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        existing_ids = set(self.repository.get_all_ids())
+        imported: dict[str, TaskBase] = {}
+        result = ImportResult()
+
+        for batch in self._read_batches(stream, batch_size):
+            fresh: list[Task] = []
+            for task in batch:
+                if task.id in existing_ids or task.id in imported:
+                    result.skipped.append(task.id)
+                    continue
+                imported[task.id] = TaskBase.model_validate(task.model_dump(include=set(TaskBase.model_fields)))
+                fresh.append(task)
+            result.skipped.extend(self.repository.create_many(fresh))
+
+        for task_id in result.skipped:
+            imported.pop(task_id, None)
+        result.imported = len(imported)
+        result.issues = GraphValidator(imported, known_ids=existing_ids).validate()
+        return result
+
+    def _read_batches(self, stream: TextIO, batch_size: int) -> Iterator[list[Task]]:
+        batch: list[Task] = []
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if line_number == 1 and "format" in data:
+                if data["format"] != self.ARCHIVE_FORMAT or data.get("version") != self.ARCHIVE_VERSION:
+                    raise ValueError(f"unsupported archive format: {data['format']} v{data.get('version')}")
+                continue
+            batch.append(Task.model_validate(data))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+_EPOCH = datetime.fromtimestamp(0, UTC)
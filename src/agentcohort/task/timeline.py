@@ -0,0 +1,144 @@
+import json
+import os
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Literal
+
+from agentcohort.locking import file_lock
+from agentcohort.task.events import EventLogView, ViewRebuildRequired
+from agentcohort.task.models import TaskEvent, TaskEventType, TaskMetadata
+from agentcohort.task.utils import parse_timestamp
+
+type TimeField = Literal["closed_at", "updated_at"]
+_FIELDS: tuple[TimeField, ...] = ("closed_at", "updated_at")
+_BLOCK_SIZE = 8192
+# how far the clocks of different writers may disagree; readers look this much past the point where they could stop
+_CLOCK_SKEW = timedelta(minutes=5)
+
+
+class TimeIndex(EventLogView):
+    """Task ids ordered by close time and by last update time.
+
+    Each order is an append-only file of ``[timestamp, id]`` JSON lines, ``.timeline.<field>.jsonl``. A task that
+    changes again gets a new line and one that loses its time (reopened or deleted) gets a ``[null, id]`` line; the
+    last line of an id wins, so the most recent entries are read backwards from the file's tail. ``.timeline.json``
+    records how many bytes of each file are committed: bytes past that, left by a writer that crashed before
+    recording them, are cut off before the next append. Superseded lines are dropped by a rebuild once a file has
+    grown past twice the lines the last rebuild wrote. Timestamps from different machines can arrive slightly out
+    of order, so readers scan up to _CLOCK_SKEW past the point where they could stop and sort what they found.
+    """
+
+    FILENAME = ".timeline.json"
+    VERSION = 3
+
+    def latest(self, field: TimeField, limit: int | None = None) -> list[str]:
+        """Return up to limit task ids, most recent first."""
+        found: list[tuple[datetime, str]] = []
+        horizon: datetime | None = None
+        with file_lock(self.lock_path):
+            for time, task_id in self._newest_first(field):
+                if horizon is not None and time < horizon:
+                    break
+                found.append((time, task_id))
+                if horizon is None and limit is not None and len(found) >= limit:
+                    horizon = min(found)[0] - _CLOCK_SKEW
+        found.sort(reverse=True)
+        return [task_id for _, task_id in found[:limit]]
+
+    def since(self, field: TimeField, start: datetime, end: datetime | None = None) -> list[tuple[str, datetime]]:
+        """Return (id, time) pairs with start <= time (< end if given), most recent first."""
+        found: list[tuple[datetime, str]] = []
+        with file_lock(self.lock_path):
+            for time, task_id in self._newest_first(field):
+                if time < start - _CLOCK_SKEW:
+                    break
+                if time >= start and (end is None or time < end):
+                    found.append((time, task_id))
+        found.sort(reverse=True)
+        return [(task_id, time) for time, task_id in found]
+
+    def _newest_first(self, field: TimeField) -> Iterator[tuple[datetime, str]]:
+        """Yield the current (time, id) of every task with a time, newest line first; the caller holds the lock."""
+        size: int = self.load()[field]["size"]
+        seen: set[str] = set()
+        for value, task_id in self._read_backwards(self._order_path(field), size):
+            if task_id in seen:
+                continue
+            seen.add(task_id)
+            if value is not None:
+                yield parse_timestamp(value), task_id
+
+    def _order_path(self, field: TimeField) -> Path:
+        return self.path.with_name(f".timeline.{field}.jsonl")
+
+    def _rebuild(self) -> dict[str, Any]:
+        # the order files are replaced before the sizes are written; without this a crash in between would pair
+        # the new files with the old sizes
+        self.path.unlink(missing_ok=True)
+        return super()._rebuild()
+
+    def _build(self, tasks: Iterable[TaskMetadata]) -> dict[str, Any]:
+        times: dict[str, list[tuple[str, str]]] = {field: [] for field in _FIELDS}
+        for metadata in tasks:
+            for field in _FIELDS:
+                value = getattr(metadata, field)
+                if value is not None:
+                    times[field].append((value, metadata.id))
+        data: dict[str, Any] = {}
+        for field in _FIELDS:
+            pairs = sorted(times[field], key=lambda pair: parse_timestamp(pair[0]))
+            content = b"".join(self._encode(value, task_id) for value, task_id in pairs)
+            path = self._order_path(field)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            tmp_path.replace(path)
+            data[field] = {"size": len(content), "lines": len(pairs), "built": len(pairs)}
+        return data
+
+    def _apply(self, data: dict[str, Any], events: list[TaskEvent]) -> None:
+        for field in _FIELDS:
+            lines: list[bytes] = []
+            for event in events:
+                if event.type == TaskEventType.DELETED:
+                    lines.append(self._encode(None, event.task_id))
+                elif field in event.changes:
+                    lines.append(self._encode(event.changes[field], event.task_id))
+            if not lines:
+                continue
+            state: dict[str, int] = data[field]
+            if state["lines"] + len(lines) > 2 * state["built"] + 1024:
+                raise ViewRebuildRequired
+            with self._order_path(field).open("ab") as handle:
+                if handle.tell() < state["size"]:
+                    raise ViewRebuildRequired
+                handle.truncate(state["size"])
+                handle.write(b"".join(lines))
+                state["size"] = handle.tell()
+            state["lines"] += len(lines)
+
+    @staticmethod
+    def _encode(value: str | None, task_id: str) -> bytes:
+        return json.dumps([value, task_id]).encode() + b"\n"
+
+    @staticmethod
+    def _read_backwards(path: Path, size: int) -> Iterator[tuple[str | None, str]]:
+        """Yield the lines in the first size bytes of path, last line first."""
+        if size == 0:
+            return
+        with path.open("rb") as handle:
+            position = size
+            head = b""
+            while position > 0:
+                step = min(_BLOCK_SIZE, position)
+                position -= step
+                handle.seek(position)
+                lines = (handle.read(step) + head).split(b"\n")
+                head = lines.pop(0)  # possibly the end of a line that starts in an earlier block
+                for line in reversed(lines):
+                    if line:
+                        value, task_id = json.loads(line)
+                        yield value, task_id
+            if head:
+                value, task_id = json.loads(head)
+                yield value, task_id
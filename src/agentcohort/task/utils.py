@@ -1,5 +1,14 @@
+from collections.abc import Collection, Iterator, Mapping
+from datetime import UTC, datetime
+
 from agentcohort.task.exceptions import AmbiguousTaskIdError, TaskNotFoundError
-from agentcohort.task.models import Task
+from agentcohort.task.models import GraphIssue, GraphIssueKind, Task, TaskBase
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp from task metadata, reading ones without a timezone as UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
 
 
 class PartialIdMatcher:
@@ -7,7 +16,20 @@ class PartialIdMatcher:
         self.all_ids = all_ids
 
     def resolve(self, partial: str) -> str:
-        matches = [task_id for task_id in self.all_ids if partial in task_id]
+        """Resolve partial to a task id.
+
+        An exact id wins, then ids (or their suffixes) starting with partial, then any id containing it. Suffixes
+        vary in length, so one full id can be a prefix of another.
+        """
+        if partial in self.all_ids:
+            return partial
+        matches = [
+            task_id
+            for task_id in self.all_ids
+            if task_id.startswith(partial) or task_id.partition("-")[2].startswith(partial)
+        ]
+        if not matches:
+            matches = [task_id for task_id in self.all_ids if partial in task_id]
         if len(matches) == 0:
             raise TaskNotFoundError(f"task '{partial}' not found")
         if len(matches) == 1:
@@ -22,21 +44,28 @@ class TreeVisualizer:
     def visualize_tree(self, root_id: str, full_mode: bool = False) -> str:
         max_depths = self._calculate_max_depths(root_id)
         subtree_depths = self._calculate_subtree_depths(root_id, max_depths)
-        output_lines: list[str] = []
-        root = self.all_tasks[root_id]
-        output_lines.append(f"{root.id} [{root.status.value}] {root.title}")
+        output_lines: list[str] = [self._describe(root_id)]
         self._build_tree_lines(root_id, max_depths, subtree_depths, output_lines, full_mode, "", "", set())
         return "\n".join(output_lines)
 
+    def _exists(self, task_id: str) -> bool:
+        return task_id in self.all_tasks
+
+    def _deps(self, task_id: str) -> list[str]:
+        return self.all_tasks[task_id].deps
+
+    def _describe(self, task_id: str) -> str:
+        task = self.all_tasks[task_id]
+        return f"{task.id} [{task.status.value}] {task.title}"
+
     def _calculate_max_depths(self, root_id: str) -> dict[str, int]:
         max_depths = {root_id: 0}
         stack = [(root_id, 0)]
         while stack:
             current_id, depth = stack.pop()
-            if current_id not in self.all_tasks:
+            if not self._exists(current_id):
                 continue
-            task = self.all_tasks[current_id]
-            for dep_id in task.deps:
+            for dep_id in self._deps(current_id):
                 if dep_id not in max_depths or depth + 1 > max_depths[dep_id]:
                     max_depths[dep_id] = depth + 1
                     stack.append((dep_id, depth + 1))
@@ -47,16 +76,14 @@ class TreeVisualizer:
         stack = [(root_id, 0)]
         while stack:
             current_id, phase = stack.pop()
-            if current_id not in self.all_tasks:
+            if not self._exists(current_id):
                 continue
             if phase == 0:
                 stack.append((current_id, 1))
-                task = self.all_tasks[current_id]
-                for dep_id in reversed(task.deps):
+                for dep_id in reversed(self._deps(current_id)):
                     stack.append((dep_id, 0))
             else:
-                task = self.all_tasks[current_id]
-                children_depths = [max_depths[dep_id] for dep_id in task.deps if dep_id in max_depths]
+                children_depths = [max_depths[dep_id] for dep_id in self._deps(current_id) if dep_id in max_depths]
                 subtree_depths[current_id] = max([max_depths[current_id]] + children_depths)
         return subtree_depths
 
@@ -71,22 +98,144 @@ class TreeVisualizer:
         connector: str,
         printed: set[str],
     ) -> None:
-        if task_id not in self.all_tasks:
+        if not self._exists(task_id):
             return
-        task = self.all_tasks[task_id]
-        children = task.deps
+        children = self._deps(task_id)
         if not full_mode and task_id != "" and task_id in printed:
             return
         if not full_mode and task_id != "" and max_depths[task_id] > subtree_depths[task_id]:
             printed.add(task_id)
         for idx, dep_id in enumerate(children):
-            if dep_id not in self.all_tasks:
+            if not self._exists(dep_id):
                 continue
-            dep = self.all_tasks[dep_id]
             is_last = idx == len(children) - 1
             current_prefix = prefix + ("│   " if not is_last else "    ")
             current_connector = connector + ("├── " if not is_last else "└── ")
-            output_lines.append(f"{current_prefix}{current_connector}{dep.id} [{dep.status.value}] {dep.title}")
+            output_lines.append(f"{current_prefix}{current_connector}{self._describe(dep_id)}")
             self._build_tree_lines(
                 dep_id, max_depths, subtree_depths, output_lines, full_mode, current_prefix, "", printed
             )
+
+
+class GraphValidator:
+    """Checks a task graph for dependency cycles and references to tasks that do not exist.
+
+    ``known_ids`` are tasks that exist but are not part of ``all_tasks`` (e.g. already in the store
+    during an import); references to them are valid, but their own edges are not followed.
+    """
+
+    def __init__(self, all_tasks: Mapping[str, TaskBase], known_ids: Collection[str] = ()) -> None:
+        self.all_tasks = all_tasks
+        self.known_ids = set(known_ids)
+
+    def validate(self) -> list[GraphIssue]:
+        return [*self.find_dangling_refs(), *self.find_cycles()]
+
+    def _exists(self, task_id: str) -> bool:
+        return task_id in self.all_tasks or task_id in self.known_ids
+
+    def find_dangling_refs(self) -> list[GraphIssue]:
+        issues: list[GraphIssue] = []
+        for task in self.all_tasks.values():
+            missing_deps = [dep_id for dep_id in task.deps if not self._exists(dep_id)]
+            if missing_deps:
+                issues.append(GraphIssue(kind=GraphIssueKind.DANGLING_DEP, task_id=task.id, refs=missing_deps))
+            missing_links = [link_id for link_id in task.links if not self._exists(link_id)]
+            if missing_links:
+                issues.append(GraphIssue(kind=GraphIssueKind.DANGLING_LINK, task_id=task.id, refs=missing_links))
+            if task.parent and not self._exists(task.parent):
+                issues.append(GraphIssue(kind=GraphIssueKind.DANGLING_PARENT, task_id=task.id, refs=[task.parent]))
+        return issues
+
+    def find_asymmetric_links(self) -> list[GraphIssue]:
+        """Report tasks that are linked from another task but do not link back (links are meant to be mutual)."""
+        missing: dict[str, list[str]] = {}
+        for task in self.all_tasks.values():
+            for link_id in task.links:
+                other = self.all_tasks.get(link_id)
+                if other is not None and task.id not in other.links:
+                    missing.setdefault(link_id, []).append(task.id)
+        return [
+            GraphIssue(kind=GraphIssueKind.ASYMMETRIC_LINK, task_id=task_id, refs=refs)
+            for task_id, refs in sorted(missing.items())
+        ]
+
+    def back_edges(self, component: list[str]) -> list[tuple[str, str]]:
+        """Return dep edges (task, dep) whose removal leaves the given strongly connected component acyclic.
+
+        These are the back edges of a depth-first search that starts at the smallest id and stays inside the
+        component; a graph without back edges has no cycle. The choice is deterministic, but not minimal.
+        """
+        members = set(component)
+        state: dict[str, int] = {}  # 1 while on the search path, 2 when finished
+        edges: list[tuple[str, str]] = []
+        for root_id in sorted(members):
+            if root_id in state:
+                continue
+            state[root_id] = 1
+            work: list[tuple[str, Iterator[str]]] = [(root_id, iter(self.all_tasks[root_id].deps))]
+            while work:
+                current_id, deps = work[-1]
+                for dep_id in deps:
+                    if dep_id not in members:
+                        continue
+                    if state.get(dep_id) == 1:
+                        edges.append((current_id, dep_id))
+                    elif dep_id not in state:
+                        state[dep_id] = 1
+                        work.append((dep_id, iter(self.all_tasks[dep_id].deps)))
+                        break
+                else:
+                    state[current_id] = 2
+                    work.pop()
+        return edges
+
+    def find_cycles(self) -> list[GraphIssue]:
+        """Report every dependency cycle as one strongly connected component (Tarjan's algorithm, linear time)."""
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        issues: list[GraphIssue] = []
+
+        for root_id in self.all_tasks:
+            if root_id in index:
+                continue
+            index[root_id] = lowlink[root_id] = len(index)
+            stack.append(root_id)
+            on_stack.add(root_id)
+            work: list[tuple[str, Iterator[str]]] = [(root_id, iter(self.all_tasks[root_id].deps))]
+            while work:
+                current_id, deps = work[-1]
+                descended = False
+                for dep_id in deps:
+                    if dep_id not in self.all_tasks:
+                        continue
+                    if dep_id not in index:
+                        index[dep_id] = lowlink[dep_id] = len(index)
+                        stack.append(dep_id)
+                        on_stack.add(dep_id)
+                        work.append((dep_id, iter(self.all_tasks[dep_id].deps)))
+                        descended = True
+                        break
+                    if dep_id in on_stack:
+                        lowlink[current_id] = min(lowlink[current_id], index[dep_id])
+                if descended:
+                    continue
+                work.pop()
+                if work:
+                    parent_id = work[-1][0]
+                    lowlink[parent_id] = min(lowlink[parent_id], lowlink[current_id])
+                if lowlink[current_id] != index[current_id]:
+                    continue
+                component: list[str] = []
+                while True:
+                    member_id = stack.pop()
+                    on_stack.discard(member_id)
+                    component.append(member_id)
+                    if member_id == current_id:
+                        break
+                if len(component) > 1 or current_id in self.all_tasks[current_id].deps:
+                    component.sort()
+                    issues.append(GraphIssue(kind=GraphIssueKind.CYCLE, task_id=component[0], refs=component))
+        return issues
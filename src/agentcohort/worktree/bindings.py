@@ -0,0 +1,56 @@
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+from agentcohort.locking import file_lock
+
+
+class TaskBindings:
+    """Map of worktree paths to the task each one was started for.
+
+    The task side of a binding lives in the task's metadata; this is the reverse map, so listing worktrees can
+    show their tasks without reading the task store. It is kept in the git common dir, next to the other
+    machine-local worktree state, and guarded by a file lock.
+    """
+
+    FILENAME = "agentcohort-bindings.json"
+
+    def __init__(self, common_dir: Path) -> None:
+        self.path = common_dir / self.FILENAME
+        self.lock_path = self.path.with_suffix(".lock")
+
+    def all(self) -> dict[Path, str]:
+        with file_lock(self.lock_path, shared=True):
+            return {Path(path): task_id for path, task_id in self._load().items()}
+
+    def task_for(self, worktree_path: Path) -> str | None:
+        return self.all().get(worktree_path)
+
+    def bind(self, worktree_path: Path, task_id: str) -> None:
+        with file_lock(self.lock_path):
+            bindings = self._load()
+            bindings[str(worktree_path)] = task_id
+            self._save(bindings)
+
+    def unbind(self, worktree_paths: Iterable[Path]) -> dict[Path, str]:
+        """Drop the bindings of worktree_paths and return the ones that existed."""
+        with file_lock(self.lock_path):
+            bindings = self._load()
+            removed: dict[Path, str] = {}
+            for path in worktree_paths:
+                task_id = bindings.pop(str(path), None)
+                if task_id is not None:
+                    removed[path] = task_id
+            if removed:
+                self._save(bindings)
+            return removed
+
+    def _load(self) -> dict[str, str]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+    def _save(self, bindings: dict[str, str]) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(bindings, indent=2, sort_keys=True))
+        tmp_path.replace(self.path)
@@ -34,6 +34,12 @@ class BranchNotFoundError(WorktreeError):
     pass
 
 
+class PoolEmptyError(WorktreeError):
+    """Raised when leasing from a worktree pool with no idle worktrees."""
+
+    pass
+
+
 class GitCommandError(WorktreeError):
     """Raised when a git command execution fails."""
 
@@ -1,5 +1,9 @@
+import contextlib
 import subprocess
+from collections.abc import Collection, Iterable
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import NamedTuple
 
 from agentcohort.worktree.exceptions import (
     BranchExistsError,
@@ -7,19 +11,51 @@ from agentcohort.worktree.exceptions import (
     GitCommandError,
     NotInGitRepoError,
 )
-from agentcohort.worktree.models import WorktreeInfo
+from agentcohort.worktree.models import GitStatus, WorktreeInfo
+from agentcohort.worktree.process import AsyncProcessRunner, LineCallback, ProcessResult
 
 
 class GitClient:
-    """Client for executing git operations."""
+    """Client for executing git operations.
 
-    def __init__(self, repo_path: Path | None = None):
+    Repository facts are gathered with as few git processes as possible and cached per instance: a single
+    ``rev-parse`` call answers ``is_git_repo``, ``git_dir``, ``common_dir``, ``repo_root`` and
+    ``current_branch``, and a single ``for-each-ref`` snapshot answers ``branch_exists`` and
+    ``default_branch``. Call ``refresh()`` after changing the repository outside of this client.
+    """
+
+    def __init__(self, repo_path: Path | None = None, runner: AsyncProcessRunner | None = None):
         """Initialize GitClient with a repository path.
 
         Args:
             repo_path: Path to the git repository. Defaults to current working directory.
+            runner: Runner used by run_async; share one to bound concurrency across clients.
         """
         self.repo_path = str(repo_path or Path.cwd())
+        self.runner = runner or AsyncProcessRunner()
+        self._repo_info: _RepoInfo | None = None
+        self._repo_root: Path | None = None
+        self._branches: set[str] | None = None
+        self._default_branch: str | None = None
+
+    def prime_cache(self, repo_root: Path | None = None, default_branch: str | None = None) -> None:
+        """Seed repository facts already known to the caller so they are not queried from git.
+
+        Args:
+            repo_root: Known root path of the repository
+            default_branch: Known default branch name
+        """
+        if repo_root is not None:
+            self._repo_root = repo_root
+        if default_branch is not None:
+            self._default_branch = default_branch
+
+    def refresh(self) -> None:
+        """Drop all cached repository facts (primed values included)."""
+        self._repo_info = None
+        self._repo_root = None
+        self._branches = None
+        self._default_branch = None
 
     def _run(self, *args: str, capture_output: bool = False) -> subprocess.CompletedProcess[str]:
         """Run a git command with -C flag for repo path.
@@ -44,6 +80,133 @@ class GitClient:
         except subprocess.CalledProcessError as e:
             raise GitCommandError(f"Git command failed: {e.stderr if capture_output else str(e)}") from e
 
+    async def run_async(
+        self, *args: str, timeout: float | None = None, on_line: LineCallback | None = None
+    ) -> ProcessResult:
+        """Run a git command on the asyncio runner, streaming stdout lines.
+
+        Args:
+            args: Git command arguments
+            timeout: Seconds after which git is killed
+            on_line: Called with every stdout line as it arrives
+
+        Returns:
+            ProcessResult of the finished command
+
+        Raises:
+            GitCommandError: If the git command fails or times out
+        """
+        result = await self.runner.run(["git", "-C", self.repo_path, *args], timeout=timeout, on_stdout=on_line)
+        if result.timed_out:
+            raise GitCommandError(f"Git command timed out: git {' '.join(args)}")
+        if result.returncode != 0:
+            raise GitCommandError(f"Git command failed: {result.stderr}")
+        return result
+
+    async def status_async(self, untracked: bool = True, ignore: Collection[str] = ()) -> GitStatus:
+        """Summarize the worktree's branch and changes with ``git status --porcelain=v2 --branch``.
+
+        Runs with --no-optional-locks so it never contends with git commands running in the worktree.
+
+        Args:
+            untracked: Count untracked files; scanning for them is the slowest part of status on large trees
+            ignore: Untracked paths not to count (e.g. the store symlink)
+
+        Returns:
+            GitStatus of the worktree
+
+        Raises:
+            GitCommandError: If git status fails
+        """
+        result = await self.run_async(
+            "--no-optional-locks",
+            "status",
+            "--porcelain=v2",
+            "--branch",
+            f"--untracked-files={'normal' if untracked else 'no'}",
+        )
+        return _parse_status_v2(result.stdout, untracked, ignore)
+
+    async def commit_times_async(self, commits: Iterable[str]) -> dict[str, datetime]:
+        """Look up the committer time of several commits with one git call.
+
+        Args:
+            commits: Full commit hashes; the all-zero hash of an unborn branch is skipped
+
+        Returns:
+            Mapping of commit hash to committer time
+
+        Raises:
+            GitCommandError: If a commit cannot be read
+        """
+        unique = sorted({commit for commit in commits if commit.strip("0")})
+        if not unique:
+            return {}
+        result = await self.run_async("show", "--no-patch", "--format=%H %ct", *unique)
+        times: dict[str, datetime] = {}
+        for line in result.stdout.splitlines():
+            commit, _, timestamp = line.partition(" ")
+            if timestamp:
+                times[commit] = datetime.fromtimestamp(int(timestamp), UTC)
+        return times
+
+    def _absolute(self, path: str) -> Path:
+        return (Path(self.repo_path) / path).resolve()
+
+    def _probe(self) -> "_RepoInfo":
+        """Query the git dirs, top level and current branch in one rev-parse call.
+
+        Returns:
+            Cached _RepoInfo; ``git_dir`` is None when not in a git repository
+        """
+        if self._repo_info is not None:
+            return self._repo_info
+        try:
+            result = self._run(
+                "rev-parse",
+                "--git-dir",
+                "--git-common-dir",
+                "--show-toplevel",
+                "--abbrev-ref",
+                "HEAD",
+                capture_output=True,
+            )
+            git_dir, common_dir, toplevel, branch = result.stdout.splitlines()[:4]
+            info = _RepoInfo(self._absolute(git_dir), self._absolute(common_dir), Path(toplevel), branch)
+        except (GitCommandError, ValueError):
+            # HEAD cannot be resolved on an unborn branch; fall back to the parts that always exist
+            try:
+                result = self._run("rev-parse", "--git-dir", "--git-common-dir", "--show-toplevel", capture_output=True)
+                git_dir, common_dir, toplevel = result.stdout.splitlines()[:3]
+                info = _RepoInfo(self._absolute(git_dir), self._absolute(common_dir), Path(toplevel), None)
+            except (GitCommandError, ValueError):
+                info = _RepoInfo(None, None, None, None)
+        self._repo_info = info
+        return info
+
+    def _branch_snapshot(self) -> set[str]:
+        """Load local branch names and the upstream default branch with one for-each-ref call."""
+        if self._branches is not None:
+            return self._branches
+        result = self._run(
+            "for-each-ref",
+            "--format=%(refname)%00%(symref)",
+            "refs/heads",
+            "refs/remotes/origin/HEAD",
+            capture_output=True,
+        )
+        branches: set[str] = set()
+        for line in result.stdout.splitlines():
+            refname, _, symref = line.partition("\0")
+            if refname.startswith("refs/heads/"):
+                branches.add(refname.removeprefix("refs/heads/"))
+            elif refname == "refs/remotes/origin/HEAD" and symref and self._default_branch is None:
+                self._default_branch = symref.split("/")[-1]
+        if self._default_branch is None:
+            self._default_branch = "main"
+        self._branches = branches
+        return branches
+
     @property
     def is_git_repo(self) -> bool:
         """Check if the current directory is a git repository.
@@ -51,11 +214,33 @@ class GitClient:
         Returns:
             True if in a git repository, False otherwise
         """
-        try:
-            self._run("rev-parse", "--git-dir", capture_output=True)
+        if self._repo_root is not None:
             return True
-        except GitCommandError:
-            return False
+        return self._probe().git_dir is not None
+
+    @property
+    def git_dir(self) -> Path:
+        """Get the git directory of this worktree (``.git`` or ``.git/worktrees/<name>``).
+
+        Raises:
+            NotInGitRepoError: If not in a git repository
+        """
+        git_dir = self._probe().git_dir
+        if git_dir is None:
+            raise NotInGitRepoError("Not in a git repository")
+        return git_dir
+
+    @property
+    def common_dir(self) -> Path:
+        """Get the git directory shared by all worktrees of the repository.
+
+        Raises:
+            NotInGitRepoError: If not in a git repository
+        """
+        common_dir = self._probe().common_dir
+        if common_dir is None:
+            raise NotInGitRepoError("Not in a git repository")
+        return common_dir
 
     @property
     def repo_root(self) -> Path:
@@ -67,11 +252,12 @@ class GitClient:
         Raises:
             NotInGitRepoError: If not in a git repository
         """
-        if not self.is_git_repo:
-            raise NotInGitRepoError("Not in a git repository")
-
-        result = self._run("rev-parse", "--show-toplevel", capture_output=True)
-        return Path(result.stdout.strip())
+        if self._repo_root is None:
+            toplevel = self._probe().toplevel
+            if toplevel is None:
+                raise NotInGitRepoError("Not in a git repository")
+            self._repo_root = toplevel
+        return self._repo_root
 
     @property
     def repo_name(self) -> str:
@@ -110,11 +296,12 @@ class GitClient:
             NotInGitRepoError: If not in a git repository
             GitCommandError: If unable to determine current branch
         """
-        if not self.is_git_repo:
+        info = self._probe()
+        if info.git_dir is None:
             raise NotInGitRepoError("Not in a git repository")
-
-        result = self._run("rev-parse", "--abbrev-ref", "HEAD", capture_output=True)
-        return result.stdout.strip()
+        if info.branch is None:
+            raise GitCommandError("Unable to determine current branch")
+        return info.branch
 
     @property
     def default_branch(self) -> str:
@@ -127,14 +314,11 @@ class GitClient:
             NotInGitRepoError: If not in a git repository
             GitCommandError: If unable to determine default branch
         """
-        if not self.is_git_repo:
-            raise NotInGitRepoError("Not in a git repository")
-
-        try:
-            result = self._run("symbolic-ref", "refs/remotes/origin/HEAD", capture_output=True)
-            return result.stdout.strip().split("/")[-1]
-        except GitCommandError:
-            return "main"
+        if self._default_branch is None:
+            if not self.is_git_repo:
+                raise NotInGitRepoError("Not in a git repository")
+            self._branch_snapshot()
+        return self._default_branch or "main"
 
     def branch_exists(self, branch: str) -> bool:
         """Check if a branch exists locally.
@@ -146,8 +330,7 @@ class GitClient:
             True if the branch exists, False otherwise
         """
         try:
-            self._run("show-ref", "--verify", "--quiet", f"refs/heads/{branch}")
-            return True
+            return branch in self._branch_snapshot()
         except GitCommandError:
             return False
 
@@ -157,6 +340,7 @@ class GitClient:
         branch: str,
         new_branch: bool = False,
         base: str | None = None,
+        no_checkout: bool = False,
     ) -> None:
         """Add a new worktree.
 
@@ -165,6 +349,7 @@ class GitClient:
             branch: Branch name for the worktree
             new_branch: Whether to create a new branch
             base: Base branch to create from (only used when new_branch=True)
+            no_checkout: Leave the working tree and index empty (e.g. to set up sparse checkout first)
 
         Raises:
             GitCommandError: If the worktree creation fails
@@ -174,15 +359,101 @@ class GitClient:
         if new_branch:
             if self.branch_exists(branch):
                 raise BranchExistsError(f"Branch '{branch}' already exists")
-            cmd = ["worktree", "add", "-b", branch, str(path)]
+            cmd = ["worktree", "add", *self._checkout_flag(no_checkout), "-b", branch, str(path)]
             if base:
                 cmd.append(base)
         else:
             if not self.branch_exists(branch):
                 raise BranchNotFoundError(f"Branch '{branch}' not found")
-            cmd = ["worktree", "add", str(path), branch]
+            cmd = ["worktree", "add", *self._checkout_flag(no_checkout), str(path), branch]
 
         self._run(*cmd)
+        if new_branch and self._branches is not None:
+            self._branches.add(branch)
+
+    def worktree_add_detached(self, path: Path, commit: str, no_checkout: bool = False) -> None:
+        """Add a new worktree with a detached HEAD at the given commit.
+
+        Args:
+            path: Path where the worktree will be created
+            commit: Commit-ish to check out
+            no_checkout: Leave the working tree and index empty
+
+        Raises:
+            GitCommandError: If the worktree creation fails
+        """
+        self._run("worktree", "add", *self._checkout_flag(no_checkout), "--detach", str(path), commit)
+
+    @staticmethod
+    def _checkout_flag(no_checkout: bool) -> list[str]:
+        return ["--no-checkout"] if no_checkout else []
+
+    def sparse_checkout_set(self, paths: list[str]) -> None:
+        """Restrict the worktree to the given directories with a cone-mode sparse checkout.
+
+        The setting is stored per worktree, so other worktrees keep their full checkout.
+
+        Args:
+            paths: Directories relative to the repository root
+
+        Raises:
+            GitCommandError: If sparse checkout cannot be configured
+        """
+        self._run("sparse-checkout", "set", "--cone", "--", *paths)
+
+    def checkout_head(self) -> None:
+        """Populate the index and working tree from HEAD (after ``worktree add --no-checkout``).
+
+        With sparse checkout set, only matching files are written, and in a partial clone only their
+        blobs are fetched.
+
+        Raises:
+            GitCommandError: If the checkout fails
+        """
+        self._run("checkout", "--quiet")
+
+    def switch(self, branch: str | None = None, base: str | None = None, create: bool = False) -> None:
+        """Switch the worktree to a branch (discarding changes to tracked files) or detach its HEAD.
+
+        Args:
+            branch: Branch to switch to; None detaches HEAD at the current commit
+            base: Start point for a new branch (only used when create=True)
+            create: Create the branch with ``switch -c``
+
+        Raises:
+            GitCommandError: If the switch fails
+            BranchExistsError: If creating a branch that already exists
+        """
+        if branch is None:
+            self._run("switch", "--quiet", "--detach")
+        elif create:
+            if self.branch_exists(branch):
+                raise BranchExistsError(f"Branch '{branch}' already exists")
+            cmd = ["switch", "--quiet", "--discard-changes", "-c", branch]
+            if base:
+                cmd.append(base)
+            self._run(*cmd)
+            if self._branches is not None:
+                self._branches.add(branch)
+        else:
+            self._run("switch", "--quiet", "--discard-changes", branch)
+        self._repo_info = None
+
+    def clean(self, exclude: list[str] | None = None) -> None:
+        """Delete untracked files and directories, keeping ignored ones (build outputs, virtualenvs).
+
+        Args:
+            exclude: Paths relative to the worktree root to keep as well
+        """
+        cmd = ["clean", "-d", "--force", "--quiet"]
+        for path in exclude or []:
+            cmd.extend(["--exclude", f"/{path}"])
+        self._run(*cmd)
+
+    def status_porcelain(self) -> list[str]:
+        """Return ``git status --porcelain`` lines for changed and untracked files."""
+        result = self._run("status", "--porcelain", capture_output=True)
+        return [line for line in result.stdout.splitlines() if line]
 
     def worktree_list(self) -> list[WorktreeInfo]:
         """List all worktrees in the repository.
@@ -193,10 +464,12 @@ class GitClient:
         Raises:
             NotInGitRepoError: If not in a git repository
         """
-        if not self.is_git_repo:
-            raise NotInGitRepoError("Not in a git repository")
-
-        result = self._run("worktree", "list", "--porcelain", capture_output=True)
+        try:
+            result = self._run("worktree", "list", "--porcelain", capture_output=True)
+        except GitCommandError:
+            if not self.is_git_repo:
+                raise NotInGitRepoError("Not in a git repository") from None
+            raise
         worktrees: list[WorktreeInfo] = []
         current_worktree: dict[str, str | None] = {}
 
@@ -240,6 +513,38 @@ class GitClient:
 
         return worktrees
 
+    def merged_branches(self, base: str) -> set[str]:
+        """Return the local branches whose tips are reachable from base.
+
+        Args:
+            base: Branch or commit the branches must be merged into
+
+        Raises:
+            GitCommandError: If base cannot be resolved
+        """
+        result = self._run("branch", "--merged", base, "--format=%(refname:short)", capture_output=True)
+        return {line for line in result.stdout.splitlines() if line}
+
+    def delete_branches(self, branches: list[str]) -> None:
+        """Force-delete several local branches with one git call.
+
+        Raises:
+            GitCommandError: If a branch cannot be deleted
+        """
+        if not branches:
+            return
+        self._run("branch", "--quiet", "-D", *branches)
+        if self._branches is not None:
+            self._branches.difference_update(branches)
+
+    def worktree_prune(self) -> None:
+        """Drop administrative data of worktrees whose directories no longer exist.
+
+        Raises:
+            GitCommandError: If the prune fails
+        """
+        self._run("worktree", "prune")
+
     def worktree_remove(self, path: Path, force: bool = False) -> None:
         """Remove a worktree.
 
@@ -255,3 +560,78 @@ class GitClient:
             cmd.append("--force")
 
         self._run(*cmd)
+
+
+def find_git_dir(start: Path) -> tuple[Path, Path] | None:
+    """Locate the worktree root enclosing start and its git dir without spawning git."""
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            # linked worktrees and submodules: ".git" is a file pointing at the real git dir
+            content = dot_git.read_text().strip()
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = Path(content.removeprefix("gitdir:").strip())
+            return directory, git_dir if git_dir.is_absolute() else directory / git_dir
+    return None
+
+
+def read_head_commit(start: Path) -> str | None:
+    """Return the commit checked out in the worktree enclosing start, read from the git files.
+
+    Returns None outside a repository and on an unborn branch.
+    """
+    found = find_git_dir(start)
+    if found is None:
+        return None
+    git_dir = found[1]
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+    if not head.startswith("ref:"):
+        return head  # detached
+    ref = head.removeprefix("ref:").strip()
+    commondir_file = git_dir / "commondir"
+    common_dir = git_dir / commondir_file.read_text().strip() if commondir_file.is_file() else git_dir
+    for base in (git_dir, common_dir):
+        with contextlib.suppress(OSError):
+            return (base / ref).read_text().strip()
+    with contextlib.suppress(OSError):
+        for line in (common_dir / "packed-refs").read_text().splitlines():
+            commit, _, name = line.partition(" ")
+            if name == ref:
+                return commit
+    return None
+
+
+class _RepoInfo(NamedTuple):
+    git_dir: Path | None
+    common_dir: Path | None
+    toplevel: Path | None
+    branch: str | None
+
+
+def _parse_status_v2(output: str, untracked: bool, ignore: Collection[str]) -> GitStatus:
+    status = GitStatus(branch=None, untracked=0 if untracked else None)
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            head = line.removeprefix("# branch.head ")
+            status.branch = None if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "):
+            status.upstream = line.removeprefix("# branch.upstream ")
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line.removeprefix("# branch.ab ").split()
+            status.ahead, status.behind = int(ahead), -int(behind)
+        elif line.startswith(("1 ", "2 ")):
+            # "1 XY ..." (changed) or "2 XY ..." (renamed/copied): X is the index, Y the working tree
+            status.staged += line[2] != "."
+            status.unstaged += line[3] != "."
+        elif line.startswith("u "):
+            status.conflicts += 1
+        elif line.startswith("? ") and status.untracked is not None:
+            if line[2:].rstrip("/") not in ignore:
+                status.untracked += 1
+    return status
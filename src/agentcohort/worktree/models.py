@@ -1,6 +1,7 @@
+from datetime import datetime
 from pathlib import Path
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 
 class WorktreeInfo(BaseModel):
@@ -12,10 +13,128 @@ class WorktreeInfo(BaseModel):
     is_main: bool = False
 
 
+class SeedResult(BaseModel):
+    """Result of seeding one directory into a new worktree."""
+
+    path: Path
+    method: str  # reflink, hardlink, copy, a "+"-joined mix of them, or "failed"
+    files: int = 0
+    bytes: int = 0
+    error: str | None = None
+
+
+class GitStatus(BaseModel):
+    """Summary of ``git status --porcelain=v2 --branch`` for one worktree."""
+
+    branch: str | None  # None on a detached HEAD
+    upstream: str | None = None
+    ahead: int | None = None  # None without an upstream
+    behind: int | None = None
+    staged: int = 0
+    unstaged: int = 0
+    conflicts: int = 0
+    untracked: int | None = None  # None when untracked files were not scanned
+
+    @computed_field
+    @property
+    def dirty(self) -> bool:
+        return bool(self.staged or self.unstaged or self.conflicts or self.untracked)
+
+
+class WorktreeStatus(BaseModel):
+    """Status of one worktree in a status overview."""
+
+    path: Path
+    head: str
+    is_main: bool = False
+    status: GitStatus | None = None
+    last_commit: datetime | None = None
+    error: str | None = None
+
+
 class WorktreeCreateResult(BaseModel):
     """Result of a worktree creation operation."""
 
     worktree_path: Path
-    branch: str
+    branch: str | None  # None for a detached worktree
     created_new_branch: bool
+    seeded: list[SeedResult] = []
+    sparse_paths: list[str] = []  # empty for a full checkout
+    materialized_files: int | None = None  # files written by a sparse checkout
+    materialized_bytes: int | None = None
     post_setup_output: str | None = None
+
+
+class WorktreeSpec(BaseModel):
+    """Description of one worktree to create in a batch."""
+
+    name: str
+    branch: str | None = None
+    path: Path | None = None
+    detach: bool = False
+    sparse: list[str] | None = None
+
+
+class WorktreeBatchItem(BaseModel):
+    """Outcome of one worktree in a batch creation."""
+
+    name: str
+    result: WorktreeCreateResult | None = None
+    error: str | None = None
+    post_setup_exit_code: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.post_setup_exit_code in (None, 0)
+
+
+class WorktreeBatchResult(BaseModel):
+    """Aggregate result of a batch worktree creation."""
+
+    items: list[WorktreeBatchItem]
+
+    @property
+    def succeeded(self) -> list[WorktreeBatchItem]:
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> list[WorktreeBatchItem]:
+        return [item for item in self.items if not item.ok]
+
+
+class PoolSlot(BaseModel):
+    """A pre-created worktree in the worktree pool."""
+
+    name: str
+    path: Path
+    lease: str | None = None  # branch the worktree is leased as; None while idle
+    leased_at: datetime | None = None
+    keep: list[str] = []  # untracked paths left by setup (store symlink, unignored build output) kept on lease
+
+    @property
+    def idle(self) -> bool:
+        return self.lease is None
+
+
+class PoolState(BaseModel):
+    """Persisted state of the worktree pool."""
+
+    slots: list[PoolSlot] = []
+
+
+class PruneCandidate(BaseModel):
+    """A worktree selected for pruning."""
+
+    path: Path
+    branch: str | None
+    reasons: list[str]
+    bytes: int | None = None  # disk usage, measured for dry runs
+
+
+class PruneResult(BaseModel):
+    """Outcome of a bulk worktree prune."""
+
+    removed: list[PruneCandidate] = []
+    deleted_branches: list[str] = []
+    skipped: dict[str, str] = {}  # worktree path -> reason it was not pruned
+    dry_run: bool = False
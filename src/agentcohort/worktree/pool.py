@@ -0,0 +1,232 @@
+import contextlib
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from agentcohort.locking import file_lock
+from agentcohort.worktree.exceptions import PoolEmptyError, WorktreeError, WorktreeNotFoundError
+from agentcohort.worktree.git import GitClient
+from agentcohort.worktree.models import PoolSlot, PoolState, WorktreeBatchResult, WorktreeSpec
+from agentcohort.worktree.services import WorktreeService
+
+
+class WorktreePool:
+    """Pool of pre-created worktrees that are leased out as branches and recycled on release.
+
+    Pool worktrees sit on a detached HEAD with post-setup already done. Leasing one cleans it and switches it
+    to a new branch, which only rewrites the files that differ from its current checkout. Ignored directories
+    such as virtualenvs survive the clean, and so do untracked files that existed right after setup. Releasing
+    detaches it again and keeps the branch. The pool state is kept in the git common dir, which all worktrees
+    of a repository share, and is guarded by a file lock.
+    """
+
+    STATE_FILENAME = "agentcohort-pool.json"
+    SLOT_PREFIX = "pool-"
+
+    def __init__(self, service: WorktreeService):
+        """Initialize WorktreePool on top of a WorktreeService.
+
+        Args:
+            service: WorktreeService used to create the pool worktrees
+        """
+        self.service = service
+        self.git = service.git
+        self.state_path = self.git.common_dir / self.STATE_FILENAME
+        self.lock_path = self.state_path.with_suffix(".lock")
+
+    def slots(self) -> list[PoolSlot]:
+        """List the pool worktrees, idle and leased."""
+        with file_lock(self.lock_path, shared=True):
+            return self._load().slots
+
+    def fill(
+        self,
+        size: int,
+        base: str | None = None,
+        post_setup: str | None = None,
+        seed: list[str] | None = None,
+        jobs: int = 4,
+        on_progress: Callable[[str, str], None] | None = None,
+    ) -> WorktreeBatchResult:
+        """Create worktrees until the pool has ``size`` idle ones.
+
+        Worktrees whose post-setup fails are removed again instead of joining the pool.
+
+        Args:
+            size: Number of idle worktrees wanted
+            base: Commit-ish to check out (defaults to upstream default branch)
+            post_setup: Command to run in every new worktree
+            seed: Directories to clone from the main worktree (defaults to config seed_dirs)
+            jobs: Maximum number of post-setup commands running at once
+            on_progress: Called with (worktree name, message) for every progress event and output line
+
+        Returns:
+            WorktreeBatchResult for the worktrees created by this call
+        """
+        with file_lock(self.lock_path, shared=True):
+            state = self._load()
+        taken = {slot.name for slot in state.slots}
+        missing = size - sum(slot.idle for slot in state.slots)
+
+        names: list[str] = []
+        index = 1
+        while len(names) < missing:
+            name = f"{self.SLOT_PREFIX}{index}"
+            if name not in taken and not self._default_path(name).exists():
+                names.append(name)
+            index += 1
+
+        result = self.service.create_worktrees(
+            [WorktreeSpec(name=name, detach=True) for name in names],
+            base=base,
+            post_setup=post_setup,
+            seed=seed,
+            jobs=jobs,
+            on_progress=on_progress,
+        )
+
+        ready: list[PoolSlot] = []
+        for item in result.items:
+            if item.result is None:
+                continue
+            if item.ok:
+                path = item.result.worktree_path
+                ready.append(PoolSlot(name=item.name, path=path, keep=self._untracked(path)))
+            else:
+                # a worktree with failed post-setup would hand out a broken environment
+                with contextlib.suppress(WorktreeError):
+                    self.git.worktree_remove(item.result.worktree_path, force=True)
+
+        with file_lock(self.lock_path):
+            state = self._load()
+            state.slots.extend(ready)
+            self._save(state)
+        return result
+
+    def lease(self, branch: str, base: str | None = None) -> PoolSlot:
+        """Lease an idle worktree as a new branch.
+
+        Args:
+            branch: Name of the branch to create in the worktree
+            base: Start point of the branch (defaults to upstream default branch)
+
+        Returns:
+            The leased PoolSlot
+
+        Raises:
+            PoolEmptyError: If the pool has no idle worktree
+            BranchExistsError: If the branch already exists
+            GitCommandError: If git operations fail
+        """
+        base = base or self.git.default_branch
+        with file_lock(self.lock_path):
+            state = self._load()
+            slot = next((slot for slot in state.slots if slot.idle), None)
+            if slot is None:
+                raise PoolEmptyError("No idle worktree in the pool; run 'agentcohort worktree pool fill'")
+            slot.lease = branch
+            slot.leased_at = datetime.now(UTC)
+            self._save(state)
+
+        client = GitClient(slot.path, runner=self.git.runner)
+        try:
+            client.clean(exclude=slot.keep)
+            client.switch(branch, base=base, create=True)
+        except WorktreeError:
+            self._set_lease(slot.name, None)
+            raise
+        return slot
+
+    def release(self, key: str, force: bool = False) -> PoolSlot:
+        """Return a leased worktree to the pool, keeping its branch.
+
+        Args:
+            key: Leased branch, slot name or worktree path
+            force: Release even if the worktree has uncommitted changes (they are discarded on the next lease)
+
+        Returns:
+            The released PoolSlot
+
+        Raises:
+            WorktreeNotFoundError: If no leased pool worktree matches key
+            WorktreeError: If the worktree has uncommitted changes and force is not set
+        """
+        with file_lock(self.lock_path, shared=True):
+            slot = self._find(self._load(), key)
+        if slot is None or slot.idle:
+            raise WorktreeNotFoundError(f"No leased pool worktree '{key}'")
+
+        changes = [path for path in self._changed(slot.path) if path not in slot.keep]
+        if changes and not force:
+            raise WorktreeError(f"Worktree {slot.path} has uncommitted changes; commit them or use --force")
+        GitClient(slot.path, runner=self.git.runner).switch(None)
+        self.service.unbind([slot.path])
+        self._set_lease(slot.name, None)
+        slot.lease = None
+        slot.leased_at = None
+        return slot
+
+    def drain(self, include_leased: bool = False) -> list[Path]:
+        """Remove idle pool worktrees.
+
+        Args:
+            include_leased: Also remove leased worktrees (their branches are kept)
+
+        Returns:
+            Paths of the removed worktrees
+        """
+        removed: list[Path] = []
+        with file_lock(self.lock_path):
+            state = self._load()
+            kept: list[PoolSlot] = []
+            for slot in state.slots:
+                if not (slot.idle or include_leased):
+                    kept.append(slot)
+                    continue
+                try:
+                    self.git.worktree_remove(slot.path, force=True)
+                    removed.append(slot.path)
+                except WorktreeError:
+                    kept.append(slot)
+            state.slots = kept
+            self._save(state)
+        return removed
+
+    def _default_path(self, name: str) -> Path:
+        return self.git.repo_root.parent / f"{self.git.repo_name}-{name}"
+
+    def _untracked(self, path: Path) -> list[str]:
+        lines = GitClient(path, runner=self.git.runner).status_porcelain()
+        return [line[3:] for line in lines if line.startswith("?? ")]
+
+    def _changed(self, path: Path) -> list[str]:
+        return [line[3:] for line in GitClient(path, runner=self.git.runner).status_porcelain()]
+
+    def _find(self, state: PoolState, key: str) -> PoolSlot | None:
+        path = Path(key).absolute()
+        for slot in state.slots:
+            if key in (slot.lease, slot.name) or slot.path == path:
+                return slot
+        return None
+
+    def _set_lease(self, name: str, lease: str | None) -> None:
+        with file_lock(self.lock_path):
+            state = self._load()
+            for slot in state.slots:
+                if slot.name == name:
+                    slot.lease = lease
+                    slot.leased_at = datetime.now(UTC) if lease else None
+            self._save(state)
+
+    def _load(self) -> PoolState:
+        if not self.state_path.exists():
+            return PoolState()
+        state = PoolState.model_validate_json(self.state_path.read_text())
+        # worktrees removed behind the pool's back (e.g. with `worktree remove`) drop out of it
+        state.slots = [slot for slot in state.slots if slot.path.exists()]
+        return state
+
+    def _save(self, state: PoolState) -> None:
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(state.model_dump_json(indent=2))
+        tmp_path.replace(self.state_path)
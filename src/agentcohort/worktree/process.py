@@ -0,0 +1,150 @@
+import asyncio
+import codecs
+import contextlib
+import os
+import signal
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+LineCallback = Callable[[str], None]
+
+
+class ProcessResult(NamedTuple):
+    """Outcome of a subprocess run through AsyncProcessRunner."""
+
+    returncode: int | None  # None when the process was killed on timeout
+    stdout: str
+    stderr: str
+
+    @property
+    def timed_out(self) -> bool:
+        return self.returncode is None
+
+
+class AsyncProcessRunner:
+    """Run subprocesses on asyncio, streaming their output line by line.
+
+    At most ``max_concurrency`` processes started through one runner run at a time. Every process gets its
+    own process group, and the whole group is killed when the timeout expires or the awaiting task is
+    cancelled, so shell commands do not leave orphaned children behind.
+    """
+
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, max_concurrency: int = 8) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(
+        self,
+        argv: Sequence[str],
+        cwd: Path | str | None = None,
+        timeout: float | None = None,
+        on_stdout: LineCallback | None = None,
+        on_stderr: LineCallback | None = None,
+        merge_stderr: bool = False,
+    ) -> ProcessResult:
+        """Run an executable with arguments (no shell).
+
+        Args:
+            argv: Program and arguments
+            cwd: Working directory
+            timeout: Seconds after which the process is killed
+            on_stdout: Called with every stdout line (without the newline) as it arrives
+            on_stderr: Called with every stderr line; unused when merge_stderr is set
+            merge_stderr: Send stderr into the stdout stream
+
+        Returns:
+            ProcessResult with the exit code (None on timeout) and the collected output
+        """
+        async with self._get_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+            return await self._communicate(process, timeout, on_stdout, on_stderr)
+
+    async def run_shell(
+        self,
+        command: str,
+        cwd: Path | str | None = None,
+        timeout: float | None = None,
+        on_stdout: LineCallback | None = None,
+        on_stderr: LineCallback | None = None,
+        merge_stderr: bool = False,
+    ) -> ProcessResult:
+        """Run a command line through the shell; see run() for the arguments."""
+        async with self._get_semaphore():
+            process = await asyncio.create_subprocess_shell(
+                command,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT if merge_stderr else asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+            return await self._communicate(process, timeout, on_stdout, on_stderr)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # a semaphore is bound to one event loop, and callers may use asyncio.run() more than once
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _communicate(
+        self,
+        process: asyncio.subprocess.Process,
+        timeout: float | None,
+        on_stdout: LineCallback | None,
+        on_stderr: LineCallback | None,
+    ) -> ProcessResult:
+        stdout_lines: list[str] = []
+        stderr_lines: list[str] = []
+        pumps = [self._pump(process.stdout, stdout_lines, on_stdout)]
+        if process.stderr is not None:
+            pumps.append(self._pump(process.stderr, stderr_lines, on_stderr))
+        returncode: int | None
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.gather(*pumps)
+                returncode = await process.wait()
+        except TimeoutError:
+            await self._kill(process)
+            returncode = None
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+        return ProcessResult(returncode, "".join(stdout_lines), "".join(stderr_lines))
+
+    async def _pump(self, stream: asyncio.StreamReader | None, lines: list[str], on_line: LineCallback | None) -> None:
+        """Read a stream to EOF in chunks, splitting it into lines (no line-length limit)."""
+        if stream is None:
+            return
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        while chunk := await stream.read(self.READ_CHUNK_SIZE):
+            pending += decoder.decode(chunk)
+            *complete, pending = pending.split("\n")
+            for line in complete:
+                lines.append(line + "\n")
+                if on_line is not None:
+                    on_line(line)
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            lines.append(pending)
+            if on_line is not None:
+                on_line(pending)
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(process.pid, signal.SIGKILL)
+        await process.wait()
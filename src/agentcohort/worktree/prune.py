@@ -0,0 +1,175 @@
+import os
+import secrets
+import shutil
+import subprocess
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from agentcohort.worktree.exceptions import GitCommandError
+from agentcohort.worktree.models import PruneCandidate, PruneResult, WorktreeStatus
+from agentcohort.worktree.pool import WorktreePool
+from agentcohort.worktree.services import WorktreeService
+
+
+class WorktreePruner:
+    """Select finished worktrees by criteria and remove them in one batch.
+
+    Selected worktree directories are renamed into sibling trash directories, which is instant, and git's
+    bookkeeping is then updated once: a single ``git worktree prune`` and a single ``git branch -D`` for all
+    of them. The trash is deleted by a detached background process, so the command returns before the disk
+    space is actually reclaimed.
+    """
+
+    TRASH_PREFIX = ".agentcohort-trash-"
+
+    def __init__(self, service: WorktreeService):
+        """Initialize WorktreePruner on top of a WorktreeService.
+
+        Args:
+            service: WorktreeService used to inspect the worktrees
+        """
+        self.service = service
+        self.git = service.git
+
+    def prune(
+        self,
+        merged_into: str | None = None,
+        closed_tasks: Collection[str] | None = None,
+        idle_hours: float | None = None,
+        include_dirty: bool = False,
+        delete_branches: bool = True,
+        dry_run: bool = False,
+        wait: bool = False,
+    ) -> PruneResult:
+        """Remove the worktrees that match every given criterion.
+
+        The main worktree and pooled worktrees are never pruned, and neither are worktrees with uncommitted
+        changes unless include_dirty is set.
+
+        Args:
+            merged_into: Select worktrees whose branch is merged into this branch
+            closed_tasks: Select worktrees whose name (without the repo prefix) or branch is one of these task ids
+            idle_hours: Select worktrees whose last commit is older than this many hours
+            include_dirty: Also prune worktrees with uncommitted changes (they are lost)
+            delete_branches: Delete the branches of pruned worktrees
+            dry_run: Only report what would be pruned and how many bytes it would free
+            wait: Delete the directories before returning instead of in the background
+
+        Returns:
+            PruneResult listing the pruned (or, for a dry run, prunable) worktrees
+
+        Raises:
+            ValueError: If no criterion is given
+        """
+        if merged_into is None and closed_tasks is None and idle_hours is None:
+            raise ValueError("give at least one prune criterion")
+
+        result = PruneResult(dry_run=dry_run)
+        merged: set[str] = self.git.merged_branches(merged_into) if merged_into is not None else set()
+        pooled = {slot.path for slot in WorktreePool(self.service).slots()}
+        cutoff = datetime.now(UTC) - timedelta(hours=idle_hours) if idle_hours is not None else None
+
+        for entry in self.service.worktree_statuses(untracked=True):
+            if entry.is_main or entry.path in pooled:
+                continue
+            branch = entry.status.branch if entry.status else None
+            reasons = self._match(entry, branch, merged_into, merged, closed_tasks, cutoff)
+            if reasons is None:
+                continue
+            if entry.status is None:
+                result.skipped[str(entry.path)] = entry.error or "status unavailable"
+            elif entry.status.dirty and not include_dirty:
+                result.skipped[str(entry.path)] = "has uncommitted changes"
+            else:
+                result.removed.append(PruneCandidate(path=entry.path, branch=branch, reasons=reasons))
+
+        if dry_run:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for candidate, size in zip(
+                    result.removed, executor.map(_disk_usage, [c.path for c in result.removed]), strict=True
+                ):
+                    candidate.bytes = size
+            return result
+        if not result.removed:
+            return result
+
+        moved: list[PruneCandidate] = []
+        trash: list[Path] = []
+        for candidate in result.removed:
+            try:
+                trash.append(self._move_to_trash(candidate.path))
+                moved.append(candidate)
+            except OSError as e:
+                result.skipped[str(candidate.path)] = f"cannot move to trash: {e.strerror or e}"
+        result.removed = moved
+
+        self.git.worktree_prune()
+        self.service.unbind(candidate.path for candidate in moved)
+        if delete_branches:
+            branches = [candidate.branch for candidate in moved if candidate.branch]
+            try:
+                self.git.delete_branches(branches)
+            except GitCommandError:
+                # git deletes what it can; report only the branches that are really gone
+                self.git.refresh()
+                branches = [branch for branch in branches if not self.git.branch_exists(branch)]
+            result.deleted_branches = branches
+        self._delete(trash, wait)
+        return result
+
+    def _match(
+        self,
+        entry: WorktreeStatus,
+        branch: str | None,
+        merged_into: str | None,
+        merged: set[str],
+        closed_tasks: Collection[str] | None,
+        cutoff: datetime | None,
+    ) -> list[str] | None:
+        """Return why the worktree matches all criteria, or None if it misses one."""
+        reasons: list[str] = []
+        if merged_into is not None:
+            if branch is None or branch not in merged:
+                return None
+            reasons.append(f"merged into {merged_into}")
+        if closed_tasks is not None:
+            name = entry.path.name.removeprefix(f"{self.git.repo_name}-")
+            task_id = next((key for key in (name, branch) if key and key in closed_tasks), None)
+            if task_id is None:
+                return None
+            reasons.append(f"task {task_id} is closed")
+        if cutoff is not None:
+            if entry.last_commit is None or entry.last_commit > cutoff:
+                return None
+            reasons.append(f"idle since {entry.last_commit:%Y-%m-%d %H:%M}")
+        return reasons
+
+    def _move_to_trash(self, path: Path) -> Path:
+        trash = path.with_name(f"{self.TRASH_PREFIX}{path.name}-{secrets.token_hex(4)}")
+        path.rename(trash)
+        return trash
+
+    @staticmethod
+    def _delete(paths: list[Path], wait: bool) -> None:
+        if wait:
+            for path in paths:
+                shutil.rmtree(path, ignore_errors=True)
+            return
+        subprocess.Popen(
+            ["rm", "-rf", "--", *map(str, paths)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+def _disk_usage(root: Path) -> int:
+    """Sum the sizes of all files under root without following symlinks."""
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            total += Path(dirpath, name).lstat().st_size
+    return total
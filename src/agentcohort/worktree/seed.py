@@ -0,0 +1,152 @@
+import errno
+import fcntl
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal
+
+from agentcohort.logger import get_logger
+from agentcohort.worktree.models import SeedResult
+
+logger = get_logger(__name__)
+
+SeedMode = Literal["auto", "reflink", "hardlink", "copy"]
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+# errors meaning "this filesystem (pair) cannot share extents", as opposed to real I/O failures
+_REFLINK_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+
+class SeedError(OSError):
+    """Raised when a tree cannot be seeded with the requested mode."""
+
+
+class TreeSeeder:
+    """Clone directory trees (virtualenvs, node_modules, build caches) from one worktree into another.
+
+    Modes:
+        auto: reflink each file (copy-on-write, near free on btrfs/XFS), falling back to a regular copy
+        reflink: reflink only; fail if the filesystem does not support it
+        hardlink: hardlink files (shares inodes, so in-place edits show up in both trees), copy across devices
+        copy: always copy file contents
+
+    Files are cloned concurrently; symlinks are recreated as symlinks and other special files are skipped.
+    """
+
+    def __init__(self, mode: SeedMode = "auto", workers: int = 8) -> None:
+        self.mode = mode
+        self.workers = workers
+        self._reflink_supported: bool | None = None
+
+    def seed(self, source: Path, destination: Path) -> SeedResult:
+        """Clone the tree at source to destination, which must not exist yet.
+
+        Args:
+            source: Directory to clone
+            destination: Path of the clone
+
+        Returns:
+            SeedResult with the number of files and bytes cloned and the method used
+
+        Raises:
+            SeedError: If the tree could not be cloned; the partial clone is removed
+        """
+        methods: Counter[str] = Counter()
+        files = 0
+        size = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(self._clone_file, src, dst) for src, dst in self._copy_tree(source, destination)
+                ]
+                for future in futures:
+                    method, file_size = future.result()
+                    methods[method] += 1
+                    files += 1
+                    size += file_size
+            _relocate_venv(source, destination)
+        except OSError as e:
+            shutil.rmtree(destination, ignore_errors=True)
+            raise SeedError(f"cannot clone {source}: {e.strerror or e}") from e
+
+        return SeedResult(
+            path=destination,
+            method="+".join(sorted(methods)) if methods else "empty",
+            files=files,
+            bytes=size,
+        )
+
+    def _copy_tree(self, source: Path, destination: Path) -> list[tuple[Path, Path]]:
+        """Recreate the directory structure and symlinks, returning the regular files still to clone."""
+        pending: list[tuple[Path, Path]] = []
+        for dirpath, dirnames, filenames in os.walk(source):
+            src_dir = Path(dirpath)
+            dst_dir = destination / src_dir.relative_to(source)
+            dst_dir.mkdir(mode=src_dir.stat().st_mode & 0o7777, parents=True, exist_ok=True)
+            for name in [*dirnames, *filenames]:
+                src = src_dir / name
+                if src.is_symlink():
+                    (dst_dir / name).symlink_to(src.readlink())
+                elif name in filenames and src.is_file():
+                    pending.append((src, dst_dir / name))
+            # os.walk lists symlinks to directories in dirnames but does not descend into them
+            dirnames[:] = [name for name in dirnames if not (src_dir / name).is_symlink()]
+        return pending
+
+    def _clone_file(self, src: Path, dst: Path) -> tuple[str, int]:
+        size = src.stat().st_size
+        if self.mode == "hardlink":
+            try:
+                os.link(src, dst)
+                return "hardlink", size
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+        elif self.mode in ("auto", "reflink") and self._reflink_supported is not False:
+            try:
+                _reflink(src, dst)
+                self._reflink_supported = True
+                return "reflink", size
+            except OSError as e:
+                if e.errno not in _REFLINK_UNSUPPORTED:
+                    raise
+                dst.unlink(missing_ok=True)
+                if self.mode == "reflink":
+                    raise SeedError("filesystem does not support reflinks") from e
+                if self._reflink_supported is None:
+                    logger.info(f"reflinks unsupported for {dst.parent}, copying instead: {e}")
+                self._reflink_supported = False
+        shutil.copy2(src, dst, follow_symlinks=False)
+        return "copy", size
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    with src.open("rb") as src_file, dst.open("wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, dst, follow_symlinks=False)
+
+
+def _relocate_venv(source: Path, destination: Path) -> None:
+    """Point a cloned virtualenv's scripts at their new location.
+
+    Console-script shebangs and activate scripts embed the venv's absolute path; left alone they would run
+    the source worktree's interpreter. Rewritten files get their own extents, the rest stay shared.
+    """
+    if not (destination / "pyvenv.cfg").is_file():
+        return
+    old, new = str(source.absolute()).encode(), str(destination.absolute()).encode()
+    for bin_dir in (destination / "bin", destination / "Scripts"):
+        if not bin_dir.is_dir():
+            continue
+        for script in bin_dir.iterdir():
+            if script.is_symlink() or not script.is_file() or script.stat().st_size > 1024 * 1024:
+                continue
+            content = script.read_bytes()
+            if old in content and (content.startswith(b"#!") or script.name.startswith("activate")):
+                mode = script.stat().st_mode
+                script.unlink()  # break the reflink/hardlink instead of writing through it
+                script.write_bytes(content.replace(old, new))
+                script.chmod(mode & 0o7777)
@@ -1,25 +1,63 @@
-import contextlib
-import subprocess
+import asyncio
+import os
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 
 from agentcohort.config import Config
-from agentcohort.worktree.exceptions import WorktreeNotFoundError
+from agentcohort.logger import get_logger
+from agentcohort.worktree.bindings import TaskBindings
+from agentcohort.worktree.exceptions import WorktreeError, WorktreeNotFoundError
 from agentcohort.worktree.git import GitClient
-from agentcohort.worktree.models import WorktreeCreateResult, WorktreeInfo
+from agentcohort.worktree.models import (
+    SeedResult,
+    WorktreeBatchItem,
+    WorktreeBatchResult,
+    WorktreeCreateResult,
+    WorktreeInfo,
+    WorktreeSpec,
+    WorktreeStatus,
+)
+from agentcohort.worktree.process import AsyncProcessRunner
+from agentcohort.worktree.seed import SeedError, TreeSeeder
+
+logger = get_logger(__name__)
 
 
 class WorktreeService:
     """Service for managing git worktrees."""
 
-    def __init__(self, git_client: GitClient, config: Config):
+    POST_SETUP_TIMEOUT = 300  # seconds
+
+    def __init__(
+        self,
+        git_client: GitClient,
+        config: Config,
+        on_unbind: Callable[[dict[Path, str]], object] | None = None,
+    ):
         """Initialize WorktreeService with a GitClient and Config.
 
         Args:
             git_client: GitClient instance for executing git operations
             config: Config instance for accessing configuration
+            on_unbind: Called with the removed bindings (worktree path to task id) whenever bound worktrees
+                are removed or released, so the tasks can forget them
         """
         self.git = git_client
         self.config = config
+        self.on_unbind = on_unbind
+
+    @cached_property
+    def bindings(self) -> TaskBindings:
+        """Worktree-to-task bindings of this repository."""
+        return TaskBindings(self.git.common_dir)
+
+    def unbind(self, worktree_paths: Iterable[Path]) -> None:
+        """Drop the task bindings of worktrees that are gone or back in the pool."""
+        removed = self.bindings.unbind(worktree_paths)
+        if removed and self.on_unbind is not None:
+            self.on_unbind(removed)
 
     def create_worktree(
         self,
@@ -29,6 +67,9 @@ class WorktreeService:
         existing: bool = False,
         path: Path | None = None,
         post_setup: str | None = None,
+        seed: list[str] | None = None,
+        detach: bool = False,
+        sparse: list[str] | None = None,
     ) -> WorktreeCreateResult:
         """Create a new worktree.
 
@@ -39,6 +80,9 @@ class WorktreeService:
             existing: Use existing branch instead of creating new one
             path: Custom worktree path (defaults to ../<repo-name>-<name>)
             post_setup: Command to run after creation
+            seed: Directories to clone from the main worktree before post-setup (defaults to config seed_dirs)
+            detach: Check out base on a detached HEAD instead of a branch
+            sparse: Directories to check out (cone-mode sparse checkout); None checks out everything
 
         Returns:
             WorktreeCreateResult with creation details
@@ -49,8 +93,13 @@ class WorktreeService:
             BranchNotFoundError: If using existing branch that doesn't exist
             GitCommandError: If git operations fail
         """
+        seed_paths = self._relative_paths(self.config.seed_dirs if seed is None else seed, "Seed directory")
+        sparse_paths = self._relative_paths(sparse or [], "Sparse checkout path")
+
         # Determine branch name
-        if branch is None:
+        if detach:
+            branch = None
+        elif branch is None:
             branch = name
 
         # Determine worktree path
@@ -66,15 +115,36 @@ class WorktreeService:
             base = self.git.default_branch
 
         # Create the worktree
-        self.git.worktree_add(
-            path=path,
-            branch=branch,
-            new_branch=not existing,
-            base=base if not existing else None,
-        )
+        if detach:
+            self.git.worktree_add_detached(
+                path=path, commit=base or self.git.default_branch, no_checkout=bool(sparse_paths)
+            )
+        else:
+            self.git.worktree_add(
+                path=path,
+                branch=branch or name,
+                new_branch=not existing,
+                base=base if not existing else None,
+                no_checkout=bool(sparse_paths),
+            )
+
+        # Check out only the requested directories
+        materialized: tuple[int, int] | None = None
+        if sparse_paths:
+            worktree_git = GitClient(path, runner=self.git.runner)
+            worktree_git.sparse_checkout_set([sparse_path.as_posix() for sparse_path in sparse_paths])
+            worktree_git.checkout_head()
+            materialized = _measure_tree(path)
+
+        worktrees = self.git.worktree_list()
+        main_repo_path = worktrees[0].path if worktrees else None
 
         # Symlink agentcohort_store from main repo if it exists
-        self._symlink_agentcohort_store(path)
+        if main_repo_path is not None:
+            self._symlink_agentcohort_store(path, main_repo_path)
+
+        # Clone heavy directories from the main repo so post-setup only has to catch up
+        seeded = self.seed_worktree(path, main_repo_path, seed_paths) if main_repo_path and seed_paths else []
 
         # Run post-setup command if provided
         post_setup_output = None
@@ -84,29 +154,70 @@ class WorktreeService:
         return WorktreeCreateResult(
             worktree_path=path,
             branch=branch,
-            created_new_branch=not existing,
+            created_new_branch=not existing and not detach,
+            seeded=seeded,
+            sparse_paths=[sparse_path.as_posix() for sparse_path in sparse_paths],
+            materialized_files=materialized[0] if materialized else None,
+            materialized_bytes=materialized[1] if materialized else None,
             post_setup_output=post_setup_output,
         )
 
-    def _symlink_agentcohort_store(self, worktree_path: Path) -> None:
+    def _symlink_agentcohort_store(self, worktree_path: Path, main_repo_path: Path) -> None:
         """Symlink the main repo's agentcohort_store into the worktree.
 
+        The CLI finds the main worktree's store on its own, so the link only exposes the store's files inside the
+        worktree; failing to create it is not fatal.
+
         Args:
             worktree_path: Path to the newly created worktree
+            main_repo_path: Path to the main worktree
         """
         store_name = self.config.agentcohort_store.name
-
-        worktrees = self.git.worktree_list()
-        if not worktrees:
-            return
-
-        main_repo_path = worktrees[0].path
         main_store_path = main_repo_path / store_name
         new_store_path = worktree_path / store_name
 
         if main_store_path.exists() and not new_store_path.exists():
-            with contextlib.suppress(OSError):
+            try:
                 new_store_path.symlink_to(main_store_path)
+            except OSError as e:
+                logger.warning(f"could not link {new_store_path} to {main_store_path}: {e.strerror or e}")
+
+    def seed_worktree(self, worktree_path: Path, main_repo_path: Path, seed_paths: list[Path]) -> list[SeedResult]:
+        """Clone directories such as .venv or node_modules from the main worktree into a new one.
+
+        Directories missing from the main worktree or already present in the new one are skipped. A failed
+        seed is reported in its result and leaves nothing behind, so post-setup simply builds it from scratch.
+
+        Args:
+            worktree_path: Path to the newly created worktree
+            main_repo_path: Path to the main worktree
+            seed_paths: Directories relative to the repository root
+
+        Returns:
+            One SeedResult per directory that was seeded or failed to seed
+        """
+        seeder = TreeSeeder(self.config.seed_mode)
+        results: list[SeedResult] = []
+        for relative in seed_paths:
+            source = main_repo_path / relative
+            destination = worktree_path / relative
+            if not source.is_dir() or destination.exists() or destination.is_symlink():
+                continue
+            try:
+                results.append(seeder.seed(source, destination))
+            except SeedError as e:
+                logger.info(f"seeding {destination} failed: {e}")
+                results.append(SeedResult(path=destination, method="failed", error=str(e)))
+        return results
+
+    @staticmethod
+    def _relative_paths(values: list[str], what: str) -> list[Path]:
+        """Validate paths that must be relative to, and inside, the repository root."""
+        paths = [Path(value) for value in values]
+        for path in paths:
+            if path.is_absolute() or ".." in path.parts:
+                raise WorktreeError(f"{what} must be relative to the repository root: {path}")
+        return paths
 
     def list_worktrees(self) -> list[WorktreeInfo]:
         """List all worktrees in the repository.
@@ -125,6 +236,83 @@ class WorktreeService:
 
         return worktrees
 
+    def worktree_statuses(self, untracked: bool = True, jobs: int = 8) -> list[WorktreeStatus]:
+        """Gather branch, change and last-commit information for all worktrees concurrently.
+
+        Each worktree gets one ``git status`` process, at most ``jobs`` at a time, and the commit times of all
+        worktree HEADs are read with one more git call alongside them, so the whole overview takes about as
+        long as the slowest single status.
+
+        Args:
+            untracked: Count untracked files (slower on large trees)
+            jobs: Maximum number of git processes running at once
+
+        Returns:
+            One WorktreeStatus per worktree, main worktree first; worktrees git cannot read carry an error
+        """
+        worktrees = self.list_worktrees()
+        runner = AsyncProcessRunner(max_concurrency=jobs)
+        ignore = {self.config.agentcohort_store.name}
+
+        async def status_of(worktree: WorktreeInfo) -> WorktreeStatus:
+            entry = WorktreeStatus(path=worktree.path, head=worktree.head, is_main=worktree.is_main)
+            if not worktree.path.is_dir():
+                entry.error = "worktree directory is missing"
+                return entry
+            try:
+                entry.status = await GitClient(worktree.path, runner=runner).status_async(untracked, ignore)
+            except (WorktreeError, OSError) as e:
+                entry.error = str(e).strip()
+            return entry
+
+        async def commit_times() -> dict[str, datetime]:
+            try:
+                client = GitClient(Path(self.git.repo_path), runner=runner)
+                return await client.commit_times_async(wt.head for wt in worktrees)
+            except WorktreeError:
+                return {}
+
+        async def gather_all() -> list[WorktreeStatus]:
+            times = asyncio.ensure_future(commit_times())
+            statuses = await asyncio.gather(*(status_of(wt) for wt in worktrees))
+            commit_time_by_head = await times
+            for entry in statuses:
+                entry.last_commit = commit_time_by_head.get(entry.head)
+            return statuses
+
+        return asyncio.run(gather_all())
+
+    def find_worktree(self, name: str, worktrees: list[WorktreeInfo] | None = None) -> WorktreeInfo:
+        """Find a worktree by path, directory name or name without the ``<repo-name>-`` prefix.
+
+        Args:
+            name: Name of the worktree (original name without prefix) or full path
+            worktrees: Worktree list to search (defaults to the current list)
+
+        Returns:
+            The matching WorktreeInfo; a path match wins over a name match
+
+        Raises:
+            WorktreeNotFoundError: If no worktree matches
+        """
+        if worktrees is None:
+            worktrees = self.list_worktrees()
+        potential_path = Path(name).resolve()
+        prefixed_name = f"{self.git.repo_name}-{name}"
+        by_name: WorktreeInfo | None = None
+        by_prefixed_name: WorktreeInfo | None = None
+        for wt in worktrees:
+            if wt.path.resolve() == potential_path:
+                return wt
+            if by_name is None and wt.path.name == name:
+                by_name = wt
+            if by_prefixed_name is None and wt.path.name == prefixed_name:
+                by_prefixed_name = wt
+        match = by_name or by_prefixed_name
+        if match is None:
+            raise WorktreeNotFoundError(f"Worktree '{name}' not found")
+        return match
+
     def remove_worktree(self, name: str, force: bool = False) -> Path:
         """Remove a worktree by name or path.
 
@@ -139,40 +327,86 @@ class WorktreeService:
             WorktreeNotFoundError: If the worktree doesn't exist
             GitCommandError: If git operations fail
         """
-        # Check if name is a full path
-        potential_path = Path(name).resolve()
-        worktrees = self.list_worktrees()
-        target_path = None
-
-        # First try to match by exact path
-        for wt in worktrees:
-            if wt.path.resolve() == potential_path:
-                target_path = wt.path
-                break
-
-        # If not found, try to match by directory name (exact match)
-        if target_path is None:
-            for wt in worktrees:
-                if wt.path.name == name:
-                    target_path = wt.path
-                    break
-
-        # If still not found, try with repo prefix applied
-        if target_path is None:
-            repo_name = self.git.repo_name
-            prefixed_name = f"{repo_name}-{name}"
-            for wt in worktrees:
-                if wt.path.name == prefixed_name:
-                    target_path = wt.path
-                    break
-
-        if target_path is None:
-            raise WorktreeNotFoundError(f"Worktree '{name}' not found")
+        target_path = self.find_worktree(name).path
 
         # Remove the worktree
         self.git.worktree_remove(target_path, force=force)
+        self.unbind([target_path])
         return target_path
 
+    def create_worktrees(
+        self,
+        specs: list[WorktreeSpec],
+        base: str | None = None,
+        post_setup: str | None = None,
+        seed: list[str] | None = None,
+        jobs: int = 4,
+        on_progress: Callable[[str, str], None] | None = None,
+    ) -> WorktreeBatchResult:
+        """Create several worktrees, then run their post-setup commands concurrently.
+
+        The git phase is serialized because git takes a repository-wide lock for worktree changes. Post-setup
+        commands then run concurrently on one asyncio loop, at most ``jobs`` at a time. A failure in one
+        worktree does not affect the others.
+
+        Args:
+            specs: Worktrees to create
+            base: Base branch for the new branches (defaults to upstream default branch)
+            post_setup: Command to run in every created worktree
+            seed: Directories to clone from the main worktree (defaults to config seed_dirs)
+            jobs: Maximum number of post-setup commands running at once
+            on_progress: Called with (worktree name, message) for every progress event and output line
+
+        Returns:
+            WorktreeBatchResult with one item per spec, in the order given
+        """
+        runner = AsyncProcessRunner(max_concurrency=jobs)
+
+        def report(name: str, message: str) -> None:
+            if on_progress is not None:
+                on_progress(name, message)
+
+        items = [WorktreeBatchItem(name=spec.name) for spec in specs]
+        for spec, item in zip(specs, items, strict=True):
+            try:
+                item.result = self.create_worktree(
+                    name=spec.name,
+                    branch=spec.branch,
+                    base=base,
+                    path=spec.path,
+                    seed=seed,
+                    detach=spec.detach,
+                    sparse=spec.sparse,
+                )
+                report(spec.name, f"created at {item.result.worktree_path}")
+                for seeded in item.result.seeded:
+                    report(spec.name, format_seed_result(seeded))
+            except WorktreeError as e:
+                item.error = str(e)
+                report(spec.name, f"failed: {e}")
+
+        if not post_setup:
+            return WorktreeBatchResult(items=items)
+
+        async def run_one(item: WorktreeBatchItem, result: WorktreeCreateResult) -> None:
+            report(item.name, f"running post-setup: {post_setup}")
+            exit_code, output = await self.run_post_setup_async(
+                result.worktree_path, post_setup, lambda line: report(item.name, line), runner
+            )
+            result.post_setup_output = output
+            if exit_code is None:
+                item.error = f"post-setup {output}"
+                report(item.name, item.error)
+                return
+            item.post_setup_exit_code = exit_code
+            report(item.name, f"post-setup exited with code {exit_code}")
+
+        async def run_all() -> None:
+            await asyncio.gather(*(run_one(item, item.result) for item in items if item.result is not None))
+
+        asyncio.run(run_all())
+        return WorktreeBatchResult(items=items)
+
     def run_post_setup(self, worktree_path: Path, command: str) -> str:
         """Execute a post-setup command in the worktree directory.
 
@@ -181,35 +415,66 @@ class WorktreeService:
             command: Command to execute
 
         Returns:
-            Combined stdout and stderr output
+            Combined stdout and stderr output, prefixed with a warning if the command did not succeed
+        """
+        exit_code, output = asyncio.run(self.run_post_setup_async(worktree_path, command))
+        if exit_code is None:
+            return f"Warning: Post-setup command {output}"
+        if exit_code != 0:
+            return f"Warning: Post-setup command exited with code {exit_code}\n{output}"
+        return output
+
+    async def run_post_setup_async(
+        self,
+        worktree_path: Path,
+        command: str,
+        on_line: Callable[[str], None] | None = None,
+        runner: AsyncProcessRunner | None = None,
+    ) -> tuple[int | None, str]:
+        """Run a shell command in the worktree, streaming its combined output line by line.
 
-        Raises:
-            GitCommandError: If the command fails
+        Args:
+            worktree_path: Path to the worktree
+            command: Command to execute
+            on_line: Called with every output line as it is produced
+            runner: Runner bounding concurrency with other commands (defaults to the GitClient's runner)
+
+        Returns:
+            Tuple of (exit code, output); the exit code is None if the command timed out or could not start,
+            in which case the output describes why
         """
+        runner = runner or self.git.runner
         try:
-            result = subprocess.run(
+            result = await runner.run_shell(
                 command,
-                shell=True,
                 cwd=worktree_path,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5-minute timeout
+                timeout=self.POST_SETUP_TIMEOUT,
+                on_stdout=on_line,
+                merge_stderr=True,
             )
-
-            output = ""
-            if result.stdout:
-                output += result.stdout
-            if result.stderr:
-                if output:
-                    output += "\n"
-                output += result.stderr
-
-            if result.returncode != 0:
-                output = f"Warning: Post-setup command exited with code {result.returncode}\n{output}"
-
-            return output
-
-        except subprocess.TimeoutExpired:
-            return "Warning: Post-setup command timed out after 5 minutes"
-        except Exception as e:
-            return f"Warning: Post-setup command failed: {str(e)}"
+        except OSError as e:
+            return None, f"failed: {e}"
+        if result.timed_out:
+            return None, f"timed out after {self.POST_SETUP_TIMEOUT // 60} minutes"
+        return result.returncode, result.stdout.rstrip("\n")
+
+
+def _measure_tree(root: Path) -> tuple[int, int]:
+    """Count the files and bytes in a worktree, skipping .git and not following symlinks."""
+    files = 0
+    size = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        if dirpath == str(root):
+            dirnames[:] = [name for name in dirnames if name != ".git"]
+            filenames = [name for name in filenames if name != ".git"]
+        for name in filenames:
+            files += 1
+            size += Path(dirpath, name).lstat().st_size
+    return files, size
+
+
+def format_seed_result(result: SeedResult) -> str:
+    """Describe a seed result in one line for progress output."""
+    if result.error:
+        return f"seeding {result.path.name} failed: {result.error}"
+    return f"seeded {result.path.name}: {result.files} files, {result.bytes / 1_000_000:.1f} MB ({result.method})"
@@ -0,0 +1,85 @@
+import contextlib
+from pathlib import Path
+
+from agentcohort.task.models import Task
+from agentcohort.task.services import TaskService
+from agentcohort.worktree.exceptions import WorktreeError
+from agentcohort.worktree.models import WorktreeCreateResult
+from agentcohort.worktree.pool import WorktreePool
+from agentcohort.worktree.services import WorktreeService
+
+
+class TaskWorktreeService:
+    """Start tasks in worktrees of their own."""
+
+    def __init__(self, task_service: TaskService, worktree_service: WorktreeService):
+        """Initialize TaskWorktreeService.
+
+        Args:
+            task_service: TaskService owning the tasks
+            worktree_service: WorktreeService creating the worktrees
+        """
+        self.task_service = task_service
+        self.worktree_service = worktree_service
+
+    def start(
+        self,
+        task_id: str,
+        base: str | None = None,
+        use_pool: bool = False,
+        post_setup: str | None = None,
+        seed: list[str] | None = None,
+        sparse: list[str] | None = None,
+    ) -> tuple[Task, WorktreeCreateResult]:
+        """Mark a task in_progress in a worktree and branch named after its id.
+
+        The worktree is created (or leased from the pool), bound to the task, and the task is started with the
+        worktree path in its metadata. If binding or starting the task fails, the worktree and its branch are
+        removed again, so either all of it happens or none of it. A task whose bound worktree still exists is
+        simply started again in it.
+
+        Args:
+            task_id: Full or partial task id
+            base: Base branch (defaults to upstream default branch)
+            use_pool: Lease a pooled worktree instead of creating one (seed, sparse and post_setup are ignored)
+            post_setup: Command to run in a newly created worktree
+            seed: Directories to clone from the main worktree (defaults to config seed_dirs)
+            sparse: Directories to check out; None checks out everything
+
+        Returns:
+            Tuple of (started task, worktree details)
+
+        Raises:
+            TaskNotFoundError: If the task does not exist
+            WorktreeError: If the worktree cannot be created or leased
+        """
+        task = self.task_service.get_task(task_id)
+        if task.worktree and Path(task.worktree).is_dir():
+            existing = WorktreeCreateResult(worktree_path=Path(task.worktree), branch=task.id, created_new_branch=False)
+            return self.task_service.start_task(task.id), existing
+
+        pool = WorktreePool(self.worktree_service) if use_pool else None
+        if pool is not None:
+            slot = pool.lease(task.id, base=base)
+            result = WorktreeCreateResult(worktree_path=slot.path, branch=task.id, created_new_branch=True)
+        else:
+            result = self.worktree_service.create_worktree(
+                name=task.id, base=base, post_setup=post_setup, seed=seed, sparse=sparse
+            )
+
+        try:
+            self.worktree_service.bindings.bind(result.worktree_path, task.id)
+            task = self.task_service.start_task(task.id, worktree=str(result.worktree_path))
+        except Exception:
+            self._rollback(result.worktree_path, task.id, pool)
+            raise
+        return task, result
+
+    def _rollback(self, worktree_path: Path, branch: str, pool: WorktreePool | None) -> None:
+        with contextlib.suppress(WorktreeError):
+            if pool is not None:
+                pool.release(branch, force=True)
+            else:
+                self.worktree_service.remove_worktree(str(worktree_path), force=True)
+            self.worktree_service.unbind([worktree_path])
+            self.worktree_service.git.delete_branches([branch])